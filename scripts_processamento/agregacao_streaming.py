@@ -0,0 +1,133 @@
+import argparse
+import os
+
+import pandas as pd
+
+from analisar_relatorio_ligacoes import (
+    DIAS_SEMANA,
+    processar_dados,
+    plotar_volume_por_hora,
+    plotar_volume_por_dia,
+    gerar_relatorio_html,
+)
+from calendario_dias_uteis import adicionar_argumentos_calendario, opcoes_calendario
+from carregador_cdr import carregar_cdr
+from quantis_ligacoes import DistribuicoesLigacoes, gerar_graficos_quantis, gerar_secao_quantis
+
+# Linhas lidas por bloco; a memória depende deste valor, não do tamanho do arquivo
+TAMANHO_BLOCO = 100_000
+
+def _contar(serie):
+    contagem = serie.value_counts()
+    contagem = contagem[contagem > 0]
+    contagem.index = contagem.index.astype(object)
+    return contagem
+
+def _somar(a, b):
+    if a.empty or b.empty:
+        return b if a.empty else a
+    return a.add(b, fill_value=0).astype('int64')
+
+class AgregadoLigacoes:
+    """
+    Agregado parcial e combinável das ligações já filtradas: contagens por
+    status, hora, dia da semana e agente, mais os sketches de espera e
+    conversa. Somar dois agregados equivale a agregar a união dos blocos
+    que os geraram.
+    """
+
+    DIMENSOES = {
+        'status': ['status_consolidado', 'Status'],
+        'hora': 'hora_cheia',
+        'dia_semana': 'dia_semana',
+        'agente': 'Agente / Atendente',
+    }
+
+    def __init__(self, contagens=None, distribuicoes=None):
+        vazio = pd.Series(dtype='int64')
+        self.contagens = contagens or {nome: vazio for nome in self.DIMENSOES}
+        self.distribuicoes = distribuicoes or DistribuicoesLigacoes()
+
+    @classmethod
+    def de_bloco(cls, df_processado):
+        """Agrega um bloco já processado por processar_dados()."""
+        df = df_processado.assign(hora_cheia=df_processado['data_hora'].dt.hour)
+        df = df.astype({'Status': str, 'Agente / Atendente': str})
+        contagens = {}
+        for nome, colunas in cls.DIMENSOES.items():
+            if isinstance(colunas, list):
+                contagens[nome] = df.groupby(colunas).size()
+            else:
+                contagens[nome] = _contar(df[colunas])
+        return cls(contagens, DistribuicoesLigacoes.de_bloco(df_processado))
+
+    def combinar(self, outro):
+        """Retorna um novo agregado com a soma das contagens dos dois."""
+        return AgregadoLigacoes({
+            nome: _somar(self.contagens[nome], outro.contagens[nome])
+            for nome in self.DIMENSOES
+        }, self.distribuicoes + outro.distribuicoes)
+
+    __add__ = combinar
+
+    def metricas(self):
+        """Mesmas métricas de gerar_metricas(), calculadas a partir das contagens."""
+        status = self.contagens['status']
+        por_consolidado = status.groupby(level=0).sum() if len(status) else pd.Series(dtype='int64')
+        total = int(status.sum())
+        atendidas = int(por_consolidado.get('Atendida', 0))
+        nao_atendidas = int(por_consolidado.get('Não Atendida', 0))
+
+        detalhamento = status.xs('Não Atendida', level=0) if nao_atendidas else pd.Series(dtype='int64')
+        detalhamento = detalhamento[detalhamento > 0].sort_values(ascending=False)
+
+        return {
+            'total_ligacoes': total,
+            'total_atendidas': atendidas,
+            'total_nao_atendidas': nao_atendidas,
+            'taxa_atendimento': (atendidas / total) * 100 if total > 0 else 0,
+            'detalhamento_nao_atendidas': {k: int(v) for k, v in detalhamento.items()},
+        }
+
+    def volume_por_hora(self):
+        """Volume de ligações por hora cheia, em ordem crescente de hora."""
+        return self.contagens['hora'].sort_index()
+
+    def volume_por_dia(self):
+        """Volume de ligações por nome do dia da semana."""
+        return self.contagens['dia_semana'].rename(index=DIAS_SEMANA)
+
+    def volume_por_agente(self):
+        """Volume de ligações por agente / atendente."""
+        return self.contagens['agente'].sort_values(ascending=False)
+
+def agregar_arquivos(arquivos, tamanho_bloco=TAMANHO_BLOCO, **opcoes_filtro):
+    """Lê as exportações em blocos, filtra cada bloco e acumula o agregado."""
+    agregado = AgregadoLigacoes()
+    for arquivo in arquivos:
+        for bloco in carregar_cdr(arquivo, chunksize=tamanho_bloco):
+            agregado = agregado + AgregadoLigacoes.de_bloco(processar_dados(bloco, **opcoes_filtro))
+    return agregado
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o relatório de ligações em modo streaming (memória constante).")
+    parser.add_argument('arquivos', nargs='+', help="Exportações de ligações recebidas (CSV)")
+    parser.add_argument('--pasta-saida', default="relatorios/resultados_relatorio_ligacoes")
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO)
+    adicionar_argumentos_calendario(parser)
+    args = parser.parse_args()
+
+    os.makedirs(args.pasta_saida, exist_ok=True)
+
+    agregado = agregar_arquivos(args.arquivos, args.tamanho_bloco, **opcoes_calendario(args))
+    metricas = agregado.metricas()
+    volume_hora = plotar_volume_por_hora(agregado.volume_por_hora(), args.pasta_saida)
+    volume_dia = plotar_volume_por_dia(agregado.volume_por_dia(), args.pasta_saida)
+    gerar_graficos_quantis(agregado.distribuicoes, args.pasta_saida)
+    gerar_relatorio_html(metricas, volume_hora, volume_dia, args.pasta_saida,
+                         [gerar_secao_quantis(agregado.distribuicoes)])
+
+    print("Análise em streaming concluída! Os resultados foram salvos em:", args.pasta_saida)
+
+if __name__ == "__main__":
+    main()
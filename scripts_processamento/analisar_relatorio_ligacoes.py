@@ -1,31 +1,50 @@
 import pandas as pd
 import plotly.express as px
 from datetime import datetime, time
-import holidays
 import numpy as np
 import os
+import argparse
 
-def carregar_dados(arquivo):
+from analise_rechamadas import analisar_rechamadas, gerar_grafico_rechamadas, gerar_secao_rechamadas
+from calendario_dias_uteis import adicionar_argumentos_calendario, carregar_fechamentos, obter_feriados, opcoes_calendario
+from empacotador_relatorio import empacotar_relatorio, salvar_figura
+from cache_cdr import carregar_cdr_cache
+from exportacao import FORMATOS, exportar_base
+from filtros_cdr import aplicar_filtros
+from ingestao_cdr import consultar_periodo
+from motor_metricas import (
+    METRICAS_LIGACOES,
+    avaliar_metricas,
+    contagem,
+    exportar_metricas_excel,
+    gerar_secao_metricas,
+    quebras_metricas,
+    tabela_larga,
+)
+from quantis_ligacoes import DistribuicoesLigacoes, gerar_graficos_quantis, gerar_secao_quantis
+from telefones import adicionar_chaves_telefone
+
+# Mapeamento de dias da semana em português (0 = Segunda)
+DIAS_SEMANA = {
+    0: 'Segunda-feira',
+    1: 'Terça-feira',
+    2: 'Quarta-feira',
+    3: 'Quinta-feira',
+    4: 'Sexta-feira'
+}
+
+# Quebras das métricas detalhadas (título -> dimensões) no relatório e no Excel
+QUEBRAS_METRICAS = {
+    'Mês': ['mes'],
+    'Dia da Semana': ['dia_semana'],
+    'Ramal': ['ramal'],
+}
+
+def carregar_dados(arquivo, colunas=None):
     """Carrega os dados do arquivo CSV."""
-    try:
-        # Tenta primeiro com UTF-8
-        df = pd.read_csv(arquivo, sep=';', encoding='utf-8')
-    except UnicodeDecodeError:
-        try:
-            # Tenta com latin1
-            df = pd.read_csv(arquivo, sep=';', encoding='latin1')
-        except:
-            # Tenta com cp1252 (Windows-1252)
-            df = pd.read_csv(arquivo, sep=';', encoding='cp1252')
-    
-    # Converte a coluna Data/Hora para datetime
-    df['data'] = pd.to_datetime(df['Data/Hora'].str.split(' ').str[0], format='%d/%m/%Y')
-    df['hora'] = df['Data/Hora'].str.split(' ').str[1]
-    
-    # Converte a coluna de tempo total para numérico
-    df['tempo_total'] = pd.to_numeric(df['Tempo Total'].str.replace(',', '.'), errors='coerce')
-    
-    return df
+    # Leitura tipada (data/hora convertida, tempo_total em segundos), servida pelo
+    # cache colunar em BD/cache enquanto a exportação não mudar
+    return carregar_cdr_cache(arquivo, colunas=colunas)
 
 def esta_em_horario_comercial(row):
     """Verifica se a ligação está dentro do horário comercial."""
@@ -45,8 +64,7 @@ def esta_em_horario_comercial(row):
 
 def eh_dia_util(data):
     """Verifica se a data é um dia útil."""
-    br_holidays = holidays.BR()
-    return (data.weekday() < 5) and (data not in br_holidays)
+    return (data.weekday() < 5) and (data not in obter_feriados([data.year]))
 
 def validar_duracao(row):
     """Valida a duração mínima da ligação baseado na data."""
@@ -56,8 +74,9 @@ def validar_duracao(row):
 
 def consolidar_status(status):
     """Consolida os status em atendidas e não atendidas."""
-    status = str(status).lower()
-    if 'atendida' in status:
+    # O PABX grava 'Atendido'; 'Não Atendido', 'Cancelado', 'Ocupado' etc. são não atendidas
+    status = str(status).strip().lower()
+    if status.startswith('atendid'):
         return 'Atendida'
     return 'Não Atendida'
 
@@ -67,44 +86,60 @@ def validar_numero(numero):
     digitos = ''.join(filter(str.isdigit, numero_str))
     return len(digitos) >= 9
 
-def processar_dados(df):
+def processar_dados(df, uf=None, municipio=None, fechamentos=()):
     """Aplica todos os filtros e processamentos necessários."""
     # Adiciona coluna de dia da semana (0 = Segunda, 6 = Domingo)
     df['dia_semana'] = df['data'].dt.dayofweek
     
-    # Aplica filtros
-    df_filtrado = df[
-        df.apply(esta_em_horario_comercial, axis=1) &  # Horário comercial
-        df['data'].apply(eh_dia_util) &  # Dias úteis
-        df.apply(validar_duracao, axis=1) &  # Duração mínima
-        df['Origem'].apply(validar_numero)  # Número válido
-    ].copy()
+    # Aplica filtros (vetorizados, mesmas regras das funções por linha acima)
+    df_filtrado = df[aplicar_filtros(df, uf=uf, municipio=municipio, fechamentos=fechamentos)].copy()
     
     # Consolida status
     df_filtrado['status_consolidado'] = df_filtrado['Status'].apply(consolidar_status)
     
+    # Chaves E.164 dos números, com DDD, UF e indicador de celular da origem
+    adicionar_chaves_telefone(df_filtrado)
+    
     return df_filtrado
 
+def contar_por(df, coluna):
+    """
+    Conta ligações por valor da coluna. Aceita tanto a base de ligações quanto
+    o cubo pré-agregado (cubo_ligacoes.py), em que cada linha traz 'quantidade'.
+    """
+    if 'quantidade' in df.columns:
+        contagem = df.groupby(coluna, observed=True)['quantidade'].sum()
+    else:
+        contagem = df[coluna].value_counts()
+    # Colunas categóricas: descarta categorias sem nenhuma ligação
+    return contagem[contagem > 0].sort_values(ascending=False)
+
 def gerar_metricas(df):
     """Gera as métricas solicitadas."""
+    geral = tabela_larga(avaliar_metricas(df, METRICAS_LIGACOES)).iloc[0]
     metricas = {
-        'total_ligacoes': len(df),
-        'total_atendidas': len(df[df['status_consolidado'] == 'Atendida']),
-        'total_nao_atendidas': len(df[df['status_consolidado'] == 'Não Atendida']),
-        'taxa_atendimento': (len(df[df['status_consolidado'] == 'Atendida']) / len(df)) * 100 if len(df) > 0 else 0
+        'total_ligacoes': int(geral['total_ligacoes']),
+        'total_atendidas': int(geral['total_atendidas']),
+        'total_nao_atendidas': int(geral['total_nao_atendidas']),
+        'taxa_atendimento': float(geral['taxa_atendimento'])
     }
     
     # Detalhamento de não atendidas
-    detalhamento_nao_atendidas = df[df['status_consolidado'] == 'Não Atendida']['Status'].value_counts()
-    metricas['detalhamento_nao_atendidas'] = detalhamento_nao_atendidas.to_dict()
+    detalhamento = avaliar_metricas(df, {'nao_atendidas': contagem(status_consolidado='Não Atendida')}, ['Status'])
+    detalhamento = detalhamento[detalhamento['valor'] > 0].sort_values('valor', ascending=False)
+    metricas['detalhamento_nao_atendidas'] = {str(k): int(v) for k, v in zip(detalhamento['Status'], detalhamento['valor'])}
     
     return metricas
 
 def gerar_grafico_horas(df, pasta_saida):
     """Gera gráfico de volume por hora."""
-    df['hora_cheia'] = df['hora'].str.split(':').str[0].astype(int)
-    volume_por_hora = df['hora_cheia'].value_counts().sort_index()
-    
+    if 'hora_cheia' not in df.columns:
+        df['hora_cheia'] = df['data_hora'].dt.hour
+    volume_por_hora = contar_por(df, 'hora_cheia').sort_index()
+    return plotar_volume_por_hora(volume_por_hora, pasta_saida)
+
+def plotar_volume_por_hora(volume_por_hora, pasta_saida):
+    """Salva o gráfico de volume por hora a partir das contagens já agregadas."""
     # Cria DataFrame para plotly
     df_plot = pd.DataFrame({
         'hora': [f'{h:02d}h' for h in volume_por_hora.index],
@@ -120,25 +155,21 @@ def gerar_grafico_horas(df, pasta_saida):
     )
     
     fig.update_layout(height=600, showlegend=False)
-    fig.write_html(f"{pasta_saida}/volume_por_hora_relatorio_ligacoes.html")
+    salvar_figura(fig, f"{pasta_saida}/volume_por_hora_relatorio_ligacoes.html")
     return volume_por_hora.to_dict()
 
 def gerar_grafico_dias_semana(df, pasta_saida):
     """Gera gráfico de volume por dia da semana."""
-    mapeamento_dias = {
-        0: 'Segunda-feira',
-        1: 'Terça-feira',
-        2: 'Quarta-feira',
-        3: 'Quinta-feira',
-        4: 'Sexta-feira'
-    }
-    
-    df['dia_semana_nome'] = df['dia_semana'].map(mapeamento_dias)
-    volume_por_dia = df['dia_semana_nome'].value_counts()
-    
+    if 'quantidade' not in df.columns:
+        # Mantém o nome do dia na base tratada exportada
+        df['dia_semana_nome'] = df['dia_semana'].map(DIAS_SEMANA)
+    volume_por_dia = contar_por(df, 'dia_semana').rename(index=DIAS_SEMANA)
+    return plotar_volume_por_dia(volume_por_dia, pasta_saida)
+
+def plotar_volume_por_dia(volume_por_dia, pasta_saida):
+    """Salva o gráfico de volume por dia da semana a partir das contagens já agregadas."""
     # Reordena os dias da semana
-    ordem_dias = ['Segunda-feira', 'Terça-feira', 'Quarta-feira', 'Quinta-feira', 'Sexta-feira']
-    volume_por_dia = volume_por_dia.reindex(ordem_dias)
+    volume_por_dia = volume_por_dia.reindex(list(DIAS_SEMANA.values()))
     
     # Cria DataFrame para plotly
     df_plot = pd.DataFrame({
@@ -155,11 +186,46 @@ def gerar_grafico_dias_semana(df, pasta_saida):
     )
     
     fig.update_layout(height=600, showlegend=False)
-    fig.write_html(f"{pasta_saida}/volume_por_dia_relatorio_ligacoes.html")
+    salvar_figura(fig, f"{pasta_saida}/volume_por_dia_relatorio_ligacoes.html")
     return volume_por_dia.to_dict()
 
-def gerar_relatorio_html(metricas, volume_hora, volume_dia, pasta_saida):
-    """Gera o relatório HTML com os resultados."""
+def gerar_grafico_regioes(df, pasta_saida):
+    """Gera gráfico de volume por UF de origem (a partir do DDD)."""
+    volume_por_uf = contar_por(df, 'origem_uf')
+    
+    # Cria DataFrame para plotly
+    df_plot = pd.DataFrame({
+        'uf': volume_por_uf.index.astype(str),
+        'quantidade': volume_por_uf.values
+    })
+    
+    fig = px.bar(
+        df_plot,
+        x='uf',
+        y='quantidade',
+        title='Volume de Ligações por UF de Origem (DDD)',
+        labels={'quantidade': 'Quantidade de Ligações', 'uf': 'UF'}
+    )
+    
+    fig.update_layout(height=600, showlegend=False)
+    salvar_figura(fig, f"{pasta_saida}/volume_por_regiao_relatorio_ligacoes.html")
+    return volume_por_uf.to_dict()
+
+def gerar_secao_regioes(volume_por_uf):
+    """Gera a seção HTML de volume por região de origem."""
+    total = sum(volume_por_uf.values())
+    fora_mg = total - volume_por_uf.get('MG', 0) - volume_por_uf.get('Inválido', 0)
+    percentual_fora = fora_mg / total * 100 if total > 0 else 0
+    return f"""
+            <div class="visualization">
+                <h2>Distribuição por Região de Origem</h2>
+                <p>Ligações de fora de Minas Gerais: <strong>{fora_mg}</strong> ({percentual_fora:.1f}%)</p>
+                <iframe src="volume_por_regiao_relatorio_ligacoes.html"></iframe>
+            </div>
+    """
+
+def gerar_relatorio_html(metricas, volume_hora, volume_dia, pasta_saida, secoes_extras=()):
+    """Gera o relatório HTML com os resultados (secoes_extras: blocos HTML adicionais ao final)."""
     criterios_html = """
     <div class="criterios">
         <h2>Critérios de Análise</h2>
@@ -337,6 +403,8 @@ def gerar_relatorio_html(metricas, volume_hora, volume_dia, pasta_saida):
                 <h2>Distribuição por Dia da Semana</h2>
                 <iframe src="volume_por_dia_relatorio_ligacoes.html"></iframe>
             </div>
+            
+            {''.join(secoes_extras)}
         </div>
         
         <div class="footer">
@@ -348,8 +416,12 @@ def gerar_relatorio_html(metricas, volume_hora, volume_dia, pasta_saida):
     
     with open(f"{pasta_saida}/relatorio_ligacoes.html", "w", encoding="utf-8") as f:
         f.write(html_content)
+    
+    # Página única: gráficos renderizados na própria página com plotly.js compartilhado
+    empacotar_relatorio(f"{pasta_saida}/relatorio_ligacoes.html")
 
-def main():
+def main(inicio=None, fim=None, usar_armazem=False, formatos=('xlsx',), exportar_por_mes=False,
+         uf=None, municipio=None, fechamentos=None):
     # Configurações
     arquivo_entrada = "BD/LIGAÇÕES RECEBIDAS/12.24 até 05.25.csv"
     pasta_saida = "relatorios/resultados_relatorio_ligacoes"
@@ -357,22 +429,58 @@ def main():
     # Cria pasta de saída
     os.makedirs(pasta_saida, exist_ok=True)
     
-    # Carrega e processa os dados
-    df = carregar_dados(arquivo_entrada)
-    df_processado = processar_dados(df)
+    # Carrega e processa os dados (do armazém ingerido por ingestao_cdr.py, se pedido)
+    if usar_armazem:
+        df = consultar_periodo('recebidas', inicio=inicio, fim=fim)
+    else:
+        df = carregar_dados(arquivo_entrada)
+    # Sem fechamentos informados, vale o arquivo padrão da clínica (se existir)
+    if fechamentos is None:
+        fechamentos = carregar_fechamentos()
+    df_processado = processar_dados(df, uf=uf, municipio=municipio, fechamentos=fechamentos)
     
     # Gera métricas e gráficos
     metricas = gerar_metricas(df_processado)
     volume_hora = gerar_grafico_horas(df_processado, pasta_saida)
     volume_dia = gerar_grafico_dias_semana(df_processado, pasta_saida)
     
+    # Rechamadas do mesmo número
+    _, resumo_rechamadas, indicadores_rechamadas = analisar_rechamadas(df_processado)
+    gerar_grafico_rechamadas(resumo_rechamadas, pasta_saida)
+    secoes_extras = [gerar_secao_rechamadas(indicadores_rechamadas)]
+    
+    # Volume por região (DDD da origem)
+    volume_uf = gerar_grafico_regioes(df_processado, pasta_saida)
+    secoes_extras.append(gerar_secao_regioes(volume_uf))
+    
+    # Percentis de espera e conversa e nível de serviço
+    distribuicoes = DistribuicoesLigacoes.de_bloco(df_processado)
+    gerar_graficos_quantis(distribuicoes, pasta_saida)
+    secoes_extras.append(gerar_secao_quantis(distribuicoes))
+    
+    # Métricas por mês, dia da semana e ramal (as mesmas tabelas vão para o HTML e o Excel)
+    tabelas_metricas = quebras_metricas(df_processado, QUEBRAS_METRICAS)
+    tabelas_metricas['Dia da Semana'] = tabelas_metricas['Dia da Semana'].rename(index=DIAS_SEMANA)
+    secoes_extras.append(gerar_secao_metricas(tabelas_metricas))
+    
     # Gera relatório HTML
-    gerar_relatorio_html(metricas, volume_hora, volume_dia, pasta_saida)
+    gerar_relatorio_html(metricas, volume_hora, volume_dia, pasta_saida, secoes_extras)
     
     # Exporta base tratada
-    df_processado.to_excel(f"{pasta_saida}/base_tratada_relatorio_ligacoes.xlsx", index=False)
+    exportar_base(df_processado, pasta_saida, "base_tratada_relatorio_ligacoes", formatos, exportar_por_mes)
+    exportar_metricas_excel(tabelas_metricas, f"{pasta_saida}/metricas_relatorio_ligacoes.xlsx")
     
     print("Análise concluída! Os resultados foram salvos em:", pasta_saida)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Analisa o relatório de ligações recebidas.")
+    parser.add_argument('--armazem', action='store_true', help="Lê do armazém particionado em vez do CSV")
+    parser.add_argument('--inicio', help="Data inicial (AAAA-MM-DD), usada com --armazem")
+    parser.add_argument('--fim', help="Data final (AAAA-MM-DD), usada com --armazem")
+    parser.add_argument('--formatos', nargs='+', choices=FORMATOS, default=['xlsx'],
+                        help="Formatos da base tratada exportada")
+    parser.add_argument('--por-mes', action='store_true', help="Exporta a base tratada em um arquivo por mês")
+    adicionar_argumentos_calendario(parser)
+    args = parser.parse_args()
+    main(inicio=args.inicio, fim=args.fim, usar_armazem=args.armazem,
+         formatos=args.formatos, exportar_por_mes=args.por_mes, **opcoes_calendario(args)) 
\ No newline at end of file
@@ -0,0 +1,152 @@
+import argparse
+import os
+
+import pandas as pd
+import plotly.express as px
+
+from analisar_relatorio_ligacoes import carregar_dados
+from carregador_cdr import CASAS_DECIMAIS_VALOR, valor_em_inteiros
+from empacotador_relatorio import empacotar_relatorio, salvar_figura
+from ingestao_cdr import consultar_periodo
+from motor_metricas import avaliar_metricas, contagem, soma, tabela_larga
+
+ARQUIVO_FEITAS = "BD/LIGAÇÕES FEITAS/12.24 até 05.25.csv"
+PASTA_SAIDA = "relatorios/resultados_relatorio_ligacoes"
+
+# Unidades de valor (1/100000 de real) em um centavo
+UNIDADES_POR_CENTAVO = 10 ** (CASAS_DECIMAIS_VALOR - 2)
+
+METRICAS_CUSTOS = {
+    'ligacoes': contagem(),
+    'segundos': soma('tempo_total'),
+    'valor': soma('valor_total'),
+}
+
+# Quebras do relatório: título -> coluna de agrupamento
+QUEBRAS_CUSTOS = {
+    'Ramal': 'ramal',
+    'Tipo de Destino': 'tipo_destino',
+    'Dia': 'data',
+    'Hora': 'hora_cheia',
+}
+
+def preparar_custos(df_feitas):
+    """Seleciona as ligações feitas para fora (sem VoIP interno) com as colunas usadas na análise."""
+    if 'valor_total' not in df_feitas.columns:
+        # Partições do armazém gravadas antes da coluna inteira existir
+        df_feitas = df_feitas.assign(valor_total=valor_em_inteiros(df_feitas['Valor Total']))
+    externas = df_feitas[df_feitas['Tipo 2'].astype(str) != 'voip']
+    return pd.DataFrame({
+        'data': externas['data'],
+        'hora_cheia': externas['data_hora'].dt.hour,
+        'ramal': externas['Origem'].astype(str),
+        'tipo_destino': externas['Tipo 2'].astype(str),
+        'tempo_total': externas['tempo_total'].astype('int64'),
+        'valor_total': externas['valor_total'],
+    })
+
+def em_centavos(valores):
+    """Arredonda somas em 1/100000 de real para centavos inteiros (meio centavo para cima)."""
+    return (valores.astype('int64') + UNIDADES_POR_CENTAVO // 2) // UNIDADES_POR_CENTAVO
+
+def agregar_custos(custos, dimensao):
+    """Ligações, minutos, custo em centavos e custo por minuto agrupados pela dimensão."""
+    tabela = tabela_larga(avaliar_metricas(custos, METRICAS_CUSTOS, [dimensao]), [dimensao])
+    return pd.DataFrame({
+        'ligacoes': tabela['ligacoes'].astype('int64'),
+        'minutos': tabela['segundos'] / 60,
+        'custo_centavos': em_centavos(tabela['valor']),
+        'custo_por_minuto_centavos': (em_centavos(tabela['valor']) / (tabela['segundos'] / 60)).where(tabela['segundos'] > 0, 0),
+    })
+
+def analisar_custos(df_feitas):
+    """Retorna as ligações externas e os resumos de custo por ramal, tipo de destino, dia e hora."""
+    custos = preparar_custos(df_feitas)
+    resumos = {titulo: agregar_custos(custos, dimensao) for titulo, dimensao in QUEBRAS_CUSTOS.items()}
+    resumos['Ramal'] = resumos['Ramal'].sort_values('custo_centavos', ascending=False)
+    resumos['Tipo de Destino'] = resumos['Tipo de Destino'].sort_values('custo_centavos', ascending=False)
+    return custos, resumos
+
+def formatar_reais(centavos):
+    """Formata centavos inteiros como 'R$ 1.234,56'."""
+    reais, resto = divmod(int(centavos), 100)
+    return f"R$ {reais:,}".replace(',', '.') + f",{resto:02d}"
+
+def gerar_relatorio_custos(custos, resumos, pasta_saida):
+    """Gera os gráficos de custo e o relatório HTML de ligações feitas."""
+    graficos = {
+        'Ramal': ('custo_por_ramal.html', px.bar, 'Custo das Ligações Feitas por Ramal'),
+        'Tipo de Destino': ('custo_por_tipo_destino.html', px.bar, 'Custo por Tipo de Destino'),
+        'Dia': ('custo_por_dia.html', px.line, 'Custo Diário das Ligações Feitas'),
+        'Hora': ('custo_por_hora.html', px.bar, 'Custo das Ligações Feitas por Hora'),
+    }
+    for titulo, (arquivo, grafico, nome) in graficos.items():
+        resumo = resumos[titulo].reset_index()
+        dimensao = resumo.columns[0]
+        fig = grafico(
+            resumo.assign(custo_reais=resumo['custo_centavos'] / 100),
+            x=dimensao,
+            y='custo_reais',
+            hover_data=['ligacoes', 'minutos'],
+            title=nome,
+            labels={'custo_reais': 'Custo (R$)', dimensao: titulo}
+        )
+        fig.update_layout(height=600, showlegend=False)
+        salvar_figura(fig, f"{pasta_saida}/{arquivo}")
+
+    custo_total = int(em_centavos(pd.Series([custos['valor_total'].sum()])).iloc[0])
+    minutos = custos['tempo_total'].sum() / 60
+    tabelas = "".join(
+        f"<h2>Por {titulo}</h2>{resumos[titulo].to_html(float_format='%.1f', border=0)}"
+        for titulo in ('Ramal', 'Tipo de Destino')
+    )
+    iframes = "".join(f'<iframe src="{arquivo}"></iframe>' for arquivo, _, _ in graficos.values())
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Custos de Ligações Feitas - Instituto Bhariátrica</title>
+        <meta charset="UTF-8">
+        <style>
+            body {{ font-family: Arial, sans-serif; margin: 0 auto; max-width: 1200px; padding: 20px; color: #343a40; }}
+            h1, h2 {{ color: #17a2b8; }}
+            table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
+            th, td {{ padding: 8px; text-align: left; border-bottom: 1px solid #dee2e6; }}
+            th {{ background-color: #17a2b8; color: #ffffff; }}
+            iframe {{ border: none; width: 100%; height: 600px; }}
+        </style>
+    </head>
+    <body>
+        <h1>Custos de Ligações Feitas</h1>
+        <p>Ligações externas: <strong>{len(custos)}</strong> |
+           Minutos: <strong>{minutos:.0f}</strong> |
+           Custo total: <strong>{formatar_reais(custo_total)}</strong></p>
+        {iframes}
+        {tabelas}
+    </body>
+    </html>
+    """
+    with open(f"{pasta_saida}/relatorio_custos_saida.html", "w", encoding="utf-8") as f:
+        f.write(html_content)
+    empacotar_relatorio(f"{pasta_saida}/relatorio_custos_saida.html")
+
+def main(inicio=None, fim=None, usar_armazem=False):
+    os.makedirs(PASTA_SAIDA, exist_ok=True)
+
+    if usar_armazem:
+        df_feitas = consultar_periodo('feitas', inicio=inicio, fim=fim)
+    else:
+        df_feitas = carregar_dados(ARQUIVO_FEITAS)
+
+    custos, resumos = analisar_custos(df_feitas)
+    gerar_relatorio_custos(custos, resumos, PASTA_SAIDA)
+
+    print("Análise de custos concluída! Os resultados foram salvos em:", PASTA_SAIDA)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analisa custo e minutos das ligações feitas.")
+    parser.add_argument('--armazem', action='store_true', help="Lê do armazém particionado em vez do CSV")
+    parser.add_argument('--inicio', help="Data inicial (AAAA-MM-DD), usada com --armazem")
+    parser.add_argument('--fim', help="Data final (AAAA-MM-DD), usada com --armazem")
+    args = parser.parse_args()
+    main(inicio=args.inicio, fim=args.fim, usar_armazem=args.armazem)
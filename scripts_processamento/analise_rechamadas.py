@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from empacotador_relatorio import salvar_figura
+from telefones import codificar_numeros
+
+# Tentativas do mesmo número separadas por até este intervalo formam uma sequência
+JANELA_RECHAMADA = pd.Timedelta(hours=2)
+
+def montar_sequencias(df, janela=JANELA_RECHAMADA):
+    """
+    Ordena as ligações por número e horário e numera as tentativas de cada
+    sequência (ligações do mesmo número com intervalo de até `janela`).
+    Tudo é calculado com diferenças vetorizadas sobre a chave inteira do número.
+    """
+    codigos, numeros = codificar_numeros(df['Origem'])
+    instantes = df['data_hora'].to_numpy(dtype='datetime64[ns]')
+    ordem = np.lexsort((instantes, codigos))
+
+    codigos = codigos[ordem]
+    instantes = instantes[ordem]
+    atendida = (df['status_consolidado'].to_numpy() == 'Atendida')[ordem]
+
+    mesmo_numero = np.r_[False, codigos[1:] == codigos[:-1]]
+    intervalo = np.r_[np.timedelta64('NaT'), np.diff(instantes)]
+    intervalo = np.where(mesmo_numero, intervalo, np.timedelta64('NaT'))
+    nova_sequencia = ~mesmo_numero | (intervalo > janela.to_timedelta64())
+
+    sequencias = pd.DataFrame({
+        'codigo_numero': codigos,
+        'numero': numeros[codigos],
+        'data_hora': instantes,
+        'atendida': atendida,
+        'sequencia': np.cumsum(nova_sequencia) - 1,
+        'minutos_desde_anterior': np.where(nova_sequencia, np.nan, intervalo / np.timedelta64(1, 'm')),
+    })
+    sequencias['tentativa'] = sequencias.groupby('sequencia').cumcount() + 1
+    return sequencias
+
+def resumir_sequencias(sequencias):
+    """Resume cada sequência: total de tentativas e em qual tentativa houve atendimento."""
+    grupos = sequencias.groupby('sequencia')
+    primeira_atendida = sequencias.loc[sequencias['atendida']].groupby('sequencia')['tentativa'].min()
+    return pd.DataFrame({
+        'codigo_numero': grupos['codigo_numero'].first(),
+        'numero': grupos['numero'].first(),
+        'inicio': grupos['data_hora'].first(),
+        'tentativas': grupos.size(),
+        'tentativa_atendida': primeira_atendida,
+    })
+
+def analisar_rechamadas(df_processado, janela=JANELA_RECHAMADA):
+    """Calcula as sequências de rechamada e os indicadores do relatório."""
+    sequencias = montar_sequencias(df_processado, janela)
+    resumo = resumir_sequencias(sequencias)
+
+    atendidas = resumo.dropna(subset=['tentativa_atendida'])
+    por_numero = atendidas.groupby('codigo_numero')['tentativa_atendida'].max()
+    intervalos = sequencias['minutos_desde_anterior'].dropna()
+
+    indicadores = {
+        'total_numeros': int(resumo['codigo_numero'].nunique()),
+        'numeros_com_rechamada': int(resumo.loc[resumo['tentativas'] >= 2, 'codigo_numero'].nunique()),
+        'sequencias_atendidas': len(atendidas),
+        'percentual_2_tentativas': float((atendidas['tentativa_atendida'] >= 2).mean() * 100) if len(atendidas) else 0,
+        'percentual_numeros_2_tentativas': float((por_numero >= 2).mean() * 100) if len(por_numero) else 0,
+        'mediana_minutos_entre_tentativas': float(intervalos.median()) if len(intervalos) else 0,
+        'distribuicao_tentativas': resumo['tentativas'].value_counts().sort_index().to_dict(),
+    }
+    return sequencias, resumo, indicadores
+
+def gerar_grafico_rechamadas(resumo, pasta_saida):
+    """Gera o gráfico de quantidade de tentativas por sequência de rechamada."""
+    contagem = resumo['tentativas'].clip(upper=6).value_counts().sort_index()
+    df_plot = pd.DataFrame({
+        'tentativas': [f'{t}' if t < 6 else '6+' for t in contagem.index],
+        'quantidade': contagem.values
+    })
+
+    fig = px.bar(
+        df_plot,
+        x='tentativas',
+        y='quantidade',
+        title='Tentativas por Sequência de Ligações do Mesmo Número',
+        labels={'quantidade': 'Quantidade de Sequências', 'tentativas': 'Tentativas'}
+    )
+
+    fig.update_layout(height=600, showlegend=False)
+    salvar_figura(fig, f"{pasta_saida}/rechamadas_relatorio_ligacoes.html")
+
+def gerar_secao_rechamadas(indicadores):
+    """Gera a seção HTML de rechamadas para o relatório de ligações."""
+    horas_janela = JANELA_RECHAMADA.total_seconds() / 3600
+    return f"""
+            <div class="visualization">
+                <h2>Rechamadas do Mesmo Número</h2>
+                <p>Ligações do mesmo número com intervalo de até {horas_janela:.0f}h formam uma sequência de tentativas.</p>
+                <div class="metricas">
+                    <div class="metrica-card">
+                        <h3>Números com Rechamada</h3>
+                        <div class="metrica-valor">{indicadores['numeros_com_rechamada']}</div>
+                    </div>
+                    <div class="metrica-card">
+                        <h3>Atendidos só na 2ª tentativa ou depois</h3>
+                        <div class="metrica-valor">{indicadores['percentual_numeros_2_tentativas']:.1f}%</div>
+                    </div>
+                    <div class="metrica-card">
+                        <h3>Mediana entre Tentativas</h3>
+                        <div class="metrica-valor">{indicadores['mediana_minutos_entre_tentativas']:.0f} min</div>
+                    </div>
+                </div>
+                <iframe src="rechamadas_relatorio_ligacoes.html"></iframe>
+            </div>
+    """
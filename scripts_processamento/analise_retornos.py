@@ -0,0 +1,148 @@
+import os
+
+import pandas as pd
+import plotly.express as px
+
+from analisar_relatorio_ligacoes import carregar_dados, processar_dados
+from empacotador_relatorio import empacotar_relatorio, salvar_figura
+from telefones import extrair_ramal_agente, normalizar_e164
+
+ARQUIVO_RECEBIDAS = "BD/LIGAÇÕES RECEBIDAS/12.24 até 05.25.csv"
+ARQUIVO_FEITAS = "BD/LIGAÇÕES FEITAS/12.24 até 05.25.csv"
+PASTA_SAIDA = "relatorios/resultados_relatorio_ligacoes"
+
+# Janela máxima entre a ligação perdida e o retorno para contar como retorno
+JANELA_RETORNO = pd.Timedelta(hours=48)
+
+# Percentis do tempo até o retorno exibidos nos resumos
+PERCENTIS = [0.5, 0.9]
+
+def preparar_perdidas(df_recebidas):
+    """Seleciona as ligações recebidas não atendidas, já filtradas por processar_dados()."""
+    perdidas = df_recebidas[df_recebidas['status_consolidado'] == 'Não Atendida']
+    return pd.DataFrame({
+        'data_hora': perdidas['data_hora'],
+        'numero': normalizar_e164(perdidas['Origem']),
+        'ramal': extrair_ramal_agente(perdidas['Agente / Atendente']),
+        'Status': perdidas['Status'].astype(str),
+    }).sort_values('data_hora', kind='stable', ignore_index=True)
+
+def preparar_saidas(df_feitas):
+    """Seleciona as ligações feitas para fora (sem as chamadas internas VoIP)."""
+    saidas = df_feitas[df_feitas['Tipo'].astype(str).str.lower() != 'v']
+    saidas = pd.DataFrame({
+        'data_hora_retorno': saidas['data_hora'],
+        'numero': normalizar_e164(saidas['Numero Discado']),
+        'ramal_retorno': saidas['Origem'].astype(str),
+    })
+    # Chave 0 = número inválido, não pode casar com ligações perdidas
+    saidas = saidas[saidas['numero'] != 0]
+    return saidas.sort_values('data_hora_retorno', kind='stable', ignore_index=True)
+
+def associar_retornos(perdidas, saidas, janela=JANELA_RETORNO):
+    """
+    Para cada ligação perdida, encontra a primeira ligação feita para o mesmo
+    número dentro da janela, com um merge_asof ordenado por data/hora.
+    """
+    retornos = pd.merge_asof(
+        perdidas,
+        saidas,
+        left_on='data_hora',
+        right_on='data_hora_retorno',
+        by='numero',
+        direction='forward',
+        tolerance=janela,
+    )
+    retornos['retornada'] = retornos['data_hora_retorno'].notna()
+    retornos['minutos_ate_retorno'] = (
+        (retornos['data_hora_retorno'] - retornos['data_hora']).dt.total_seconds() / 60
+    )
+    return retornos
+
+def resumir_retornos(retornos, dimensao):
+    """Taxa de retorno e percentis do tempo até o retorno por dimensão."""
+    grupos = retornos.groupby(dimensao)
+    resumo = pd.DataFrame({
+        'perdidas': grupos.size(),
+        'retornadas': grupos['retornada'].sum(),
+    })
+    resumo['taxa_retorno'] = resumo['retornadas'] / resumo['perdidas'] * 100
+    percentis = grupos['minutos_ate_retorno'].quantile(PERCENTIS).unstack()
+    percentis.columns = [f"p{int(p * 100)}_minutos" for p in percentis.columns]
+    return resumo.join(percentis).reset_index()
+
+def analisar_retornos(df_recebidas, df_feitas, janela=JANELA_RETORNO):
+    """Executa a análise de retornos e devolve o detalhe e os resumos por dia, hora e ramal."""
+    retornos = associar_retornos(preparar_perdidas(df_recebidas), preparar_saidas(df_feitas), janela)
+    retornos['data'] = retornos['data_hora'].dt.normalize()
+    retornos['hora'] = retornos['data_hora'].dt.hour
+    resumos = {
+        'dia': resumir_retornos(retornos, 'data'),
+        'hora': resumir_retornos(retornos, 'hora'),
+        'ramal': resumir_retornos(retornos, 'ramal'),
+    }
+    return retornos, resumos
+
+def gerar_relatorio_retornos(retornos, resumos, pasta_saida):
+    """Gera o gráfico de taxa de retorno por hora e o relatório HTML com os resumos."""
+    fig = px.bar(
+        resumos['hora'].assign(hora=lambda d: d['hora'].map(lambda h: f'{h:02d}h')),
+        x='hora',
+        y='taxa_retorno',
+        title='Taxa de Retorno das Ligações Perdidas por Hora',
+        labels={'taxa_retorno': 'Taxa de Retorno (%)', 'hora': 'Hora'}
+    )
+    fig.update_layout(height=600, showlegend=False)
+    salvar_figura(fig, f"{pasta_saida}/taxa_retorno_por_hora.html")
+
+    total = len(retornos)
+    taxa = retornos['retornada'].mean() * 100 if total else 0
+    tempos = retornos['minutos_ate_retorno'].dropna()
+    p50, p90 = (tempos.quantile(PERCENTIS).tolist() if len(tempos) else [0, 0])
+
+    tabelas = "".join(
+        f"<h2>Por {nome}</h2>{resumo.to_html(index=False, float_format='%.1f', border=0)}"
+        for nome, resumo in resumos.items()
+    )
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Retorno de Ligações Perdidas - Instituto Bhariátrica</title>
+        <meta charset="UTF-8">
+        <style>
+            body {{ font-family: Arial, sans-serif; margin: 0 auto; max-width: 1200px; padding: 20px; color: #343a40; }}
+            h1, h2 {{ color: #17a2b8; }}
+            table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
+            th, td {{ padding: 8px; text-align: left; border-bottom: 1px solid #dee2e6; }}
+            th {{ background-color: #17a2b8; color: #ffffff; }}
+            iframe {{ border: none; width: 100%; height: 600px; }}
+        </style>
+    </head>
+    <body>
+        <h1>Retorno de Ligações Perdidas</h1>
+        <p>Ligações não atendidas: <strong>{total}</strong> |
+           Retornadas em até {JANELA_RETORNO.total_seconds() / 3600:.0f}h: <strong>{taxa:.1f}%</strong> |
+           Tempo até o retorno (p50 / p90): <strong>{p50:.0f} / {p90:.0f} min</strong></p>
+        <iframe src="taxa_retorno_por_hora.html"></iframe>
+        {tabelas}
+    </body>
+    </html>
+    """
+    with open(f"{pasta_saida}/relatorio_retornos.html", "w", encoding="utf-8") as f:
+        f.write(html_content)
+    empacotar_relatorio(f"{pasta_saida}/relatorio_retornos.html")
+
+def main():
+    os.makedirs(PASTA_SAIDA, exist_ok=True)
+
+    df_recebidas = processar_dados(carregar_dados(ARQUIVO_RECEBIDAS))
+    df_feitas = carregar_dados(ARQUIVO_FEITAS)
+
+    retornos, resumos = analisar_retornos(df_recebidas, df_feitas)
+    gerar_relatorio_retornos(retornos, resumos, PASTA_SAIDA)
+
+    print("Análise de retornos concluída! Os resultados foram salvos em:", PASTA_SAIDA)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from cli import COMANDOS
+
+PASTA_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(PASTA_SCRIPTS)
+
+# Linha do -X importtime: "import time:  self [us] | cumulative | pacote"
+PREFIXO_IMPORTTIME = "import time:"
+
+def cenarios(comandos=None):
+    """
+    Linhas de comando medidas: a ajuda geral da CLI, a ajuda de cada comando pela
+    CLI e, como referência, a importação de todos os scripts de uma vez (o custo de
+    uma CLI que importasse tudo no topo)
+    """
+    comandos = comandos or list(COMANDOS)
+    modulos = sorted({COMANDOS[c][0] for c in comandos})
+    lista = {'cli --help': [os.path.join(PASTA_SCRIPTS, "cli.py"), '--help']}
+    for comando in comandos:
+        lista[f'cli {comando} --help'] = [os.path.join(PASTA_SCRIPTS, "cli.py"), comando, '--help']
+    lista['importar todos os scripts'] = ['-c', '; '.join(f"import {m}" for m in modulos)]
+    return lista
+
+def ler_importtime(saida_erro):
+    """Tempo total de importação (soma dos imports de primeiro nível) e os módulos mais pesados, em segundos"""
+    primeiro_nivel = []
+    for linha in saida_erro.splitlines():
+        if not linha.startswith(PREFIXO_IMPORTTIME):
+            continue
+        partes = linha[len(PREFIXO_IMPORTTIME):].split('|')
+        if len(partes) != 3 or not partes[1].strip().isdigit():
+            continue  # cabeçalho
+        nome = partes[2]
+        # Os imports aninhados vêm recuados; os de primeiro nível têm um espaço só
+        if not nome.startswith('  '):
+            primeiro_nivel.append((nome.strip(), int(partes[1]) / 1e6))
+    total = sum(segundos for _, segundos in primeiro_nivel)
+    return total, sorted(primeiro_nivel, key=lambda m: -m[1])
+
+def medir(argumentos, repeticoes=3):
+    """Roda a linha de comando com -X importtime e guarda a mediana das repetições"""
+    medicoes = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        processo = subprocess.run(
+            [sys.executable, '-X', 'importtime'] + argumentos,
+            cwd=RAIZ, capture_output=True, text=True,
+            env={**os.environ, 'PYTHONPATH': PASTA_SCRIPTS},
+        )
+        parede = time.perf_counter() - inicio
+        total, modulos = ler_importtime(processo.stderr)
+        medicoes.append({'parede_s': parede, 'importacao_s': total, 'modulos': modulos, 'codigo': processo.returncode})
+    mediana = sorted(medicoes, key=lambda m: m['parede_s'])[len(medicoes) // 2]
+    return {
+        'parede_s': round(statistics.median(m['parede_s'] for m in medicoes), 3),
+        'importacao_s': round(statistics.median(m['importacao_s'] for m in medicoes), 3),
+        'mais_pesados': [(nome, round(segundos, 3)) for nome, segundos in mediana['modulos'][:5]],
+        'ok': all(m['codigo'] == 0 for m in medicoes),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede o tempo de inicialização da CLI com python -X importtime.")
+    parser.add_argument('--comandos', nargs='+', choices=list(COMANDOS), help="Comandos medidos (padrão: todos)")
+    parser.add_argument('--repeticoes', type=int, default=3, help="Execuções por cenário (vale a mediana)")
+    parser.add_argument('--saida', help="Arquivo JSON para gravar as medições")
+    args = parser.parse_args()
+
+    resultados = {}
+    for nome, argumentos in cenarios(args.comandos).items():
+        resultados[nome] = medir(argumentos, args.repeticoes)
+        r = resultados[nome]
+        pesados = ', '.join(f"{m} {s:.2f}s" for m, s in r['mais_pesados'][:3])
+        falhou = "" if r['ok'] else " [falhou]"
+        print(f"{nome:<40} {r['parede_s']:6.2f}s total  {r['importacao_s']:6.2f}s em imports  ({pesados}){falhou}")
+
+    if args.saida:
+        os.makedirs(os.path.dirname(args.saida) or '.', exist_ok=True)
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, ensure_ascii=False, indent=2)
+        print(f"Medições salvas em {args.saida}")
+
+if __name__ == "__main__":
+    main()
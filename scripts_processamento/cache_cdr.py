@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+
+import pyarrow.feather as feather
+
+from carregador_cdr import carregar_cdr
+
+PASTA_CACHE = os.path.join("BD", "cache")
+
+# Incrementar quando o formato do DataFrame tratado mudar, para invalidar caches antigos
+VERSAO_CACHE = 2
+
+TAMANHO_BLOCO_HASH = 1024 * 1024
+
+def hash_arquivo(arquivo):
+    """Calcula o SHA-256 do conteúdo do arquivo, lendo em blocos."""
+    sha = hashlib.sha256()
+    with open(arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(TAMANHO_BLOCO_HASH), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+def impressao_digital(arquivo, com_hash=True):
+    """Retorna caminho, tamanho, mtime e (opcionalmente) hash do arquivo de origem."""
+    info = os.stat(arquivo)
+    digital = {
+        'caminho': os.path.abspath(arquivo),
+        'tamanho': info.st_size,
+        'mtime_ns': info.st_mtime_ns,
+    }
+    if com_hash:
+        digital['sha256'] = hash_arquivo(arquivo)
+    return digital
+
+def caminhos_cache(arquivo, pasta_cache=PASTA_CACHE):
+    """Retorna os caminhos do arquivo Feather e dos metadados do cache de uma exportação."""
+    chave = hashlib.sha1(os.path.abspath(arquivo).encode('utf-8')).hexdigest()[:16]
+    nome = os.path.splitext(os.path.basename(arquivo))[0]
+    base = os.path.join(pasta_cache, f"{nome}_{chave}")
+    return f"{base}.feather", f"{base}.json"
+
+def _ler_metadados(caminho_meta):
+    if not os.path.exists(caminho_meta):
+        return None
+    with open(caminho_meta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _salvar_metadados(caminho_meta, metadados):
+    temporario = f"{caminho_meta}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(metadados, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho_meta)
+
+def cache_valido(arquivo, pasta_cache=PASTA_CACHE):
+    """
+    Verifica se o cache da exportação ainda corresponde ao arquivo de origem.
+    Tamanho e mtime iguais dispensam o hash; se só o mtime mudou e o conteúdo
+    é o mesmo, os metadados são atualizados e o cache continua valendo.
+    """
+    caminho_dados, caminho_meta = caminhos_cache(arquivo, pasta_cache)
+    metadados = _ler_metadados(caminho_meta)
+    if not metadados or metadados.get('versao') != VERSAO_CACHE or not os.path.exists(caminho_dados):
+        return False
+
+    atual = impressao_digital(arquivo, com_hash=False)
+    origem = metadados['origem']
+    if atual['caminho'] != origem['caminho'] or atual['tamanho'] != origem['tamanho']:
+        return False
+    if atual['mtime_ns'] == origem['mtime_ns']:
+        return True
+
+    atual['sha256'] = hash_arquivo(arquivo)
+    if atual['sha256'] != origem['sha256']:
+        return False
+    _salvar_metadados(caminho_meta, {**metadados, 'origem': atual})
+    return True
+
+def atualizar_cache(arquivo, pasta_cache=PASTA_CACHE):
+    """Relê a exportação e grava o DataFrame tratado em Feather sem compressão."""
+    os.makedirs(pasta_cache, exist_ok=True)
+    caminho_dados, caminho_meta = caminhos_cache(arquivo, pasta_cache)
+
+    origem = impressao_digital(arquivo)
+    df = carregar_cdr(arquivo)
+
+    # Sem compressão para permitir a leitura por mapeamento de memória
+    temporario = f"{caminho_dados}.tmp"
+    df.to_feather(temporario, compression='uncompressed')
+    os.replace(temporario, caminho_dados)
+    _salvar_metadados(caminho_meta, {'versao': VERSAO_CACHE, 'origem': origem, 'linhas': len(df)})
+    return df
+
+def carregar_cdr_cache(arquivo, colunas=None, pasta_cache=PASTA_CACHE):
+    """
+    Carrega a exportação tratada a partir do cache colunar, reconstruindo-o
+    automaticamente quando o arquivo de origem muda. Com colunas, lê do
+    arquivo mapeado em memória apenas as colunas pedidas.
+    """
+    if not cache_valido(arquivo, pasta_cache):
+        df = atualizar_cache(arquivo, pasta_cache)
+        return df[colunas] if colunas is not None else df
+
+    caminho_dados, _ = caminhos_cache(arquivo, pasta_cache)
+    tabela = feather.read_table(caminho_dados, columns=colunas, memory_map=True)
+    return tabela.to_pandas()
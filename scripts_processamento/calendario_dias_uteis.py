@@ -0,0 +1,87 @@
+import os
+from datetime import date, timedelta
+from functools import lru_cache
+
+import pandas as pd
+from dateutil.easter import easter
+
+# UF e município da clínica (usados quando o relatório pede feriados locais)
+UF_PADRAO = 'MG'
+MUNICIPIO_PADRAO = 'Belo Horizonte'
+
+# Feriados municipais fixos (mês, dia) que a biblioteca holidays não cobre
+FERIADOS_MUNICIPAIS_FIXOS = {
+    'Belo Horizonte': {
+        (8, 15): 'Assunção de Nossa Senhora',
+        (12, 8): 'Imaculada Conceição',
+    },
+}
+
+# Feriados municipais móveis, em dias contados a partir do Domingo de Páscoa
+FERIADOS_MUNICIPAIS_MOVEIS = {
+    'Belo Horizonte': {
+        60: 'Corpus Christi',
+    },
+}
+
+# Arquivo opcional com fechamentos da clínica (uma data AAAA-MM-DD por linha, coluna 'data')
+ARQUIVO_FECHAMENTOS = os.path.join("BD", "fechamentos_clinica.csv")
+
+def feriados_municipais(anos, municipio):
+    """Retorna os feriados municipais do município nos anos informados."""
+    feriados = {}
+    for ano in anos:
+        for (mes, dia), nome in FERIADOS_MUNICIPAIS_FIXOS.get(municipio, {}).items():
+            feriados[date(ano, mes, dia)] = nome
+        pascoa = easter(ano)
+        for deslocamento, nome in FERIADOS_MUNICIPAIS_MOVEIS.get(municipio, {}).items():
+            feriados[pascoa + timedelta(days=deslocamento)] = nome
+    return feriados
+
+def carregar_fechamentos(arquivo=ARQUIVO_FECHAMENTOS):
+    """Carrega as datas de fechamento da clínica, se o arquivo existir."""
+    if not os.path.exists(arquivo):
+        return ()
+    df = pd.read_csv(arquivo)
+    return tuple(pd.to_datetime(df['data']).dt.date)
+
+def adicionar_argumentos_calendario(parser):
+    """Acrescenta --uf, --municipio, --feriados-locais e --fechamentos a um parser de linha de comando."""
+    parser.add_argument('--uf', help="UF para incluir os feriados estaduais (ex.: MG)")
+    parser.add_argument('--municipio', help="Município para incluir os feriados municipais (ex.: Belo Horizonte)")
+    parser.add_argument('--feriados-locais', action='store_true',
+                        help=f"Usa os feriados de {MUNICIPIO_PADRAO}/{UF_PADRAO} (atalho para --uf e --municipio)")
+    parser.add_argument('--fechamentos', default=ARQUIVO_FECHAMENTOS,
+                        help=f"CSV com as datas de fechamento da clínica (padrão: {ARQUIVO_FECHAMENTOS}, se existir)")
+
+def opcoes_calendario(args):
+    """Opções de filtro (uf, municipio, fechamentos) pedidas na linha de comando."""
+    uf = args.uf or (UF_PADRAO if args.feriados_locais else None)
+    municipio = args.municipio or (MUNICIPIO_PADRAO if args.feriados_locais else None)
+    return {'uf': uf, 'municipio': municipio, 'fechamentos': carregar_fechamentos(args.fechamentos)}
+
+@lru_cache(maxsize=None)
+def _calendario_feriados(anos, uf, municipio, fechamentos):
+    # Importado só quando o calendário é montado, para não pesar na inicialização
+    import holidays
+    feriados = dict(holidays.BR(years=anos, subdiv=uf))
+    if municipio:
+        feriados.update(feriados_municipais(anos, municipio))
+    datas = set(feriados) | set(fechamentos)
+    return pd.DatetimeIndex(sorted(datas))
+
+def obter_feriados(anos, uf=None, municipio=None, fechamentos=()):
+    """
+    Retorna o conjunto pré-calculado de datas não úteis (exceto fins de semana).
+    O resultado fica em cache por combinação de anos, UF, município e fechamentos,
+    então todos os relatórios de uma execução reaproveitam o mesmo calendário.
+    """
+    anos = tuple(sorted({int(ano) for ano in anos}))
+    fechamentos = tuple(sorted({pd.Timestamp(d).date() for d in fechamentos}))
+    return _calendario_feriados(anos, uf, municipio, fechamentos)
+
+def mascara_dia_util(datas, uf=None, municipio=None, fechamentos=()):
+    """Indica as datas úteis da série com um único isin sobre o calendário em cache."""
+    anos = datas.dt.year.dropna().unique()
+    feriados = obter_feriados(anos, uf=uf, municipio=municipio, fechamentos=fechamentos)
+    return (datas.dt.dayofweek < 5) & ~datas.dt.normalize().isin(feriados)
@@ -0,0 +1,164 @@
+import pandas as pd
+
+# Tamanho da amostra (em bytes) usada para detectar a codificação do arquivo
+TAMANHO_AMOSTRA_CODIFICACAO = 64 * 1024
+
+FORMATO_DATA_HORA = '%d/%m/%Y %H:%M:%S'
+
+# Colunas comuns às exportações do PABX (ligações recebidas e feitas)
+DTYPES_COMUNS = {
+    'R_ID': 'int32',
+    'Data/Hora': str,
+    'Numero Discado': str,
+    'Tipo': 'category',
+    'CLID': str,
+    'Valor Minuto': str,
+    'Tempo Total': str,
+    'Tempo Total2': str,
+    'Valor Total': str,
+}
+
+ESQUEMAS = {
+    'recebidas': {
+        **DTYPES_COMUNS,
+        'Origem': str,
+        'Agente / Atendente': 'category',
+        'Descrição': str,
+        'TME': str,
+        'TME 2': str,
+        'Status': 'category',
+    },
+    'feitas': {
+        **DTYPES_COMUNS,
+        'Origem': 'category',
+        'Cidade': str,
+        'Tipo 2': 'category',
+        'IP Origem': str,
+        'UserAgent': str,
+    },
+}
+
+# Colunas de duração no formato HH:MM:SS e o nome da coluna em segundos gerada a partir delas
+COLUNAS_DURACAO = {
+    'Tempo Total2': 'tempo_total',
+    'TME 2': 'tempo_espera',
+}
+
+# Colunas monetárias ('0,12900') e o nome da coluna inteira gerada a partir delas
+COLUNAS_VALOR = {
+    'Valor Minuto': 'valor_minuto',
+    'Valor Total': 'valor_total',
+}
+
+# O PABX exporta valores com 5 casas decimais; guardados como inteiros em 1/100000 de real
+CASAS_DECIMAIS_VALOR = 5
+
+def detectar_codificacao(arquivo, tamanho_amostra=TAMANHO_AMOSTRA_CODIFICACAO):
+    """Detecta a codificação do arquivo lendo apenas uma amostra do início."""
+    with open(arquivo, 'rb') as f:
+        amostra = f.read(tamanho_amostra)
+    try:
+        amostra.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # Um caractere multibyte cortado no fim da amostra não invalida o UTF-8
+        if e.start < len(amostra) - 3:
+            return 'latin1'
+    return 'utf-8'
+
+def detectar_esquema(colunas):
+    """Identifica se a exportação é de ligações recebidas ou feitas pelo cabeçalho."""
+    return 'recebidas' if 'Status' in colunas else 'feitas'
+
+def duracao_em_segundos(serie):
+    """Converte durações HH:MM:SS em segundos inteiros (int32) de uma só vez."""
+    segundos = pd.to_timedelta(serie, errors='coerce').dt.total_seconds()
+    return segundos.fillna(0).astype('int32')
+
+def valor_em_inteiros(serie, casas=CASAS_DECIMAIS_VALOR):
+    """
+    Converte valores com vírgula decimal ('1.234,56789') em inteiros na menor
+    unidade exportada (1/100000 de real), sem passar por float.
+    """
+    texto = serie.astype(str).str.replace(r'[^\d,-]', '', regex=True)
+    negativo = texto.str.startswith('-')
+    partes = texto.str.replace('-', '', regex=False).str.split(',', n=1, expand=True).reindex(columns=[0, 1])
+    inteiro = pd.to_numeric(partes[0], errors='coerce').fillna(0).astype('int64')
+    fracao = partes[1].fillna('').str.slice(0, casas).str.ljust(casas, '0')
+    fracao = pd.to_numeric(fracao, errors='coerce').fillna(0).astype('int64')
+    valor = inteiro * 10 ** casas + fracao
+    return valor.where(~negativo, -valor)
+
+def tipar_cdr(df):
+    """Gera as colunas derivadas (data/hora, durações em segundos e valores inteiros) de um bloco do CDR."""
+    df['data_hora'] = pd.to_datetime(df['Data/Hora'], format=FORMATO_DATA_HORA)
+    df['data'] = df['data_hora'].dt.normalize()
+    df['hora'] = df['Data/Hora'].str.slice(11)
+    for coluna, destino in COLUNAS_DURACAO.items():
+        if coluna in df.columns:
+            df[destino] = duracao_em_segundos(df[coluna])
+    for coluna, destino in COLUNAS_VALOR.items():
+        if coluna in df.columns:
+            df[destino] = valor_em_inteiros(df[coluna])
+    return df
+
+def corrigir_nome_coluna(nome):
+    """Corrige nomes de coluna em UTF-8 lidos como latin1 (ex.: 'DescriÃ§Ã£o')."""
+    try:
+        return nome.encode('latin1').decode('utf-8')
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return nome
+
+def _opcoes_leitura(arquivo, colunas=None):
+    # O PABX grava o cabeçalho em UTF-8 e o corpo em latin1, por isso os nomes são corrigidos
+    codificacao = detectar_codificacao(arquivo)
+    cabecalho = pd.read_csv(arquivo, sep=';', encoding=codificacao, nrows=0).columns
+    nomes = {c: corrigir_nome_coluna(c) for c in cabecalho}
+    esquema = ESQUEMAS[detectar_esquema(nomes.values())]
+    dtypes = {original: esquema[nome] for original, nome in nomes.items() if nome in esquema}
+    if colunas is not None:
+        # Data/Hora é sempre necessária para gerar as colunas derivadas
+        pedidas = set(colunas) | {'Data/Hora'}
+        colunas = [original for original, nome in nomes.items() if nome in pedidas]
+    opcoes = {
+        'sep': ';',
+        'encoding': codificacao,
+        'dtype': dtypes,
+        'usecols': colunas,
+    }
+    return opcoes, nomes
+
+def _ler(arquivo, opcoes, nomes):
+    return tipar_cdr(pd.read_csv(arquivo, **opcoes).rename(columns=nomes))
+
+def _ler_blocos(arquivo, opcoes, nomes, chunksize):
+    entregues = 0
+    try:
+        for bloco in pd.read_csv(arquivo, chunksize=chunksize, **opcoes):
+            yield tipar_cdr(bloco.rename(columns=nomes))
+            entregues += len(bloco)
+    except UnicodeDecodeError:
+        # Byte inválido depois da amostra: relê em latin1 e descarta os registros já
+        # entregues lendo-os de novo (pular por linha erraria com quebras de linha
+        # dentro de campos entre aspas, como a Descrição)
+        pular = entregues
+        for bloco in pd.read_csv(arquivo, chunksize=chunksize, **{**opcoes, 'encoding': 'latin1'}):
+            if pular >= len(bloco):
+                pular -= len(bloco)
+                continue
+            if pular:
+                bloco, pular = bloco.iloc[pular:].copy(), 0
+            yield tipar_cdr(bloco.rename(columns=nomes))
+
+def carregar_cdr(arquivo, colunas=None, chunksize=None):
+    """
+    Carrega uma exportação do PABX (recebidas ou feitas) em uma única leitura tipada.
+    Com chunksize, retorna um iterador de blocos já tipados.
+    """
+    opcoes, nomes = _opcoes_leitura(arquivo, colunas)
+    if chunksize:
+        return _ler_blocos(arquivo, opcoes, nomes, chunksize)
+    try:
+        return _ler(arquivo, opcoes, nomes)
+    except UnicodeDecodeError:
+        # Byte inválido depois da amostra: o arquivo não é UTF-8
+        return _ler(arquivo, {**opcoes, 'encoding': 'latin1'}, nomes)
@@ -1,7 +1,10 @@
+import argparse
 import pandas as pd
 import os
 from datetime import datetime
 
+from config_execucao import adicionar_argumentos_periodo, meses_dos_argumentos, pasta_audios_mes
+
 class ClassificadorLigacoes:
     def __init__(self):
         self.mapeamento_atendentes = {
@@ -74,18 +77,28 @@ class ClassificadorLigacoes:
         print("\nLigações por ramal:")
         print(df['ramal'].value_counts())
 
-if __name__ == "__main__":
-    classificador = ClassificadorLigacoes()
+def classificar_mes(mes, pasta_resultados="resultados"):
+    """Classifica as ligações gravadas do mês e salva em classificacao_ligacoes_<mes>.xlsx"""
+    pasta_audios = pasta_audios_mes(mes)
+    if not os.path.isdir(pasta_audios):
+        print(f"Pasta de áudios {pasta_audios} não encontrada; nenhuma ligação para classificar")
+        return None
     
-    # Pasta com os áudios
-    pasta_audios = os.path.join("automatizacoes_de_download", "automatizacao_downloads_audios", "ligacoes_descompactadas", "2025-05")
+    classificador = ClassificadorLigacoes()
+    os.makedirs(pasta_resultados, exist_ok=True)
     
-    # Classifica as ligações
+    # Classifica as ligações da pasta de áudios do mês
     df = classificador.classificar_ligacoes(pasta_audios)
     
-    # Pasta para salvar os resultados
-    pasta_resultados = "resultados"
-    os.makedirs(pasta_resultados, exist_ok=True)
+    # Salva o resultado (um arquivo por mês)
+    caminho_saida = os.path.join(pasta_resultados, f"classificacao_ligacoes_{mes}.xlsx")
+    classificador.salvar_classificacao(df, caminho_saida)
+    return caminho_saida
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Classifica as ligações gravadas de um ou mais meses por atendente.")
+    adicionar_argumentos_periodo(parser)
+    args = parser.parse_args()
     
-    # Salva o resultado
-    classificador.salvar_classificacao(df, os.path.join(pasta_resultados, "classificacao_ligacoes.xlsx")) 
\ No newline at end of file
+    for mes in meses_dos_argumentos(args):
+        classificar_mes(mes)
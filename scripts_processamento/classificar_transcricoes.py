@@ -1,3 +1,4 @@
+import argparse
 import pandas as pd
 import os
 import json
@@ -6,6 +7,9 @@ import re
 from datetime import datetime
 from tqdm import tqdm
 
+from config_execucao import MES_PADRAO, adicionar_argumentos_periodo, meses_dos_argumentos, pasta_resultados_mes
+from esquema_classificacao import colunas_categorias, montar_tabelas, salvar_classificacao
+
 # Definição das categorias e palavras-chave
 CATEGORIAS = {
     'Agendamento de consulta': ['agendar', 'marcar', 'consulta', 'horário', 'disponibilidade'],
@@ -119,16 +123,28 @@ def detectar_categorias(texto: str) -> Tuple[List[str], Dict[str, str]]:
     
     return categorias_detectadas, trechos
 
-def classificar_transcricoes():
+def arquivo_classificacao_mes(pasta_resultados: str) -> str:
+    """
+    Planilha de classificação da partição: a existente é sobrescrita; se ainda
+    não houver, cria uma nova com a data da execução.
+    """
+    existentes = [f for f in os.listdir(pasta_resultados) if f.startswith('classificacao_parcial_') and f.endswith('.xlsx')]
+    nome = max(existentes) if existentes else f"classificacao_parcial_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    return os.path.join(pasta_resultados, nome)
+
+def classificar_transcricoes(mes: str = MES_PADRAO):
     """
-    Função principal que coordena o processo de classificação.
+    Função principal que coordena o processo de classificação de um mês.
     """
     # Configuração de pastas
-    pasta_transcricoes = os.path.join("scripts_processamento", "bd_transcricao", "2025-05", "transcricoes_individuais")
-    pasta_resultados = os.path.join("scripts_processamento", "bd_transcricao", "2025-05")
-    arquivo_classificacao = os.path.join(pasta_resultados, "classificacao_parcial_20250601_150727.xlsx")
+    pasta_resultados = pasta_resultados_mes(mes)
+    pasta_transcricoes = os.path.join(pasta_resultados, "transcricoes_individuais")
+    if not os.path.exists(pasta_resultados):
+        print(f"Pasta {pasta_resultados} não encontrada!")
+        return
+    arquivo_classificacao = arquivo_classificacao_mes(pasta_resultados)
     
-    print("Iniciando classificação das transcrições disponíveis...")
+    print(f"Iniciando classificação das transcrições disponíveis de {mes}...")
     
     # Carrega as transcrições
     transcricoes = carregar_transcricoes(pasta_transcricoes)
@@ -147,9 +163,12 @@ def classificar_transcricoes():
     df['trecho_representativo'] = None
     
     # Processa cada transcrição
+    categorias_por_ligacao, trechos_por_ligacao = [], []
     for idx, row in tqdm(df.iterrows(), total=len(df), desc="Classificando"):
         texto = row['texto_transcrito']
         categorias, trechos = detectar_categorias(texto)
+        categorias_por_ligacao.append(categorias)
+        trechos_por_ligacao.append(trechos)
         
         # Atualiza o DataFrame
         df.at[idx, 'categorias_detectadas'] = ', '.join(categorias)
@@ -158,13 +177,20 @@ def classificar_transcricoes():
     # Salva o resultado sobrescrevendo o arquivo existente
     df.to_excel(arquivo_classificacao, index=False)
     
+    # Versão colunar para as análises: máscara de categorias, colunas tipadas e trechos à parte
+    tabela, tabela_trechos = montar_tabelas(df, categorias_por_ligacao, trechos_por_ligacao)
+    sufixo = os.path.splitext(os.path.basename(arquivo_classificacao))[0].rsplit('_', 2)[-2:]
+    caminhos_colunares = salvar_classificacao(tabela, tabela_trechos, pasta_resultados, '_'.join(sufixo))
+    
     print("\nClassificação parcial concluída!")
     print(f"Resultados salvos em: {arquivo_classificacao}")
+    print(f"Versão colunar salva em: {', '.join(caminhos_colunares)}")
     
     # Exibe estatísticas das categorias
     print("\nEstatísticas por categoria:")
+    por_categoria = colunas_categorias(tabela['categorias']).sum()
     for categoria in list(CATEGORIAS.keys()) + ["Outros assuntos"]:
-        total = df['categorias_detectadas'].str.contains(categoria, na=False).sum()
+        total = por_categoria[categoria]
         percentual = (total / len(df)) * 100
         print(f"{categoria}: {total} ligações ({percentual:.1f}%)")
     
@@ -172,4 +198,8 @@ def classificar_transcricoes():
     print("Você pode executar novamente este script mais tarde para classificar mais transcrições.")
 
 if __name__ == "__main__":
-    classificar_transcricoes() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Classifica as transcrições de um ou mais meses.")
+    adicionar_argumentos_periodo(parser)
+    args = parser.parse_args()
+    for mes in meses_dos_argumentos(args):
+        classificar_transcricoes(mes) 
\ No newline at end of file
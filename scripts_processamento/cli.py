@@ -0,0 +1,49 @@
+import argparse
+import runpy
+import sys
+
+# Subcomando -> (módulo do script, descrição). Nada aqui importa os scripts: cada
+# módulo (e o whisper/torch, o plotly ou o holidays que ele usa) só é carregado
+# quando o seu subcomando roda, então o --help geral sai na hora.
+COMANDOS = {
+    'transcrever': ('transcrever', "Transcreve os áudios das ligações com o Whisper"),
+    'classificar_transcricoes': ('classificar_transcricoes', "Classifica as transcrições por categoria"),
+    'classificar_ligacoes': ('classificar_ligacoes', "Classifica as ligações gravadas por atendente"),
+    'visualizar': ('gerar_visualizacoes', "Gera os gráficos interativos e o index.html das transcrições"),
+    'analisar_cdr': ('analisar_relatorio_ligacoes', "Analisa o relatório de ligações recebidas do PABX"),
+    'streaming': ('agregacao_streaming', "Gera o relatório de ligações em modo streaming"),
+    'cubo': ('cubo_ligacoes', "Atualiza o cubo de ligações e gera o relatório a partir dele"),
+    'custos': ('analise_custos_saida', "Analisa custo e minutos das ligações feitas"),
+    'escala': ('simulador_escala', "Simula o atendimento para escalas de agentes"),
+    'ingerir': ('ingestao_cdr', "Ingere exportações do PABX no armazém mensal"),
+    'empacotar': ('empacotador_relatorio', "Empacota relatórios HTML com plotly.js compartilhado"),
+    'converter_classificacao': ('esquema_classificacao', "Converte uma planilha de classificação para Parquet"),
+    'meses': ('executar_meses', "Processa vários meses em paralelo e consolida"),
+    'pipeline': ('orquestrador', "Roda o pipeline completo, pulando etapas sem alteração"),
+}
+
+def montar_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Ponto de entrada único dos scripts de processamento das ligações.",
+        epilog="Use 'cli.py <comando> --help' para ver as opções de cada comando.",
+    )
+    subparsers = parser.add_subparsers(dest='comando', metavar='comando', required=True)
+    for nome, (_, descricao) in COMANDOS.items():
+        # As opções de cada comando ficam no próprio script, que recebe o resto da linha
+        subparsers.add_parser(nome, help=descricao, add_help=False)
+    return parser
+
+def executar_comando(comando, argumentos):
+    """Roda o script do comando como se fosse chamado direto, com os argumentos dele."""
+    modulo, _ = COMANDOS[comando]
+    sys.argv = [sys.argv[0]] + list(argumentos)
+    # alter_sys: o script vira o __main__ de verdade, como os pools de processos esperam
+    runpy.run_module(modulo, run_name='__main__', alter_sys=True)
+
+def main(argv=None):
+    args, resto = montar_parser().parse_known_args(argv)
+    executar_comando(args.comando, resto)
+
+if __name__ == "__main__":
+    main()
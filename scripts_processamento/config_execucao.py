@@ -0,0 +1,63 @@
+import os
+from datetime import datetime
+
+# Mês usado quando nenhum é informado (pode ser trocado pela variável de ambiente MES_EXECUCAO)
+MES_PADRAO = os.environ.get("MES_EXECUCAO", "2025-05")
+
+PASTA_AUDIOS = os.path.join("automatizacoes_de_download", "automatizacao_downloads_audios", "ligacoes_descompactadas")
+PASTA_TRANSCRICOES = os.path.join("scripts_processamento", "bd_transcricao")
+PASTA_CONSOLIDADO = os.path.join(PASTA_TRANSCRICOES, "consolidado")
+PASTA_RELATORIOS = "relatorios"
+
+def validar_mes(mes):
+    """Confere o formato AAAA-MM e retorna o mês normalizado."""
+    try:
+        return datetime.strptime(str(mes), '%Y-%m').strftime('%Y-%m')
+    except ValueError:
+        raise ValueError(f"Mês inválido: {mes} (use AAAA-MM)")
+
+def meses_do_periodo(inicio, fim=None):
+    """Lista os meses (AAAA-MM) de inicio a fim, inclusive. Aceita datas ou meses."""
+    # pandas só aqui: os demais helpers são usados no --help da CLI
+    import pandas as pd
+    
+    fim = fim or inicio
+    return [str(p) for p in pd.period_range(pd.Period(inicio, freq='M'), pd.Period(fim, freq='M'), freq='M')]
+
+def pasta_audios_mes(mes, raiz=""):
+    """Pasta dos áudios baixados do mês."""
+    return os.path.join(raiz, PASTA_AUDIOS, validar_mes(mes))
+
+def pasta_resultados_mes(mes, raiz=""):
+    """Partição mensal das transcrições e classificações."""
+    return os.path.join(raiz, PASTA_TRANSCRICOES, validar_mes(mes))
+
+def pasta_relatorio_mes(mes, raiz=""):
+    """Pasta do relatório do mês (index.html e gráficos)."""
+    return os.path.join(raiz, PASTA_RELATORIOS, validar_mes(mes))
+
+def meses_disponiveis(raiz=""):
+    """Meses que já têm partição de transcrições."""
+    pasta = os.path.join(raiz, PASTA_TRANSCRICOES)
+    if not os.path.exists(pasta):
+        return []
+    meses = []
+    for nome in os.listdir(pasta):
+        try:
+            if validar_mes(nome) == nome:
+                meses.append(nome)
+        except ValueError:
+            continue
+    return sorted(meses)
+
+def adicionar_argumentos_periodo(parser):
+    """Acrescenta --mes, --inicio e --fim a um parser de linha de comando."""
+    parser.add_argument('--mes', help=f"Mês a processar (AAAA-MM, padrão {MES_PADRAO})")
+    parser.add_argument('--inicio', help="Primeiro mês do período (AAAA-MM)")
+    parser.add_argument('--fim', help="Último mês do período (AAAA-MM, padrão: o mesmo do início)")
+
+def meses_dos_argumentos(args):
+    """Meses pedidos na linha de comando: --mes, ou o período --inicio/--fim, ou o mês padrão."""
+    if args.inicio:
+        return meses_do_periodo(args.inicio, args.fim)
+    return [validar_mes(args.mes or MES_PADRAO)]
@@ -0,0 +1,136 @@
+import hashlib
+import inspect
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+ARQUIVO_MANIFESTO = "manifesto_construcao.json"
+
+def artefato(nome, entrada, render, saidas, depende=(), codigo=()):
+    """
+    Declara um artefato do relatório: `entrada(dados)` calcula o agregado que ele
+    consome, `render(agregado, pasta)` grava os arquivos de `saidas` e `depende`
+    lista artefatos que precisam estar prontos antes. `codigo` lista as funções
+    (ou módulos inteiros) que o render usa: mudar qualquer uma delas também
+    invalida o artefato.
+    """
+    return {'nome': nome, 'entrada': entrada, 'render': render, 'saidas': list(saidas),
+            'depende': list(depende), 'codigo': list(codigo)}
+
+def hash_valor(valor):
+    """Hash estável do conteúdo de agregados (DataFrames, Series, tuplas, dicts, escalares)."""
+    # pandas importado só no uso: o orquestrador importa este módulo no --help
+    import pandas as pd
+    
+    h = hashlib.sha256()
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        colunas = valor.columns if isinstance(valor, pd.DataFrame) else [valor.name]
+        h.update(json.dumps([str(c) for c in colunas]).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes())
+    elif isinstance(valor, (list, tuple)):
+        for item in valor:
+            h.update(hash_valor(item).encode('utf-8'))
+    elif isinstance(valor, dict):
+        for chave in sorted(valor):
+            h.update(str(chave).encode('utf-8'))
+            h.update(hash_valor(valor[chave]).encode('utf-8'))
+    else:
+        h.update(repr(valor).encode('utf-8'))
+    return h.hexdigest()
+
+def hash_arquivo(caminho):
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(bloco)
+    return h.hexdigest()
+
+def hash_codigo(render):
+    # Mudar o código do gráfico também invalida o artefato (aceita função ou módulo inteiro)
+    try:
+        return hashlib.sha256(inspect.getsource(render).encode('utf-8')).hexdigest()
+    except (OSError, TypeError):
+        return getattr(render, '__qualname__', render.__name__)
+
+def carregar_manifesto(pasta):
+    caminho = os.path.join(pasta, ARQUIVO_MANIFESTO)
+    if not os.path.exists(caminho):
+        return {'artefatos': {}}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def salvar_manifesto(pasta, manifesto):
+    with open(os.path.join(pasta, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+def _atualizado(registro, chave, saidas):
+    """O artefato está em dia se a chave bate e as saídas continuam com o mesmo conteúdo."""
+    if not registro or registro.get('chave') != chave:
+        return False
+    for saida in saidas:
+        if not os.path.exists(saida) or registro['saidas'].get(saida) != hash_arquivo(saida):
+            return False
+    return True
+
+def _executar(render, agregado, pasta):
+    inicio = time.perf_counter()
+    render(agregado, pasta)
+    return time.perf_counter() - inicio
+
+def _niveis(artefatos):
+    """Agrupa os artefatos em níveis: cada nível só depende dos anteriores."""
+    restantes = {a['nome']: a for a in artefatos}
+    prontos, niveis = set(), []
+    while restantes:
+        nivel = [a for a in restantes.values() if set(a['depende']) <= prontos]
+        if not nivel:
+            raise ValueError(f"Dependência circular ou inexistente entre: {', '.join(restantes)}")
+        niveis.append(nivel)
+        for a in nivel:
+            prontos.add(a['nome'])
+            del restantes[a['nome']]
+    return niveis
+
+def construir(artefatos, dados, pasta, processos=None, forcar=False):
+    """
+    Constrói os artefatos declarados a partir dos dados: só renderiza os que
+    tiveram o agregado de entrada (ou uma dependência) alterado, em paralelo
+    dentro de cada nível, e registra chaves, hashes das saídas e tempos no
+    manifesto da pasta.
+    """
+    manifesto = carregar_manifesto(pasta)
+    registros = manifesto['artefatos']
+    inicio_total = time.perf_counter()
+    chaves = {}
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        for nivel in _niveis(artefatos):
+            tarefas = {}
+            for a in nivel:
+                agregado = a['entrada'](dados)
+                chave = hash_valor([
+                    hash_valor(agregado),
+                    [hash_codigo(f) for f in [a['render']] + a['codigo']],
+                    [chaves[d] for d in a['depende']],
+                ])
+                chaves[a['nome']] = chave
+                if not forcar and _atualizado(registros.get(a['nome']), chave, a['saidas']):
+                    registros[a['nome']]['status'] = 'reaproveitado'
+                    continue
+                tarefas[a['nome']] = (a, chave, executor.submit(_executar, a['render'], agregado, pasta))
+
+            for nome, (a, chave, tarefa) in tarefas.items():
+                duracao = tarefa.result()
+                registros[nome] = {
+                    'chave': chave,
+                    'saidas': {s: hash_arquivo(s) for s in a['saidas']},
+                    'duracao_s': round(duracao, 3),
+                    'status': 'renderizado',
+                    'atualizado_em': datetime.now().isoformat(timespec='seconds'),
+                }
+
+    manifesto['duracao_total_s'] = round(time.perf_counter() - inicio_total, 3)
+    salvar_manifesto(pasta, manifesto)
+    return manifesto
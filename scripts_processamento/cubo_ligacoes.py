@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from analisar_relatorio_ligacoes import (
+    processar_dados,
+    gerar_metricas,
+    gerar_grafico_horas,
+    gerar_grafico_dias_semana,
+    gerar_grafico_regioes,
+    gerar_secao_regioes,
+    gerar_relatorio_html,
+)
+from calendario_dias_uteis import adicionar_argumentos_calendario, opcoes_calendario
+from ingestao_cdr import PASTA_ARMAZEM, pasta_mes
+
+PASTA_CUBO = os.path.join("BD", "cubo")
+
+# O relatório do cubo não tem rechamadas, quantis nem métricas por agente: fica em
+# pasta própria para não sobrescrever o relatório completo de analisar_relatorio_ligacoes
+PASTA_SAIDA_CUBO = os.path.join("relatorios", "resultados_cubo_ligacoes")
+
+# Sobe quando as dimensões ou medidas do cubo mudam: invalida as partições gravadas
+VERSAO_CUBO = 1
+
+# Faixas de duração (segundos) usadas como dimensão do cubo
+LIMITES_FAIXA_DURACAO = [0, 22, 50, 120, 300, np.inf]
+FAIXAS_DURACAO = ['0-21s', '22-49s', '50s-2min', '2-5min', '5min+']
+
+DIMENSOES = [
+    'data',
+    'hora_cheia',
+    'dia_semana',
+    'status_consolidado',
+    'Status',
+    'Agente / Atendente',
+    'origem_uf',
+    'faixa_duracao',
+]
+
+def construir_cubo(df_processado):
+    """
+    Agrega a base processada em um cubo data × hora × dia da semana × status ×
+    agente × UF × faixa de duração, com quantidade e somas de duração e espera.
+    """
+    df = df_processado.assign(
+        hora_cheia=df_processado['data_hora'].dt.hour.astype('int8'),
+        dia_semana=df_processado['dia_semana'].astype('int8'),
+        faixa_duracao=pd.cut(df_processado['tempo_total'], LIMITES_FAIXA_DURACAO,
+                             labels=FAIXAS_DURACAO, right=False),
+    )
+    medidas = {'quantidade': ('data_hora', 'size'), 'soma_tempo_total': ('tempo_total', 'sum')}
+    if 'tempo_espera' in df.columns:
+        medidas['soma_tempo_espera'] = ('tempo_espera', 'sum')
+    cubo = df.groupby(DIMENSOES, observed=True, dropna=False).agg(**medidas).reset_index()
+    categoricas = ['status_consolidado', 'Status', 'Agente / Atendente', 'origem_uf', 'faixa_duracao']
+    return cubo.astype({coluna: 'category' for coluna in categoricas})
+
+def _impressao_particao(pasta_particao, opcoes_filtro):
+    # Os filtros e a versão do cubo entram junto com os arquivos: o mesmo mês
+    # agregado com outros filtros é outro cubo. O ida e volta pelo JSON deixa a
+    # impressão igual à lida do manifesto (tuplas viram listas, datas viram texto)
+    arquivos = sorted(f for f in os.listdir(pasta_particao) if f.endswith('.parquet'))
+    return json.loads(json.dumps({
+        'versao': VERSAO_CUBO,
+        'filtros': dict(sorted(opcoes_filtro.items())),
+        'arquivos': [[f, os.stat(os.path.join(pasta_particao, f)).st_size] for f in arquivos],
+    }, default=str))
+
+def _carregar_manifesto(pasta_cubo):
+    caminho = os.path.join(pasta_cubo, "manifesto.json")
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _salvar_manifesto(pasta_cubo, manifesto):
+    caminho = os.path.join(pasta_cubo, "manifesto.json")
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+def gravar_mes(cubo_mes, mes, pasta_cubo=PASTA_CUBO):
+    """Grava (substituindo) a partição do cubo de um mês."""
+    os.makedirs(pasta_cubo, exist_ok=True)
+    cubo_mes.to_parquet(os.path.join(pasta_cubo, f"mes={mes}.parquet"), index=False)
+
+def atualizar_cubo(destino_armazem=PASTA_ARMAZEM, pasta_cubo=PASTA_CUBO, **opcoes_filtro):
+    """
+    Atualiza o cubo a partir do armazém de ligações recebidas (ingestao_cdr.py).
+    Só os meses cujos arquivos (ou as opções de filtro) mudaram desde a última
+    atualização são reagregados.
+    Retorna a lista de meses atualizados.
+    """
+    pasta_tipo = os.path.join(destino_armazem, 'recebidas')
+    manifesto = _carregar_manifesto(pasta_cubo)
+    atualizados = []
+    for nome in sorted(os.listdir(pasta_tipo)) if os.path.isdir(pasta_tipo) else []:
+        mes = nome.split('=', 1)[1]
+        pasta_particao = pasta_mes(pasta_tipo, mes)
+        impressao = _impressao_particao(pasta_particao, opcoes_filtro)
+        if manifesto.get(mes) == impressao:
+            continue
+        df = processar_dados(pd.read_parquet(pasta_particao), **opcoes_filtro)
+        gravar_mes(construir_cubo(df), mes, pasta_cubo)
+        manifesto[mes] = impressao
+        atualizados.append(mes)
+    if atualizados:
+        _salvar_manifesto(pasta_cubo, manifesto)
+    return atualizados
+
+def carregar_cubo(inicio=None, fim=None, pasta_cubo=PASTA_CUBO):
+    """Lê as partições mensais do cubo que cobrem o período e recorta pelas datas."""
+    inicio = pd.Timestamp(inicio) if inicio is not None else None
+    fim = pd.Timestamp(fim) if fim is not None else None
+    partes = []
+    for nome in sorted(os.listdir(pasta_cubo)) if os.path.isdir(pasta_cubo) else []:
+        if not nome.endswith('.parquet'):
+            continue
+        mes = pd.Period(nome[len('mes='):-len('.parquet')], freq='M')
+        if (inicio is not None and mes.end_time < inicio) or (fim is not None and mes.start_time > fim):
+            continue
+        partes.append(pd.read_parquet(os.path.join(pasta_cubo, nome)))
+    if not partes:
+        raise FileNotFoundError(f"Nenhuma partição do cubo encontrada em {pasta_cubo}")
+
+    cubo = pd.concat(partes, ignore_index=True)
+    if inicio is not None:
+        cubo = cubo[cubo['data'] >= inicio]
+    if fim is not None:
+        cubo = cubo[cubo['data'] <= fim]
+    categoricas = cubo.columns.intersection(['status_consolidado', 'Status', 'Agente / Atendente', 'origem_uf', 'faixa_duracao'])
+    return cubo.astype({coluna: 'category' for coluna in categoricas})
+
+def fatiar_cubo(cubo, dimensoes, medida='quantidade'):
+    """Soma a medida do cubo pelas dimensões pedidas (ex.: ['dia_semana', 'hora_cheia'])."""
+    return cubo.groupby(dimensoes, observed=True)[medida].sum()
+
+def main():
+    parser = argparse.ArgumentParser(description="Atualiza o cubo de ligações e gera o relatório a partir dele.")
+    parser.add_argument('--inicio', help="Data inicial (AAAA-MM-DD)")
+    parser.add_argument('--fim', help="Data final (AAAA-MM-DD)")
+    parser.add_argument('--armazem', default=PASTA_ARMAZEM)
+    parser.add_argument('--pasta-cubo', default=PASTA_CUBO)
+    parser.add_argument('--pasta-saida', default=PASTA_SAIDA_CUBO, help=f"Pasta do relatório do cubo (padrão: {PASTA_SAIDA_CUBO})")
+    adicionar_argumentos_calendario(parser)
+    args = parser.parse_args()
+
+    meses = atualizar_cubo(args.armazem, args.pasta_cubo, **opcoes_calendario(args))
+    print(f"Meses reagregados no cubo: {', '.join(meses) if meses else 'nenhum'}")
+
+    os.makedirs(args.pasta_saida, exist_ok=True)
+    cubo = carregar_cubo(args.inicio, args.fim, args.pasta_cubo)
+    metricas = gerar_metricas(cubo)
+    volume_hora = gerar_grafico_horas(cubo, args.pasta_saida)
+    volume_dia = gerar_grafico_dias_semana(cubo, args.pasta_saida)
+    volume_uf = gerar_grafico_regioes(cubo, args.pasta_saida)
+    gerar_relatorio_html(metricas, volume_hora, volume_dia, args.pasta_saida, [gerar_secao_regioes(volume_uf)])
+
+    print("Relatório gerado a partir do cubo em:", args.pasta_saida)
+
+if __name__ == "__main__":
+    main()
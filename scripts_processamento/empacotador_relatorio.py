@@ -0,0 +1,165 @@
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+
+from plotly.offline import get_plotlyjs
+
+ARQUIVO_PLOTLY = "plotly.min.js"
+
+# iframes dos relatórios que apontam para gráficos salvos por salvar_figura()
+PADRAO_IFRAME = re.compile(r'<iframe\s+src="(?P<src>[^"]+)\.html"[^>]*>\s*</iframe>')
+
+ALTURA_PADRAO = 600
+
+# Renderiza cada gráfico só quando ele se aproxima da área visível e mede o tempo
+# até os gráficos visíveis na abertura da página estarem prontos
+SCRIPT_RENDERIZACAO = """
+<script>
+(function () {
+    const templates = JSON.parse(document.getElementById('plotly-templates').textContent);
+    let medido = false;
+
+    function renderizar(el) {
+        const spec = JSON.parse(document.getElementById('spec-' + el.dataset.spec).textContent);
+        if (spec.template !== undefined) {
+            spec.layout.template = templates[spec.template];
+        }
+        return Plotly.newPlot(el, spec.data, spec.layout, {responsive: true});
+    }
+
+    const observador = new IntersectionObserver(function (entradas) {
+        const renderizacoes = [];
+        entradas.forEach(function (entrada) {
+            if (entrada.isIntersecting) {
+                observador.unobserve(entrada.target);
+                renderizacoes.push(renderizar(entrada.target));
+            }
+        });
+        if (!medido && renderizacoes.length) {
+            medido = true;
+            Promise.all(renderizacoes).then(function () {
+                const ms = Math.round(performance.now());
+                document.body.dataset.tti = ms;
+                const aviso = document.getElementById('tempo-interativo');
+                if (aviso) { aviso.textContent = 'Página interativa em ' + ms + ' ms'; }
+                console.log('Tempo até interativo (ms):', ms);
+            });
+        }
+    }, {rootMargin: '200px'});
+
+    document.querySelectorAll('.grafico-lazy').forEach(function (el) { observador.observe(el); });
+})();
+</script>
+"""
+
+def _caminho_spec(caminho_html):
+    return os.path.splitext(caminho_html)[0] + ".json"
+
+def salvar_figura(fig, caminho_html):
+    """
+    Salva o gráfico como HTML leve (plotly.js compartilhado na mesma pasta, em vez
+    de embutido em cada arquivo) e como especificação JSON para o painel único.
+    """
+    fig.write_html(caminho_html, include_plotlyjs='directory')
+    with open(_caminho_spec(caminho_html), 'w', encoding='utf-8') as f:
+        f.write(fig.to_json())
+
+def garantir_plotly(pasta):
+    """Grava o plotly.min.js compartilhado na pasta, se ainda não estiver lá."""
+    caminho = os.path.join(pasta, ARQUIVO_PLOTLY)
+    conteudo = get_plotlyjs()
+    if not os.path.exists(caminho) or os.path.getsize(caminho) != len(conteudo.encode('utf-8')):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+    return caminho
+
+def _json_em_script(dados):
+    # Impede que '</script>' dentro do JSON feche a tag
+    return json.dumps(dados, separators=(',', ':'), ensure_ascii=False).replace('</', '<\\/')
+
+def empacotar_relatorio(caminho_html, destino=None):
+    """
+    Troca os iframes do relatório por gráficos renderizados na própria página
+    a partir das especificações JSON (com o template do plotly guardado uma vez
+    só) e um único plotly.js compartilhado. Grava em `destino` (por padrão,
+    sobrescreve o relatório) e retorna as métricas de peso da página.
+    """
+    destino = destino or caminho_html
+    pasta_pagina = os.path.dirname(os.path.abspath(caminho_html))
+    with open(caminho_html, 'r', encoding='utf-8') as f:
+        pagina = f.read()
+    peso_original = len(pagina.encode('utf-8'))
+
+    specs, templates, pastas_graficos = [], {}, set()
+    peso_iframes = 0
+
+    def substituir(match):
+        nonlocal peso_iframes
+        src = match.group('src')
+        caminho_grafico = os.path.join(pasta_pagina, src + ".html")
+        caminho_spec = _caminho_spec(caminho_grafico)
+        if not os.path.exists(caminho_spec):
+            return match.group(0)
+        with open(caminho_spec, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        template = spec['layout'].pop('template', None)
+        if template is not None:
+            chave = hashlib.sha1(json.dumps(template, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+            templates[chave] = template
+            spec['template'] = chave
+        identificador = f"g{len(specs)}"
+        specs.append((identificador, spec))
+        pastas_graficos.add(os.path.dirname(src))
+        peso_iframes += os.path.getsize(caminho_grafico)
+        altura = spec['layout'].get('height', ALTURA_PADRAO)
+        return f'<div class="grafico-lazy" data-spec="{identificador}" style="min-height: {altura}px"></div>'
+
+    pagina = PADRAO_IFRAME.sub(substituir, pagina)
+    if not specs:
+        return None
+
+    # Um único plotly.js para a página, na pasta dos gráficos
+    pasta_assets = sorted(pastas_graficos)[0]
+    caminho_plotly = garantir_plotly(os.path.join(pasta_pagina, pasta_assets))
+    src_plotly = f"{pasta_assets}/{ARQUIVO_PLOTLY}" if pasta_assets else ARQUIVO_PLOTLY
+
+    scripts = [f'<script src="{html.escape(src_plotly)}"></script>',
+               f'<script type="application/json" id="plotly-templates">{_json_em_script(templates)}</script>']
+    scripts.extend(
+        f'<script type="application/json" id="spec-{identificador}">{_json_em_script(spec)}</script>'
+        for identificador, spec in specs
+    )
+    scripts.append('<p id="tempo-interativo" style="text-align: center; color: #6c757d;"></p>')
+    scripts.append(SCRIPT_RENDERIZACAO)
+    pagina = pagina.replace("</body>", "\n".join(scripts) + "\n</body>", 1)
+
+    with open(destino, 'w', encoding='utf-8') as f:
+        f.write(pagina)
+
+    peso_plotly = os.path.getsize(caminho_plotly)
+    metricas = {
+        'graficos': len(specs),
+        'peso_pagina': os.path.getsize(destino),
+        'peso_plotly': peso_plotly,
+        'peso_total': os.path.getsize(destino) + peso_plotly,
+        # Antes: cada iframe carregava seu HTML com o plotly.js embutido
+        'peso_antes': peso_original + peso_iframes + len(specs) * peso_plotly,
+    }
+    print(f"{os.path.basename(destino)}: {metricas['graficos']} gráficos, "
+          f"{metricas['peso_total'] / 1e6:.1f} MB no total "
+          f"(antes: {metricas['peso_antes'] / 1e6:.1f} MB com um plotly.js por gráfico)")
+    return metricas
+
+def main():
+    parser = argparse.ArgumentParser(description="Empacota relatórios HTML em uma página única com plotly.js compartilhado.")
+    parser.add_argument('relatorios', nargs='+', help="Relatórios HTML com iframes de gráficos")
+    args = parser.parse_args()
+
+    for relatorio in args.relatorios:
+        empacotar_relatorio(relatorio)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+import argparse
+import json
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Posição de cada categoria na máscara de bits. A ordem faz parte do formato
+# gravado: categorias novas entram sempre no fim da lista.
+CATEGORIAS_ESQUEMA = [
+    'Agendamento de consulta',
+    'Reagendamento ou cancelamento',
+    'Dúvidas sobre cirurgia',
+    'Encaminhamento para WhatsApp',
+    'Solicitação de atestado',
+    'Retorno pós-operatório',
+    'Cobranças e valores',
+    'Ligação indevida/sem resposta',
+    'Reclamação',
+    'Outros assuntos',
+    'Erro na transcrição',
+]
+BIT_CATEGORIA = {categoria: bit for bit, categoria in enumerate(CATEGORIAS_ESQUEMA)}
+
+# Mapeamento de ramais para nomes (você pode atualizar com os nomes corretos)
+MAPEAMENTO_ATENDENTES = {
+    'bioc5310': 'Lucas',
+    'bioc5311': 'Ana Rafaela',
+    'bioc5313': 'Júlio',
+    'bioc5315': 'Lucila',
+    'bioc5316': 'Bia',
+    'bioc5318': 'Joelma',
+    'bioc5319': 'Joelma'
+}
+
+RAMAL_NAO_IDENTIFICADO = "Não identificado"
+ATENDENTE_NAO_IDENTIFICADA = "Atendente não identificada"
+
+PREFIXO_CLASSIFICACAO = "classificacao_"
+PREFIXO_TRECHOS = "trechos_"
+
+def mascara_categorias(listas: List[List[str]]) -> np.ndarray:
+    """Converte as listas de categorias de cada ligação em uma máscara de bits (uint32)"""
+    explodido = pd.Series(listas, dtype=object).explode().dropna()
+    bits = explodido.map(BIT_CATEGORIA)
+    if bits.isna().any():
+        desconhecidas = ', '.join(sorted(set(explodido[bits.isna()])))
+        raise ValueError(f"Categorias fora do esquema: {desconhecidas} (inclua no fim de CATEGORIAS_ESQUEMA)")
+    mascara = np.zeros(len(listas), dtype=np.uint32)
+    np.bitwise_or.at(mascara, explodido.index.to_numpy(dtype=np.int64),
+                     np.left_shift(np.uint32(1), bits.to_numpy(dtype=np.uint32)))
+    return mascara
+
+def matriz_categorias(mascara: pd.Series) -> Tuple[sparse.csr_matrix, List[str]]:
+    """
+    Matriz esparsa multi-hot (ligações × categorias) a partir da máscara, só com as
+    categorias presentes, em ordem alfabética
+    """
+    bits = np.arange(len(CATEGORIAS_ESQUEMA), dtype=np.uint32)
+    densa = ((mascara.to_numpy(dtype=np.uint32)[:, None] >> bits) & 1).astype(np.int32)
+    presentes = sorted((CATEGORIAS_ESQUEMA[b] for b in bits if densa[:, b].any()))
+    colunas = [BIT_CATEGORIA[c] for c in presentes]
+    return sparse.csr_matrix(densa[:, colunas]), presentes
+
+def colunas_categorias(mascara: pd.Series) -> pd.DataFrame:
+    """Uma coluna booleana por categoria, para quem prefere filtrar por nome"""
+    valores = mascara.to_numpy(dtype=np.uint32)
+    return pd.DataFrame(
+        {categoria: (valores >> np.uint32(bit)) & 1 == 1 for categoria, bit in BIT_CATEGORIA.items()},
+        index=mascara.index,
+    )
+
+def ramais_validos(nomes_arquivo: pd.Series) -> pd.Series:
+    """Ramal 'biocNNNN' do nome do arquivo (só 5310-5319), vetorizado"""
+    numeros = nomes_arquivo.astype(str).str.lower().str.extract(r"bioc(\d{4})", expand=False)
+    validos = pd.to_numeric(numeros, errors='coerce').between(5310, 5319)
+    return ("bioc" + numeros).where(validos, RAMAL_NAO_IDENTIFICADO)
+
+def montar_tabelas(df: pd.DataFrame, categorias: List[List[str]],
+                   trechos: List[Dict[str, str]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Monta a tabela colunar da classificação (tipos fixos, categorias na máscara)
+    e a tabela lateral de trechos representativos (uma linha por ligação e categoria)
+    """
+    ramal = ramais_validos(df['nome_arquivo'])
+    atendente = ramal.map(MAPEAMENTO_ATENDENTES).fillna(ATENDENTE_NAO_IDENTIFICADA)
+    tabela = pd.DataFrame({
+        'nome_arquivo': df['nome_arquivo'].astype(str).to_numpy(),
+        'data_hora': pd.to_datetime(df['data_hora']).to_numpy(dtype='datetime64[ns]'),
+        'ramal': pd.Categorical(ramal),
+        'atendente': pd.Categorical(atendente),
+        'duracao_segundos': pd.to_numeric(df['duracao_segundos'], errors='coerce').astype('float32').to_numpy(),
+        'categorias': mascara_categorias(categorias),
+        'texto_transcrito': df['texto_transcrito'].astype('string').to_numpy(),
+    })
+    linhas_trechos = [
+        (i, categoria, trecho)
+        for i, por_categoria in enumerate(trechos)
+        for categoria, trecho in por_categoria.items()
+    ]
+    tabela_trechos = pd.DataFrame(linhas_trechos, columns=['linha', 'categoria', 'trecho'])
+    tabela_trechos = pd.DataFrame({
+        'nome_arquivo': tabela['nome_arquivo'].to_numpy()[tabela_trechos['linha'].to_numpy(dtype=np.int64)],
+        'categoria': pd.Categorical(tabela_trechos['categoria'], categories=CATEGORIAS_ESQUEMA),
+        'trecho': tabela_trechos['trecho'].astype('string'),
+    })
+    return tabela, tabela_trechos
+
+def converter_legado(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Converte uma planilha de classificação antiga (categorias em texto e trechos em JSON)"""
+    categorias = [
+        [c.strip() for c in str(valor).split(',') if c.strip()] if pd.notna(valor) else []
+        for valor in df['categorias_detectadas']
+    ]
+    trechos = [json.loads(valor) if isinstance(valor, str) and valor else {} for valor in df['trecho_representativo']]
+    return montar_tabelas(df, categorias, trechos)
+
+def salvar_classificacao(tabela: pd.DataFrame, trechos: pd.DataFrame, pasta: str, sufixo: str) -> Tuple[str, str]:
+    """Grava a classificação e os trechos em Parquet e retorna os dois caminhos"""
+    caminho_tabela = os.path.join(pasta, f"{PREFIXO_CLASSIFICACAO}{sufixo}.parquet")
+    caminho_trechos = os.path.join(pasta, f"{PREFIXO_TRECHOS}{sufixo}.parquet")
+    tabela.to_parquet(caminho_tabela, index=False)
+    trechos.to_parquet(caminho_trechos, index=False)
+    return caminho_tabela, caminho_trechos
+
+def arquivo_mais_recente(pasta: str, prefixo: str = PREFIXO_CLASSIFICACAO):
+    """Último Parquet da pasta com o prefixo (o sufixo é a data da classificação)"""
+    arquivos = sorted(f for f in os.listdir(pasta) if f.startswith(prefixo) and f.endswith('.parquet'))
+    return os.path.join(pasta, arquivos[-1]) if arquivos else None
+
+def carregar_classificacao(caminho: str, colunas: List[str] = None) -> pd.DataFrame:
+    """Lê só as colunas pedidas da classificação colunar"""
+    return pd.read_parquet(caminho, columns=colunas)
+
+def carregar_classificacao_pasta(pasta: str, colunas: List[str] = None) -> pd.DataFrame:
+    """
+    Classificação mais recente de uma partição mensal: o Parquet colunar, ou a
+    planilha antiga convertida na leitura quando a partição ainda não tem Parquet
+    """
+    caminho_colunar = arquivo_mais_recente(pasta)
+    if caminho_colunar:
+        return carregar_classificacao(caminho_colunar, colunas)
+    
+    planilhas = [f for f in os.listdir(pasta) if f.startswith('classificacao_parcial_') and f.endswith('.xlsx')]
+    if not planilhas:
+        raise FileNotFoundError(f"Nenhum arquivo de classificação encontrado em {pasta}!")
+    tabela, _ = converter_legado(pd.read_excel(os.path.join(pasta, max(planilhas))))
+    return tabela[colunas] if colunas else tabela
+
+def main():
+    parser = argparse.ArgumentParser(description="Converte uma planilha de classificação para o formato colunar.")
+    parser.add_argument('planilha', help="Planilha classificacao_parcial_*.xlsx")
+    args = parser.parse_args()
+
+    tabela, trechos = converter_legado(pd.read_excel(args.planilha))
+    sufixo = os.path.splitext(os.path.basename(args.planilha))[0].rsplit('_', 2)[-2:]
+    caminhos = salvar_classificacao(tabela, trechos, os.path.dirname(args.planilha), '_'.join(sufixo))
+    print("Classificação colunar gravada em:", ', '.join(caminhos))
+
+if __name__ == "__main__":
+    main()
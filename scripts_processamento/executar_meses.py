@@ -0,0 +1,128 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from config_execucao import (PASTA_CONSOLIDADO, adicionar_argumentos_periodo, meses_disponiveis,
+                             meses_dos_argumentos, pasta_resultados_mes)
+from esquema_classificacao import carregar_classificacao_pasta, colunas_categorias
+
+ETAPAS = ('transcrever', 'classificar')
+
+COLUNAS_CONSOLIDACAO = ['nome_arquivo', 'data_hora', 'ramal', 'atendente', 'duracao_segundos', 'categorias']
+
+def _executar_etapa(etapa, mes):
+    # Importa só no processo do mês: a transcrição carrega o whisper
+    if etapa == 'transcrever':
+        from transcrever import processar_audios
+        processar_audios(mes)
+    elif etapa == 'classificar':
+        from classificar_transcricoes import classificar_transcricoes
+        classificar_transcricoes(mes)
+    else:
+        raise ValueError(f"Etapa desconhecida: {etapa} (use {', '.join(ETAPAS)})")
+
+def executar_mes(mes, etapas=ETAPAS):
+    """Roda as etapas de um mês em sequência e retorna o status e o tempo gasto."""
+    inicio = time.perf_counter()
+    try:
+        for etapa in etapas:
+            _executar_etapa(etapa, mes)
+        status, erro = 'ok', None
+    except Exception as e:
+        status, erro = 'erro', f"{type(e).__name__}: {e}"
+    return {'mes': mes, 'status': status, 'erro': erro, 'duracao_s': round(time.perf_counter() - inicio, 1)}
+
+def executar_meses(meses, etapas=ETAPAS, processos=None):
+    """
+    Processa os meses em paralelo, um processo por mês (os meses são independentes).
+    A falha de um mês não interrompe os outros.
+    """
+    processos = min(processos or os.cpu_count() or 1, len(meses)) or 1
+    resultados = []
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        tarefas = {executor.submit(executar_mes, mes, tuple(etapas)): mes for mes in meses}
+        for tarefa in as_completed(tarefas):
+            resultado = tarefa.result()
+            resultados.append(resultado)
+            detalhe = f" ({resultado['erro']})" if resultado['erro'] else ""
+            print(f"{resultado['mes']}: {resultado['status']} em {resultado['duracao_s']:.1f}s{detalhe}")
+    return sorted(resultados, key=lambda r: r['mes'])
+
+def carregar_particoes(meses, colunas=COLUNAS_CONSOLIDACAO):
+    """Junta as classificações das partições mensais, com a coluna 'mes'."""
+    partes = []
+    for mes in meses:
+        pasta = pasta_resultados_mes(mes)
+        try:
+            tabela = carregar_classificacao_pasta(pasta, colunas)
+        except FileNotFoundError:
+            print(f"{mes}: sem classificação, fora da consolidação")
+            continue
+        partes.append(tabela.assign(mes=mes))
+    if not partes:
+        return pd.DataFrame(columns=colunas + ['mes'])
+    base = pd.concat(partes, ignore_index=True)
+    # As categorias de cada partição podem diferir; o concat volta para texto
+    for coluna in ('ramal', 'atendente', 'mes'):
+        base[coluna] = base[coluna].astype('category')
+    return base
+
+def consolidar_meses(base):
+    """Totais entre meses: resumo por mês, categorias por mês e atendentes por mês."""
+    por_mes = base.groupby('mes', observed=True)
+    resumo = pd.DataFrame({
+        'ligacoes': por_mes.size(),
+        'duracao_media_s': por_mes['duracao_segundos'].mean(),
+        'duracao_total_min': por_mes['duracao_segundos'].sum() / 60,
+    })
+    categorias = colunas_categorias(base['categorias']).groupby(base['mes'], observed=True).sum()
+    categorias = categorias.loc[:, categorias.sum() > 0]
+    atendentes = pd.crosstab(base['mes'], base['atendente'])
+    return {'Resumo': resumo, 'Categorias': categorias, 'Atendentes': atendentes}
+
+def salvar_consolidacao(base, consolidado, meses, pasta_saida=PASTA_CONSOLIDADO):
+    """Grava a base de todos os meses em Parquet e os totais entre meses em uma planilha."""
+    os.makedirs(pasta_saida, exist_ok=True)
+    periodo = meses[0] if len(meses) == 1 else f"{meses[0]}_a_{meses[-1]}"
+    caminho_base = os.path.join(pasta_saida, f"classificacao_{periodo}.parquet")
+    caminho_totais = os.path.join(pasta_saida, f"totais_{periodo}.xlsx")
+    base.to_parquet(caminho_base, index=False)
+    with pd.ExcelWriter(caminho_totais) as writer:
+        for aba, tabela in consolidado.items():
+            tabela.to_excel(writer, sheet_name=aba)
+    return caminho_base, caminho_totais
+
+def main():
+    parser = argparse.ArgumentParser(description="Processa vários meses de ligações em paralelo e consolida os resultados.")
+    adicionar_argumentos_periodo(parser)
+    parser.add_argument('--todos', action='store_true', help="Todos os meses que já têm partição de transcrições")
+    parser.add_argument('--etapas', nargs='+', choices=ETAPAS, default=['classificar'],
+                        help="Etapas a rodar em cada mês (padrão: classificar)")
+    parser.add_argument('--processos', type=int, help="Meses processados ao mesmo tempo (padrão: núcleos da máquina)")
+    parser.add_argument('--so-consolidar', action='store_true', help="Não roda as etapas, só consolida as partições")
+    args = parser.parse_args()
+
+    meses = meses_disponiveis() if args.todos else meses_dos_argumentos(args)
+    if not meses:
+        print("Nenhum mês para processar!")
+        return
+
+    if not args.so_consolidar:
+        print(f"Processando {len(meses)} mês(es): {', '.join(meses)}")
+        resultados = executar_meses(meses, args.etapas, args.processos)
+        falhas = [r['mes'] for r in resultados if r['status'] != 'ok']
+        if falhas:
+            print(f"Meses com erro: {', '.join(falhas)}")
+
+    base = carregar_particoes(meses)
+    if base.empty:
+        print("Nenhuma classificação encontrada para consolidar.")
+        return
+    caminhos = salvar_consolidacao(base, consolidar_meses(base), meses)
+    print("Consolidação salva em:", ', '.join(caminhos))
+
+if __name__ == "__main__":
+    main()
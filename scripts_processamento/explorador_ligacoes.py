@@ -0,0 +1,267 @@
+import glob
+import gzip
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Colunas de cada linha exportada; as de filtro vão como códigos de um dicionário
+COLUNAS_EXPLORADOR = ['data_hora', 'arquivo', 'categoria', 'ramal', 'sentimento']
+COLUNAS_FILTRO = ['categoria', 'ramal', 'sentimento']
+
+LINHAS_POR_PAGINA = 500
+
+ARQUIVO_INDICE = "indice.json"
+
+# Tabela virtualizada: só as linhas visíveis existem no DOM e só as páginas que
+# elas usam são baixadas (e descomprimidas pelo navegador com DecompressionStream)
+PAGINA_EXPLORADOR = """<!DOCTYPE html>
+<html>
+<head>
+    <title>Detalhes das Ligações</title>
+    <meta charset="UTF-8">
+    <style>
+        body { font-family: Arial, sans-serif; margin: 0 auto; max-width: 1200px; padding: 20px; color: #343a40; }
+        h1 { color: #17a2b8; }
+        .filtros { display: flex; gap: 10px; align-items: center; flex-wrap: wrap; margin-bottom: 15px; }
+        .filtros select, .filtros input { padding: 6px; }
+        .linha { display: grid; grid-template-columns: 170px 1fr 220px 90px 110px; height: 28px;
+                 line-height: 28px; border-bottom: 1px solid #dee2e6; font-size: 13px; }
+        .linha span { overflow: hidden; white-space: nowrap; text-overflow: ellipsis; padding: 0 6px; }
+        .cabecalho { background-color: #17a2b8; color: #ffffff; font-weight: bold; }
+        #janela { height: 640px; overflow-y: auto; position: relative; border: 1px solid #dee2e6; }
+        #linhas { position: absolute; top: 0; left: 0; right: 0; }
+        #contagem { color: #6c757d; }
+    </style>
+</head>
+<body>
+    <h1>Detalhes das Ligações</h1>
+    <div class="filtros">
+        <select id="filtro-categoria"><option value="">Todas as categorias</option></select>
+        <select id="filtro-ramal"><option value="">Todos os ramais</option></select>
+        <select id="filtro-sentimento"><option value="">Todos os sentimentos</option></select>
+        <label>Ir para a data <input type="date" id="ir-data"></label>
+        <span id="contagem"></span>
+    </div>
+    <div class="linha cabecalho"><span>Data/Hora</span><span>Arquivo</span><span>Categoria</span><span>Ramal</span><span>Sentimento</span></div>
+    <div id="janela"><div id="espaco"></div><div id="linhas"></div></div>
+<script>
+(function () {
+    const ALTURA_LINHA = 28;
+    const MAXIMO_PAGINAS_MEMORIA = 40;
+    const janela = document.getElementById('janela');
+    const espaco = document.getElementById('espaco');
+    const conteiner = document.getElementById('linhas');
+    const contagem = document.getElementById('contagem');
+    let indice = null;
+    let filtrados = null;
+    let geracaoFiltro = 0;
+    let geracaoDesenho = 0;
+    const paginas = new Map();
+
+    async function carregarJson(url, comprimido) {
+        const resposta = await fetch(url);
+        if (!comprimido) { return resposta.json(); }
+        const fluxo = resposta.body.pipeThrough(new DecompressionStream('gzip'));
+        return JSON.parse(await new Response(fluxo).text());
+    }
+
+    function carregarPagina(numero) {
+        if (!paginas.has(numero)) {
+            paginas.set(numero, carregarJson('paginas/' + indice.paginas[numero].arquivo, true));
+            // Descarta as páginas mais antigas para a memória não crescer com o histórico
+            if (paginas.size > MAXIMO_PAGINAS_MEMORIA) { paginas.delete(paginas.keys().next().value); }
+        }
+        return paginas.get(numero);
+    }
+
+    function escapar(texto) {
+        return String(texto).replace(/[&<>"]/g, function (c) {
+            return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+        });
+    }
+
+    function formatarLinha(linha) {
+        const valores = indice.colunas.map(function (coluna, i) {
+            const dicionario = indice.valores[coluna];
+            return dicionario ? dicionario[linha[i]] : linha[i];
+        });
+        return '<div class="linha">' + valores.map(function (v) {
+            return '<span title="' + escapar(v) + '">' + escapar(v) + '</span>';
+        }).join('') + '</div>';
+    }
+
+    function totalLinhas() { return filtrados ? filtrados.length : indice.total; }
+
+    async function desenhar() {
+        const geracao = ++geracaoDesenho;
+        const total = totalLinhas();
+        espaco.style.height = (total * ALTURA_LINHA) + 'px';
+        const primeira = Math.min(Math.floor(janela.scrollTop / ALTURA_LINHA), Math.max(total - 1, 0));
+        const ultima = Math.min(primeira + Math.ceil(janela.clientHeight / ALTURA_LINHA) + 1, total);
+        let linhas;
+        if (filtrados) {
+            linhas = filtrados.slice(primeira, ultima);
+        } else {
+            const porPagina = indice.linhas_por_pagina;
+            const paginaInicial = Math.floor(primeira / porPagina);
+            const numeros = [];
+            for (let p = paginaInicial; p <= Math.floor(Math.max(ultima - 1, 0) / porPagina) && p < indice.paginas.length; p++) {
+                numeros.push(p);
+            }
+            const dados = await Promise.all(numeros.map(carregarPagina));
+            if (geracao !== geracaoDesenho) { return; }
+            linhas = [];
+            for (let i = primeira; i < ultima; i++) {
+                const p = Math.floor(i / porPagina);
+                linhas.push(dados[p - paginaInicial][i - p * porPagina]);
+            }
+        }
+        conteiner.style.transform = 'translateY(' + (primeira * ALTURA_LINHA) + 'px)';
+        conteiner.innerHTML = linhas.map(formatarLinha).join('');
+    }
+
+    function filtrosAtivos() {
+        const ativos = {};
+        indice.filtros.forEach(function (coluna) {
+            const valor = document.getElementById('filtro-' + coluna).value;
+            if (valor !== '') { ativos[indice.colunas.indexOf(coluna)] = {coluna: coluna, codigo: Number(valor)}; }
+        });
+        return ativos;
+    }
+
+    async function aplicarFiltros() {
+        const geracao = ++geracaoFiltro;
+        const ativos = filtrosAtivos();
+        const posicoes = Object.keys(ativos).map(Number);
+        janela.scrollTop = 0;
+        if (!posicoes.length) {
+            filtrados = null;
+            contagem.textContent = indice.total + ' ligações';
+            return desenhar();
+        }
+        filtrados = [];
+        for (let p = 0; p < indice.paginas.length; p++) {
+            // Páginas sem nenhum dos valores filtrados nem são baixadas
+            const presentes = indice.paginas[p].presentes;
+            if (!posicoes.every(function (i) { return presentes[ativos[i].coluna].includes(ativos[i].codigo); })) { continue; }
+            const linhas = await carregarPagina(p);
+            if (geracao !== geracaoFiltro) { return; }
+            linhas.forEach(function (linha) {
+                if (posicoes.every(function (i) { return linha[i] === ativos[i].codigo; })) { filtrados.push(linha); }
+            });
+            contagem.textContent = filtrados.length + ' ligações (carregando...)';
+            desenhar();
+        }
+        contagem.textContent = filtrados.length + ' de ' + indice.total + ' ligações';
+        desenhar();
+    }
+
+    function irParaData(data) {
+        let linha;
+        if (!filtrados) {
+            const datas = Object.keys(indice.datas).sort();
+            const destino = datas.find(function (d) { return d >= data; });
+            linha = destino === undefined ? indice.total : indice.datas[destino];
+        } else {
+            // As linhas filtradas seguem ordenadas por data/hora: busca binária
+            let inicio = 0, fim = filtrados.length;
+            while (inicio < fim) {
+                const meio = (inicio + fim) >> 1;
+                if (filtrados[meio][0] < data) { inicio = meio + 1; } else { fim = meio; }
+            }
+            linha = inicio;
+        }
+        janela.scrollTop = linha * ALTURA_LINHA;
+        desenhar();
+    }
+
+    carregarJson('""" + ARQUIVO_INDICE + """', false).then(function (dados) {
+        indice = dados;
+        indice.filtros.forEach(function (coluna) {
+            const select = document.getElementById('filtro-' + coluna);
+            indice.valores[coluna].forEach(function (valor, codigo) {
+                const opcao = document.createElement('option');
+                opcao.value = codigo;
+                opcao.textContent = valor;
+                select.appendChild(opcao);
+            });
+            select.addEventListener('change', aplicarFiltros);
+        });
+        document.getElementById('ir-data').addEventListener('change', function (e) { irParaData(e.target.value); });
+        janela.addEventListener('scroll', function () { window.requestAnimationFrame(desenhar); });
+        contagem.textContent = indice.total + ' ligações';
+        desenhar();
+    });
+})();
+</script>
+</body>
+</html>
+"""
+
+def _gravar_gzip(caminho, dados):
+    # mtime fixo: a mesma página gera o mesmo arquivo (bom para cache do navegador e do git)
+    with open(caminho, 'wb') as f:
+        f.write(gzip.compress(json.dumps(dados, separators=(',', ':'), ensure_ascii=False).encode('utf-8'), mtime=0))
+
+def exportar_explorador(df, pasta, linhas_por_pagina=LINHAS_POR_PAGINA):
+    """
+    Exporta as ligações para o explorador do site estático: páginas JSON
+    comprimidas ordenadas por data/hora, um índice com as datas, os valores dos
+    filtros e o que cada página contém, e a página com a tabela virtualizada.
+    """
+    pasta_paginas = os.path.join(pasta, "paginas")
+    os.makedirs(pasta_paginas, exist_ok=True)
+    for antiga in glob.glob(os.path.join(pasta_paginas, "*.json.gz")):
+        os.remove(antiga)
+
+    ordenado = df.sort_values('data_hora', kind='stable', na_position='last')
+    datas_hora = ordenado['data_hora'].dt.strftime('%Y-%m-%d %H:%M:%S').fillna('')
+
+    colunas, valores, codigos = {}, {}, {}
+    for coluna in COLUNAS_EXPLORADOR:
+        if coluna == 'data_hora':
+            colunas[coluna] = datas_hora.tolist()
+        elif coluna in COLUNAS_FILTRO:
+            categorias = pd.Categorical(ordenado[coluna].fillna('').astype(str))
+            valores[coluna] = categorias.categories.tolist()
+            codigos[coluna] = categorias.codes.astype('int64')
+            colunas[coluna] = codigos[coluna].tolist()
+        else:
+            colunas[coluna] = ordenado[coluna].fillna('').astype(str).tolist()
+    linhas = list(zip(*(colunas[c] for c in COLUNAS_EXPLORADOR)))
+
+    paginas = []
+    for numero, inicio in enumerate(range(0, len(linhas), linhas_por_pagina)):
+        fim = min(inicio + linhas_por_pagina, len(linhas))
+        arquivo = f"pagina_{numero:05d}.json.gz"
+        _gravar_gzip(os.path.join(pasta_paginas, arquivo), linhas[inicio:fim])
+        paginas.append({
+            'arquivo': arquivo,
+            'inicio': inicio,
+            'linhas': fim - inicio,
+            'primeira_data': colunas['data_hora'][inicio],
+            'ultima_data': colunas['data_hora'][fim - 1],
+            'presentes': {c: np.unique(codigos[c][inicio:fim]).tolist() for c in COLUNAS_FILTRO},
+        })
+
+    # Primeira linha de cada dia, para pular direto para uma data
+    dias = datas_hora.str[:10].reset_index(drop=True)
+    primeiras = dias[dias != ''].drop_duplicates()
+
+    indice = {
+        'total': len(linhas),
+        'linhas_por_pagina': linhas_por_pagina,
+        'colunas': COLUNAS_EXPLORADOR,
+        'filtros': COLUNAS_FILTRO,
+        'valores': valores,
+        'datas': {dia: int(linha) for linha, dia in primeiras.items()},
+        'paginas': paginas,
+    }
+    with open(os.path.join(pasta, ARQUIVO_INDICE), 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False, separators=(',', ':'))
+    with open(os.path.join(pasta, "index.html"), 'w', encoding='utf-8') as f:
+        f.write(PAGINA_EXPLORADOR)
+
+    return indice
@@ -0,0 +1,98 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+# Limite de linhas de uma aba do Excel (incluindo o cabeçalho)
+LINHAS_MAXIMAS_ABA = 1_048_576
+
+# Linhas convertidas de uma vez antes de irem para o xlsxwriter
+LINHAS_POR_BLOCO = 20_000
+
+FORMATO_DATA_HORA_EXCEL = 'dd/mm/yyyy hh:mm:ss'
+
+# Dia zero das datas seriais do Excel
+EPOCA_EXCEL = np.datetime64('1899-12-30')
+
+FORMATOS = ('xlsx', 'parquet', 'csv')
+
+def _valores_coluna(serie):
+    """Converte a coluna para uma lista de valores prontos para o xlsxwriter (None = célula vazia)."""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        dias = (serie.to_numpy(dtype='datetime64[ns]') - EPOCA_EXCEL) / np.timedelta64(1, 'D')
+        return 'data', [v if math.isfinite(v) else None for v in dias.tolist()]
+    if pd.api.types.is_bool_dtype(serie):
+        return 'booleano', serie.astype(object).where(serie.notna(), None).tolist()
+    if pd.api.types.is_numeric_dtype(serie):
+        valores = serie.astype('float64').to_numpy()
+        return 'numero', [v if math.isfinite(v) else None for v in valores.tolist()]
+    texto = serie.astype(object).where(serie.notna(), None)
+    return 'texto', [None if v is None else str(v) for v in texto.tolist()]
+
+def exportar_xlsx(df, arquivo, aba='base'):
+    """
+    Grava o DataFrame em XLSX linha a linha no modo de memória constante do
+    xlsxwriter (cada linha vai para o disco assim que é escrita). Bases maiores
+    que o limite do Excel continuam em abas numeradas.
+    """
+    workbook = xlsxwriter.Workbook(arquivo, {'constant_memory': True})
+    formato_data = workbook.add_format({'num_format': FORMATO_DATA_HORA_EXCEL})
+    escritores = {
+        'data': lambda ws, l, c, v: ws.write_number(l, c, v, formato_data),
+        'numero': lambda ws, l, c, v: ws.write_number(l, c, v),
+        'booleano': lambda ws, l, c, v: ws.write_boolean(l, c, v),
+        'texto': lambda ws, l, c, v: ws.write_string(l, c, v),
+    }
+
+    linhas_por_aba = LINHAS_MAXIMAS_ABA - 1
+    for parte, inicio_aba in enumerate(range(0, max(len(df), 1), linhas_por_aba)):
+        worksheet = workbook.add_worksheet(aba if parte == 0 else f"{aba}_{parte + 1}")
+        worksheet.write_row(0, 0, [str(c) for c in df.columns])
+        fim_aba = min(inicio_aba + linhas_por_aba, len(df))
+        # Os valores são convertidos por bloco para a memória não crescer com a base
+        for inicio in range(inicio_aba, fim_aba, LINHAS_POR_BLOCO):
+            bloco = df.iloc[inicio:min(inicio + LINHAS_POR_BLOCO, fim_aba)]
+            por_coluna = []
+            for c, coluna in enumerate(bloco.columns):
+                tipo, valores = _valores_coluna(bloco.iloc[:, c])
+                por_coluna.append((c, escritores[tipo], valores))
+            for i in range(len(bloco)):
+                destino = inicio - inicio_aba + i + 1
+                for c, escrever, valores in por_coluna:
+                    valor = valores[i]
+                    if valor is not None:
+                        escrever(worksheet, destino, c, valor)
+    workbook.close()
+
+def exportar_arquivo(df, caminho_base, formato):
+    """Grava o DataFrame em um formato (xlsx, parquet ou csv) e retorna o caminho gerado."""
+    caminho = f"{caminho_base}.{formato}"
+    if formato == 'xlsx':
+        exportar_xlsx(df, caminho)
+    elif formato == 'parquet':
+        # Categorias viram texto para a leitura fora do pandas ficar simples; o dtype
+        # 'string' mantém os ausentes como nulos (com str eles virariam o texto 'nan')
+        df.astype({c: 'string' for c in df.select_dtypes('category').columns}).to_parquet(caminho, index=False)
+    elif formato == 'csv':
+        df.to_csv(caminho, index=False, sep=';', encoding='utf-8-sig')
+    else:
+        raise ValueError(f"Formato de exportação desconhecido: {formato} (use {', '.join(FORMATOS)})")
+    return caminho
+
+def exportar_base(df, pasta_saida, nome, formatos=('xlsx',), por_mes=False, coluna_data='data'):
+    """
+    Exporta a base nos formatos pedidos. Com por_mes, grava um arquivo por mês
+    (nome_AAAA-MM.ext) em vez de um único arquivo. Retorna os caminhos gravados.
+    """
+    if por_mes:
+        meses = df[coluna_data].dt.strftime('%Y-%m')
+        partes = [(f"{nome}_{mes}", df[meses == mes]) for mes in sorted(meses.dropna().unique())]
+    else:
+        partes = [(nome, df)]
+    return [
+        exportar_arquivo(parte, os.path.join(pasta_saida, nome_parte), formato)
+        for nome_parte, parte in partes
+        for formato in formatos
+    ]
@@ -0,0 +1,54 @@
+import pandas as pd
+import numpy as np
+
+from calendario_dias_uteis import mascara_dia_util
+
+# Horário comercial em minutos desde a meia-noite (limites inclusivos)
+INICIO_EXPEDIENTE = 8 * 60
+FIM_EXPEDIENTE = 18 * 60
+FIM_EXPEDIENTE_SEXTA = 17 * 60
+
+# Duração mínima (em segundos) antes e depois da data de corte
+DATA_CORTE_DURACAO = pd.Timestamp('2024-04-01')
+DURACAO_MINIMA_ANTES_CORTE = 50
+DURACAO_MINIMA_APOS_CORTE = 22
+
+# Quantidade mínima de dígitos para considerar o número válido
+DIGITOS_MINIMOS_NUMERO = 9
+
+def minutos_do_dia(horas):
+    """Converte uma série de horários 'HH:MM[:SS]' em minutos desde a meia-noite."""
+    hora = pd.to_numeric(horas.str.slice(0, 2), errors='coerce')
+    minuto = pd.to_numeric(horas.str.slice(3, 5), errors='coerce')
+    return (hora * 60 + minuto).to_numpy(dtype='float64', na_value=np.nan)
+
+def mascara_horario_comercial(df):
+    """Indica as ligações feitas dentro do horário comercial (segunda a sexta)."""
+    if 'data_hora' in df.columns:
+        minutos = (df['data_hora'].dt.hour * 60 + df['data_hora'].dt.minute).to_numpy()
+    else:
+        minutos = minutos_do_dia(df['hora'])
+    fim = np.where(df['dia_semana'].to_numpy() == 4, FIM_EXPEDIENTE_SEXTA, FIM_EXPEDIENTE)
+    return pd.Series((minutos >= INICIO_EXPEDIENTE) & (minutos <= fim), index=df.index)
+
+def mascara_duracao_minima(df):
+    """Indica as ligações com a duração mínima exigida para a data em que ocorreram."""
+    minimo = np.where(df['data'] >= DATA_CORTE_DURACAO, DURACAO_MINIMA_APOS_CORTE, DURACAO_MINIMA_ANTES_CORTE)
+    return df['tempo_total'] >= minimo
+
+def mascara_numero_valido(numeros):
+    """Indica os números de telefone com pelo menos 9 dígitos."""
+    return numeros.astype(str).str.count(r'\d') >= DIGITOS_MINIMOS_NUMERO
+
+def aplicar_filtros(df, uf=None, municipio=None, fechamentos=()):
+    """
+    Combina todos os filtros em uma única máscara booleana, sem laços por linha.
+    Por padrão considera apenas feriados nacionais; uf, municipio e fechamentos
+    acrescentam feriados estaduais, municipais e datas em que a clínica não abriu.
+    """
+    return (
+        mascara_horario_comercial(df) &  # Horário comercial
+        mascara_dia_util(df['data'], uf=uf, municipio=municipio, fechamentos=fechamentos) &  # Dias úteis
+        mascara_duracao_minima(df) &  # Duração mínima
+        mascara_numero_valido(df['Origem'])  # Número válido
+    )
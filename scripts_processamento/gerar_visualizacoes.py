@@ -1,24 +1,23 @@
+import argparse
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
 from datetime import datetime
 import json
-from typing import Dict, List
+from typing import Dict, List, Tuple
 import re
 
-# Mapeamento de ramais para nomes (você pode atualizar com os nomes corretos)
-MAPEAMENTO_ATENDENTES = {
-    'bioc5310': 'Lucas',
-    'bioc5311': 'Ana Rafaela',
-    'bioc5313': 'Júlio',
-    'bioc5315': 'Lucila',
-    'bioc5316': 'Bia',
-    'bioc5318': 'Joelma',
-    'bioc5319': 'Joelma'
-}
+import numpy as np
+from scipy import sparse
+
+import empacotador_relatorio
+import insights_relatorio
+from construcao_relatorio import artefato, construir
+from empacotador_relatorio import empacotar_relatorio, salvar_figura
+from config_execucao import MES_PADRAO, PASTA_RELATORIOS, pasta_relatorio_mes, pasta_resultados_mes, validar_mes
+from esquema_classificacao import carregar_classificacao_pasta, matriz_categorias
+from insights_relatorio import calcular_indicadores, gerar_narrativa
 
 # Mapeamento de dias da semana em português
 DIAS_SEMANA = {
@@ -29,28 +28,21 @@ DIAS_SEMANA = {
     4: 'Sexta-feira'
 }
 
-def criar_pasta_visualizacoes() -> str:
-    """Cria e retorna o caminho da pasta de visualizações"""
-    pasta_base = "graficos_interativos"
+def criar_pasta_visualizacoes(mes: str = MES_PADRAO) -> str:
+    """Cria e retorna o caminho da pasta de visualizações do mês (ao lado do index.html dele)"""
+    pasta_base = os.path.join(pasta_relatorio_mes(mes), "graficos_interativos")
     
     # Cria a pasta se não existir
     os.makedirs(pasta_base, exist_ok=True)
     
     return pasta_base
 
-def carregar_dados() -> pd.DataFrame:
-    """Carrega os dados mais recentes de classificação"""
-    pasta_resultados = os.path.join("scripts_processamento", "bd_transcricao", "2025-05")
-    
-    # Encontra o arquivo de classificação mais recente
-    arquivos = [f for f in os.listdir(pasta_resultados) if f.startswith('classificacao_parcial_')]
-    if not arquivos:
-        raise FileNotFoundError("Nenhum arquivo de classificação encontrado!")
-    
-    arquivo_mais_recente = max(arquivos)
-    caminho_arquivo = os.path.join(pasta_resultados, arquivo_mais_recente)
-    
-    return pd.read_excel(caminho_arquivo)
+# Colunas da classificação usadas pelos gráficos e pelo relatório
+COLUNAS_VISUALIZACAO = ['nome_arquivo', 'data_hora', 'ramal', 'atendente', 'categorias']
+
+def carregar_dados(mes: str = MES_PADRAO) -> pd.DataFrame:
+    """Carrega os dados mais recentes de classificação do mês"""
+    return carregar_classificacao_pasta(pasta_resultados_mes(mes), COLUNAS_VISUALIZACAO)
 
 def extrair_hora_arquivo(nome_arquivo: str) -> int:
     """Extrai a hora do nome do arquivo de áudio."""
@@ -60,8 +52,8 @@ def extrair_hora_arquivo(nome_arquivo: str) -> int:
         return int(match.group(1))
     return -1
 
-def analisar_horarios(df: pd.DataFrame, pasta_visualizacoes: str):
-    """Analisa a distribuição de ligações por horário do dia."""
+def contar_horarios(df: pd.DataFrame) -> pd.DataFrame:
+    """Conta as ligações por hora do dia."""
     # Usa a data_hora para extrair a hora
     df_horarios = df[pd.notna(df['data_hora'])].copy()
     df_horarios['hora_int'] = df_horarios['data_hora'].dt.hour
@@ -69,7 +61,16 @@ def analisar_horarios(df: pd.DataFrame, pasta_visualizacoes: str):
     # Agrupa por hora
     contagem_horarios = df_horarios['hora_int'].value_counts().sort_index().reset_index()
     contagem_horarios.columns = ['Hora', 'Quantidade']
-    
+    return contagem_horarios
+
+def analisar_horarios(df: pd.DataFrame, pasta_visualizacoes: str):
+    """Analisa a distribuição de ligações por horário do dia."""
+    contagem_horarios = contar_horarios(df)
+    plotar_horarios(contagem_horarios, pasta_visualizacoes)
+    return contagem_horarios
+
+def plotar_horarios(contagem_horarios: pd.DataFrame, pasta_visualizacoes: str):
+    """Gera o gráfico de ligações por hora a partir das contagens."""
     # Gera gráfico interativo de barras
     fig = px.bar(contagem_horarios,
                  x='Hora',
@@ -93,12 +94,10 @@ def analisar_horarios(df: pd.DataFrame, pasta_visualizacoes: str):
     )
     
     # Salva o gráfico
-    fig.write_html(os.path.join(pasta_visualizacoes, "distribuicao_horarios.html"))
-    
-    return contagem_horarios
+    salvar_figura(fig, os.path.join(pasta_visualizacoes, "distribuicao_horarios.html"))
 
-def analisar_dias_semana(df: pd.DataFrame, pasta_visualizacoes: str):
-    """Analisa a distribuição de ligações por dia da semana."""
+def contar_dias_semana(df: pd.DataFrame) -> pd.DataFrame:
+    """Conta as ligações por dia da semana."""
     # Usa a data_hora para extrair o dia da semana
     df_dias = df[pd.notna(df['data_hora'])].copy()
     df_dias['dia_semana'] = df_dias['data_hora'].dt.day_name()
@@ -116,7 +115,16 @@ def analisar_dias_semana(df: pd.DataFrame, pasta_visualizacoes: str):
     # Conta ligações por dia
     contagem_dias = df_dias['dia_semana_pt'].value_counts().reindex(DIAS_SEMANA.values()).reset_index()
     contagem_dias.columns = ['Dia', 'Quantidade']
-    
+    return contagem_dias
+
+def analisar_dias_semana(df: pd.DataFrame, pasta_visualizacoes: str):
+    """Analisa a distribuição de ligações por dia da semana."""
+    contagem_dias = contar_dias_semana(df)
+    plotar_dias_semana(contagem_dias, pasta_visualizacoes)
+    return contagem_dias
+
+def plotar_dias_semana(contagem_dias: pd.DataFrame, pasta_visualizacoes: str):
+    """Gera o gráfico de ligações por dia da semana a partir das contagens."""
     # Gera gráfico interativo
     fig = px.bar(contagem_dias,
                  x='Dia',
@@ -135,19 +143,56 @@ def analisar_dias_semana(df: pd.DataFrame, pasta_visualizacoes: str):
     )
     
     # Salva o gráfico
-    fig.write_html(os.path.join(pasta_visualizacoes, "distribuicao_dias_semana.html"))
-    
-    return contagem_dias
+    salvar_figura(fig, os.path.join(pasta_visualizacoes, "distribuicao_dias_semana.html"))
+
+def codificar_categorias(df: pd.DataFrame) -> Tuple[sparse.csr_matrix, List[str]]:
+    """
+    Matriz esparsa multi-hot (ligações × categorias) a partir da máscara de categorias,
+    construída uma única vez e reutilizada por contagens, correlação, coocorrência e lift
+    """
+    return matriz_categorias(df['categorias'])
+
+def coocorrencia_categorias(matriz: sparse.csr_matrix, categorias: List[str]) -> pd.DataFrame:
+    """Quantidade de ligações em que cada par de categorias aparece junto (diagonal = total da categoria)"""
+    return pd.DataFrame((matriz.T @ matriz).toarray(), index=categorias, columns=categorias)
+
+def correlacao_categorias(matriz: sparse.csr_matrix, categorias: List[str]) -> pd.DataFrame:
+    """Correlação (phi) entre categorias, considerando apenas as ligações classificadas"""
+    classificadas = matriz[matriz.getnnz(axis=1) > 0]
+    n = classificadas.shape[0]
+    conjunta = (classificadas.T @ classificadas).toarray() / max(n, 1)
+    proporcao = np.diag(conjunta)
+    desvio = np.sqrt(proporcao * (1 - proporcao))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        correlacao = (conjunta - np.outer(proporcao, proporcao)) / np.outer(desvio, desvio)
+    return pd.DataFrame(correlacao, index=categorias, columns=categorias)
+
+def lift_categorias(matriz: sparse.csr_matrix, categorias: List[str]) -> pd.DataFrame:
+    """Lift entre categorias: P(A e B) / (P(A) × P(B)); acima de 1 aparecem juntas mais que o acaso"""
+    classificadas = matriz[matriz.getnnz(axis=1) > 0]
+    n = classificadas.shape[0]
+    conjunta = (classificadas.T @ classificadas).toarray()
+    totais = np.diag(conjunta)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        lift = conjunta * n / np.outer(totais, totais)
+    return pd.DataFrame(lift, index=categorias, columns=categorias)
+
+def categorias_por_grupo(grupos: pd.Series, matriz: sparse.csr_matrix, categorias: List[str]) -> pd.DataFrame:
+    """Contagem de categorias por grupo (ex.: atendente) com um único produto esparso"""
+    codigos, nomes = pd.factorize(grupos.reset_index(drop=True))
+    indicadora = sparse.csr_matrix(
+        (np.ones(len(codigos), dtype=np.int32), (codigos, np.arange(len(codigos)))),
+        shape=(len(nomes), len(codigos)),
+    )
+    return pd.DataFrame((indicadora @ matriz).toarray(), index=nomes, columns=categorias)
 
-def preparar_dados_categorias(df: pd.DataFrame) -> pd.DataFrame:
+def preparar_dados_categorias(df: pd.DataFrame, codificacao=None) -> pd.DataFrame:
     """Prepara os dados para visualização das categorias"""
-    # Extrai todas as categorias únicas
-    todas_categorias = []
-    for cats in df['categorias_detectadas'].dropna():
-        todas_categorias.extend([c.strip() for c in cats.split(',')])
+    matriz, categorias = codificacao or codificar_categorias(df)
     
-    # Conta a frequência de cada categoria
-    contagem = pd.Series(todas_categorias).value_counts()
+    # Conta em quantas ligações cada categoria aparece
+    contagem = pd.Series(np.asarray(matriz.sum(axis=0)).ravel(), index=categorias)
+    contagem = contagem[contagem > 0]
     
     # Calcula percentuais
     percentuais = (contagem / len(df)) * 100
@@ -183,74 +228,85 @@ def gerar_grafico_barras_horizontal(df_categorias: pd.DataFrame, pasta_visualiza
     )
     
     # Salva o gráfico interativo
-    fig.write_html(os.path.join(pasta_visualizacoes, "distribuicao_categorias.html"))
-
-def gerar_grafico_correlacao_categorias(df: pd.DataFrame, pasta_visualizacoes: str):
-    """Gera matriz de correlação entre categorias"""
-    # Cria colunas binárias para cada categoria
-    categorias_unicas = []
-    for cats in df['categorias_detectadas'].dropna():
-        categorias_unicas.extend([c.strip() for c in cats.split(',')])
-    categorias_unicas = list(set(categorias_unicas))
-    
-    # Cria matriz de correlação
-    matriz_categorias = pd.DataFrame(columns=categorias_unicas, index=range(len(df)))
-    for idx, row in df.iterrows():
-        if pd.isna(row['categorias_detectadas']):
-            continue
-        cats = [c.strip() for c in row['categorias_detectadas'].split(',')]
-        for cat in categorias_unicas:
-            matriz_categorias.at[idx, cat] = 1 if cat in cats else 0
-    
-    # Calcula correlação
-    correlacao = matriz_categorias.corr()
-    
-    # Gera heatmap interativo
+    salvar_figura(fig, os.path.join(pasta_visualizacoes, "distribuicao_categorias.html"))
+
+def _gerar_heatmap_categorias(matriz: pd.DataFrame, titulo: str, caminho: str):
+    """Salva um heatmap interativo de uma matriz categoria × categoria"""
     fig = go.Figure(data=go.Heatmap(
-        z=correlacao,
-        x=correlacao.columns,
-        y=correlacao.columns,
-        text=correlacao.round(2),
+        z=matriz,
+        x=matriz.columns,
+        y=matriz.index,
+        text=matriz.round(2),
         texttemplate='%{text}',
         textfont={"size": 10},
         hoverongaps=False))
     
     fig.update_layout(
-        title='Correlação entre Categorias',
+        title=titulo,
         height=800,
         width=800,
         title_x=0.5
     )
     
-    # Salva versão interativa
-    fig.write_html(os.path.join(pasta_visualizacoes, "correlacao_categorias.html"))
+    salvar_figura(fig, caminho)
 
-def extrair_ramal(nome_arquivo: str) -> str:
-    """Extrai o ramal do nome do arquivo."""
-    padrao = r"bioc(\d{4})"
-    match = re.search(padrao, nome_arquivo.lower())
-    if match:
-        ramal_completo = f"bioc{match.group(1)}"
-        # Verifica se o ramal está no intervalo válido (5310-5319)
-        ramal_numero = int(match.group(1))
-        if 5310 <= ramal_numero <= 5319:
-            return ramal_completo
-    return "Não identificado"
+def relacoes_categorias(df: pd.DataFrame, codificacao=None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Matrizes de correlação, coocorrência e lift entre categorias, da mesma codificação"""
+    matriz, categorias = codificacao or codificar_categorias(df)
+    return (correlacao_categorias(matriz, categorias),
+            coocorrencia_categorias(matriz, categorias),
+            lift_categorias(matriz, categorias))
+
+def plotar_relacoes_categorias(relacoes: Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame], pasta_visualizacoes: str):
+    """Gera os heatmaps de correlação, coocorrência e lift a partir das matrizes"""
+    correlacao, coocorrencia, lift = relacoes
+    _gerar_heatmap_categorias(correlacao, 'Correlação entre Categorias',
+                              os.path.join(pasta_visualizacoes, "correlacao_categorias.html"))
+    _gerar_heatmap_categorias(coocorrencia, 'Ligações com as Duas Categorias',
+                              os.path.join(pasta_visualizacoes, "coocorrencia_categorias.html"))
+    _gerar_heatmap_categorias(lift, 'Lift entre Categorias',
+                              os.path.join(pasta_visualizacoes, "lift_categorias.html"))
+
+def gerar_grafico_correlacao_categorias(df: pd.DataFrame, pasta_visualizacoes: str, codificacao=None):
+    """Gera as matrizes de correlação, coocorrência e lift entre categorias"""
+    plotar_relacoes_categorias(relacoes_categorias(df, codificacao), pasta_visualizacoes)
+
+def contar_categorias_atendentes(df: pd.DataFrame, codificacao=None) -> pd.DataFrame:
+    """Contagem de categorias por atendente"""
+    matriz, categorias = codificacao or codificar_categorias(df)
+    return categorias_por_grupo(df['atendente'].astype(str), matriz, categorias)
 
-def get_nome_atendente(ramal: str) -> str:
-    """Retorna o nome da atendente com base no ramal."""
-    return MAPEAMENTO_ATENDENTES.get(ramal, "Atendente não identificada")
+def plotar_categorias_atendentes(por_atendente: pd.DataFrame, pasta_visualizacoes: str):
+    """Gera o heatmap de categorias por atendente a partir das contagens"""
+    fig = px.imshow(por_atendente,
+                    text_auto=True,
+                    aspect='auto',
+                    title='Categorias por Atendente',
+                    labels={'x': 'Categoria', 'y': 'Atendente', 'color': 'Ligações'})
+    fig.update_layout(height=600, title_x=0.5, title_font_size=20)
+    
+    salvar_figura(fig, os.path.join(pasta_visualizacoes, "categorias_por_atendente.html"))
+
+def gerar_grafico_categorias_atendentes(df: pd.DataFrame, pasta_visualizacoes: str, codificacao=None):
+    """Gera heatmap de categorias por atendente."""
+    por_atendente = contar_categorias_atendentes(df, codificacao)
+    plotar_categorias_atendentes(por_atendente, pasta_visualizacoes)
+    return por_atendente
+
+def contar_atendentes(df: pd.DataFrame) -> pd.DataFrame:
+    """Conta os atendimentos por atendente (identificada pelo ramal no nome do arquivo)."""
+    contagem_atendentes = df['atendente'].astype(str).value_counts().reset_index()
+    contagem_atendentes.columns = ['Atendente', 'Quantidade']
+    return contagem_atendentes
 
 def gerar_grafico_atendentes(df: pd.DataFrame, pasta_visualizacoes: str):
     """Gera gráfico de atendimentos por atendente."""
-    # Extrai ramais e converte para nomes
-    df['ramal'] = df['nome_arquivo'].apply(extrair_ramal)
-    df['atendente'] = df['ramal'].apply(get_nome_atendente)
-    
-    # Conta atendimentos por atendente
-    contagem_atendentes = df['atendente'].value_counts().reset_index()
-    contagem_atendentes.columns = ['Atendente', 'Quantidade']
-    
+    contagem_atendentes = contar_atendentes(df)
+    plotar_atendentes(contagem_atendentes, pasta_visualizacoes)
+    return contagem_atendentes
+
+def plotar_atendentes(contagem_atendentes: pd.DataFrame, pasta_visualizacoes: str):
+    """Gera o gráfico de atendimentos por atendente a partir das contagens."""
     # Gera gráfico interativo
     fig = px.bar(contagem_atendentes,
                  x='Atendente',
@@ -267,9 +323,7 @@ def gerar_grafico_atendentes(df: pd.DataFrame, pasta_visualizacoes: str):
     )
     
     # Salva o gráfico
-    fig.write_html(os.path.join(pasta_visualizacoes, "atendimentos_por_atendente.html"))
-    
-    return contagem_atendentes
+    salvar_figura(fig, os.path.join(pasta_visualizacoes, "atendimentos_por_atendente.html"))
 
 def gerar_relatorio_html(df: pd.DataFrame, df_categorias: pd.DataFrame, 
                         df_atendentes: pd.DataFrame, df_horarios: pd.DataFrame,
@@ -298,104 +352,20 @@ def gerar_relatorio_html(df: pd.DataFrame, df_categorias: pd.DataFrame,
         </tr>
         """
     
-    # Análises críticas
-    analise_atendentes = """
-    <div class="analise-critica">
-        <h3>Análise Crítica - Distribuição por Atendente</h3>
-        <p>Observa-se uma concentração significativa de atendimentos (60.3%) realizados pela atendente Joelma, 
-        o que pode indicar um desequilíbrio na distribuição de chamadas. Isso pode levar a sobrecarga de trabalho 
-        e possível impacto na qualidade do atendimento. Recomenda-se avaliar a distribuição atual das chamadas e 
-        considerar uma redistribuição mais equilibrada entre os atendentes.</p>
-    </div>
-    """
-    
-    analise_dias = """
-    <div class="analise-critica">
-        <h3>Análise Crítica - Distribuição por Dia da Semana</h3>
-        <p>A segunda-feira apresenta um volume significativamente maior de ligações (25.9%), 
-        seguido por uma distribuição mais uniforme nos outros dias. Este padrão sugere uma 
-        maior demanda no início da semana, possivelmente devido a acúmulo de demandas do fim 
-        de semana. Recomenda-se reforçar a equipe nas segundas-feiras para melhor atender 
-        este pico de demanda.</p>
-    </div>
-    """
-    
-    analise_categorias = """
-    <div class="analise-critica">
-        <h3>Análise Crítica - Distribuição de Categorias</h3>
-        <p>Destaca-se o alto índice de ligações indevidas/sem resposta (52.8%), o que representa 
-        um problema significativo de eficiência no sistema de atendimento. O segundo maior motivo 
-        é agendamento de consultas (47.8%), seguido por encaminhamentos para WhatsApp (20.4%). 
-        Recomenda-se:</p>
-        <ul>
-            <li>Investigar as causas das ligações indevidas/sem resposta</li>
-            <li>Avaliar a implementação de um sistema de agendamento online para reduzir o volume de ligações</li>
-            <li>Otimizar o processo de encaminhamento para WhatsApp</li>
-        </ul>
-    </div>
-    """
-    
-    analise_horarios = """
-    <div class="analise-critica">
-        <h3>Análise Crítica - Distribuição por Horário</h3>
-        <p>O pico de ligações ocorre entre 11h e 13h, com destaque para as 11h (47 ligações). 
-        Este padrão indica uma concentração de demanda no horário próximo ao almoço. Sugere-se:</p>
-        <ul>
-            <li>Reforçar a equipe de atendimento neste período</li>
-            <li>Considerar escala de almoço alternada para manter capacidade de atendimento</li>
-            <li>Avaliar a possibilidade de incentivos para clientes utilizarem horários alternativos</li>
-        </ul>
-    </div>
-    """
-    
-    analise_final = """
-    <div class="analise-final">
-        <h2>Análise Final e Recomendações</h2>
-        <p>A análise dos dados de Maio/2025 revela pontos críticos que merecem atenção:</p>
-        
-        <h3>Principais Achados:</h3>
-        <ul>
-            <li>Alto volume de ligações indevidas (52.8%)</li>
-            <li>Concentração de atendimentos em uma única atendente (60.3%)</li>
-            <li>Pico de demanda às segundas-feiras (25.9%)</li>
-            <li>Horário crítico entre 11h e 13h</li>
-        </ul>
-        
-        <h3>Recomendações Estratégicas:</h3>
-        <ol>
-            <li><strong>Otimização do Sistema de Atendimento:</strong>
-                <ul>
-                    <li>Implementar sistema de agendamento online</li>
-                    <li>Melhorar triagem inicial das chamadas</li>
-                    <li>Desenvolver FAQ no site para reduzir ligações simples</li>
-                </ul>
-            </li>
-            <li><strong>Gestão de Recursos Humanos:</strong>
-                <ul>
-                    <li>Redistribuir chamadas entre atendentes</li>
-                    <li>Capacitar equipe para múltiplos tipos de atendimento</li>
-                    <li>Implementar escala flexível para cobrir horários de pico</li>
-                </ul>
-            </li>
-            <li><strong>Melhorias Tecnológicas:</strong>
-                <ul>
-                    <li>Avaliar sistema de callback para reduzir tempo de espera</li>
-                    <li>Implementar chatbot para dúvidas básicas</li>
-                    <li>Melhorar integração entre canais de atendimento</li>
-                </ul>
-            </li>
-        </ol>
-        
-        <p>A implementação dessas recomendações pode levar a uma significativa melhoria na 
-        eficiência do atendimento e satisfação dos pacientes.</p>
-    </div>
-    """
+    # Análises críticas com os números do período, calculados a partir dos agregados
+    indicadores = calcular_indicadores(df, df_categorias, df_atendentes, df_horarios, df_dias_semana)
+    narrativa = gerar_narrativa(indicadores)
+    analise_atendentes = narrativa['analise_atendentes']
+    analise_dias = narrativa['analise_dias']
+    analise_categorias = narrativa['analise_categorias']
+    analise_horarios = narrativa['analise_horarios']
+    analise_final = narrativa['analise_final']
     
     html_content = f"""
     <!DOCTYPE html>
     <html>
     <head>
-        <title>Análise de Ligações - Instituto Bhariátrica - Maio/2025</title>
+        <title>Análise de Ligações - Instituto Bhariátrica - {indicadores['periodo']}</title>
         <meta charset="UTF-8">
         <style>
             :root {{
@@ -553,11 +523,11 @@ def gerar_relatorio_html(df: pd.DataFrame, df_categorias: pd.DataFrame,
     </head>
     <body>
         <div class="header">
-            <img src="imagens/logo.png" alt="Logo Bhariátrica" class="logo">
+            <img src="../../imagens/logo.png" alt="Logo Bhariátrica" class="logo">
         </div>
         
         <div class="container">
-            <h1>Análise de Ligações - Maio/2025</h1>
+            <h1>Análise de Ligações - {indicadores['periodo']}</h1>
             
             <div class="stats">
                 <h2>Estatísticas Gerais</h2>
@@ -619,46 +589,143 @@ def gerar_relatorio_html(df: pd.DataFrame, df_categorias: pd.DataFrame,
     </html>
     """
     
-    # Salva o relatório na pasta raiz
-    with open("index.html", "w", encoding="utf-8") as f:
+    # Salva o relatório na pasta do mês, ao lado da pasta de gráficos
+    caminho_pagina = caminho_pagina_mes(pasta_visualizacoes)
+    with open(caminho_pagina, "w", encoding="utf-8") as f:
         f.write(html_content)
+    
+    # Página única: gráficos renderizados na própria página com plotly.js compartilhado
+    empacotar_relatorio(caminho_pagina)
+
+def caminho_pagina_mes(pasta_visualizacoes: str) -> str:
+    """index.html do mês, na pasta que contém a de gráficos"""
+    return os.path.join(os.path.dirname(pasta_visualizacoes), "index.html")
 
-def main():
+def gerar_indice_meses(caminho: str = "index.html") -> List[str]:
+    """Página inicial do site: links para o relatório de cada mês, do mais recente ao mais antigo"""
+    meses = []
+    if os.path.isdir(PASTA_RELATORIOS):
+        for nome in os.listdir(PASTA_RELATORIOS):
+            try:
+                if validar_mes(nome) == nome and os.path.exists(os.path.join(PASTA_RELATORIOS, nome, "index.html")):
+                    meses.append(nome)
+            except ValueError:
+                continue
+    meses.sort(reverse=True)
+    
+    links = "\n".join(
+        f'            <li><a href="{PASTA_RELATORIOS}/{mes}/index.html">{pd.Period(mes, freq="M").strftime("%m/%Y")}</a></li>'
+        for mes in meses
+    )
+    html_content = f"""<!DOCTYPE html>
+<html>
+<head>
+    <title>Análise de Ligações</title>
+    <meta charset="UTF-8">
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 0 auto; max-width: 800px; padding: 20px; color: #343a40; }}
+        .logo {{ max-width: 200px; margin: 0 auto; display: block; }}
+        h1 {{ color: #17a2b8; text-align: center; }}
+        li {{ font-size: 1.2em; margin: 10px 0; }}
+        a {{ color: #17a2b8; }}
+    </style>
+</head>
+<body>
+    <img src="imagens/logo.png" alt="Logo Bhariátrica" class="logo">
+    <h1>Análise de Ligações</h1>
+    <p>Relatórios mensais das ligações transcritas:</p>
+    <ul>
+{links}
+    </ul>
+</body>
+</html>
+"""
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write(html_content)
+    return meses
+
+def gerar_pagina_inicial(agregados: Tuple, pasta_visualizacoes: str):
+    """Gera o index.html a partir dos agregados (base, categorias, atendentes, horários e dias)"""
+    gerar_relatorio_html(*agregados, pasta_visualizacoes)
+
+def artefatos_relatorio(pasta_visualizacoes: str, codificacao) -> List[Dict]:
+    """Declara os gráficos e a página inicial com o agregado que cada um consome"""
+    def caminhos(*nomes):
+        return [os.path.join(pasta_visualizacoes, f"{nome}.{ext}") for nome in nomes for ext in ('html', 'json')]
+    
+    # Todo gráfico passa pelo salvar_figura do empacotador
+    graficos = [
+        artefato('distribuicao_categorias',
+                 lambda df: preparar_dados_categorias(df, codificacao),
+                 gerar_grafico_barras_horizontal,
+                 caminhos('distribuicao_categorias'),
+                 codigo=[empacotador_relatorio]),
+        # As matrizes saem da codificação compartilhada; os renders só recebem as tabelas prontas
+        artefato('relacoes_categorias',
+                 lambda df: relacoes_categorias(df, codificacao),
+                 plotar_relacoes_categorias,
+                 caminhos('correlacao_categorias', 'coocorrencia_categorias', 'lift_categorias'),
+                 codigo=[_gerar_heatmap_categorias, empacotador_relatorio]),
+        artefato('categorias_por_atendente',
+                 lambda df: contar_categorias_atendentes(df, codificacao),
+                 plotar_categorias_atendentes,
+                 caminhos('categorias_por_atendente'),
+                 codigo=[empacotador_relatorio]),
+        artefato('atendimentos_por_atendente', contar_atendentes, plotar_atendentes,
+                 caminhos('atendimentos_por_atendente'), codigo=[empacotador_relatorio]),
+        artefato('distribuicao_horarios', contar_horarios, plotar_horarios,
+                 caminhos('distribuicao_horarios'), codigo=[empacotador_relatorio]),
+        artefato('distribuicao_dias_semana', contar_dias_semana, plotar_dias_semana,
+                 caminhos('distribuicao_dias_semana'), codigo=[empacotador_relatorio]),
+    ]
+    # A página inicial embute os JSON dos gráficos, então depende de todos eles; o
+    # modelo HTML, a narrativa e o empacotamento também entram na chave
+    pagina = artefato('index',
+                      lambda df: (df[['nome_arquivo', 'data_hora']], preparar_dados_categorias(df, codificacao),
+                                  contar_atendentes(df), contar_horarios(df), contar_dias_semana(df)),
+                      gerar_pagina_inicial,
+                      [caminho_pagina_mes(pasta_visualizacoes)],
+                      depende=[g['nome'] for g in graficos],
+                      codigo=[gerar_relatorio_html, caminho_pagina_mes, insights_relatorio, empacotador_relatorio])
+    return graficos + [pagina]
+
+def main(forcar: bool = False, mes: str = MES_PADRAO):
     print("Iniciando geração de visualizações...")
     
     # Cria pasta para as visualizações
-    pasta_visualizacoes = criar_pasta_visualizacoes()
+    pasta_visualizacoes = criar_pasta_visualizacoes(mes)
     print(f"Pasta de visualizações criada: {pasta_visualizacoes}")
     
     # Carrega os dados
-    df = carregar_dados()
-    print("Dados carregados com sucesso.")
-    
-    # Prepara dados das categorias
-    df_categorias = preparar_dados_categorias(df)
-    print("Dados preparados para visualização.")
+    df = carregar_dados(mes)
+    print(f"Dados de {mes} carregados com sucesso.")
     
-    # Gera visualizações
-    print("Gerando visualizações...")
-    gerar_grafico_barras_horizontal(df_categorias, pasta_visualizacoes)
-    gerar_grafico_correlacao_categorias(df, pasta_visualizacoes)
+    # Codifica as categorias uma vez para todos os agregados de categoria
+    codificacao = codificar_categorias(df)
     
-    # Novas análises
-    print("Gerando análises adicionais...")
-    df_atendentes = gerar_grafico_atendentes(df, pasta_visualizacoes)
-    df_horarios = analisar_horarios(df, pasta_visualizacoes)
-    df_dias_semana = analisar_dias_semana(df, pasta_visualizacoes)
+    # Só os artefatos com agregado (ou código) alterado desde a última execução são gerados de novo
+    print("Gerando visualizações e relatório HTML...")
+    manifesto = construir(artefatos_relatorio(pasta_visualizacoes, codificacao), df,
+                          pasta_visualizacoes, forcar=forcar)
+    for nome, registro in manifesto['artefatos'].items():
+        print(f"  {nome}: {registro['status']} ({registro['duracao_s']:.2f}s)")
+    print(f"Construção concluída em {manifesto['duracao_total_s']:.2f}s")
     
-    # Gera relatório HTML
-    print("Gerando relatório HTML...")
-    gerar_relatorio_html(df, df_categorias, df_atendentes, df_horarios, df_dias_semana, pasta_visualizacoes)
+    # A página inicial do site só lista os meses; cada mês tem o seu relatório
+    meses = gerar_indice_meses()
+    print(f"index.html atualizado com {len(meses)} mês(es)")
     
     print("\nProcesso concluído!")
     print(f"Todos os arquivos foram salvos em: {pasta_visualizacoes}")
     print("\nVocê encontrará:")
     print("1. Gráficos estáticos na pasta 'graficos_estaticos'")
-    print("2. Gráficos interativos na pasta 'graficos_interativos'")
-    print("3. Um relatório HTML completo: 'index.html'")
+    print(f"2. Gráficos interativos na pasta '{pasta_visualizacoes}'")
+    print(f"3. Um relatório HTML completo: '{caminho_pagina_mes(pasta_visualizacoes)}'")
+    print("4. A página inicial 'index.html' com os links para cada mês")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Gera os gráficos interativos e o index.html das transcrições.")
+    parser.add_argument('--forcar', action='store_true', help="Gera todos os artefatos, mesmo os sem alteração")
+    parser.add_argument('--mes', default=MES_PADRAO, help=f"Mês das transcrições (AAAA-MM, padrão {MES_PADRAO})")
+    args = parser.parse_args()
+    main(forcar=args.forcar, mes=validar_mes(args.mes))
@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+from datetime import datetime
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from cache_cdr import hash_arquivo
+from carregador_cdr import carregar_cdr, detectar_esquema
+
+PASTA_ARMAZEM = os.path.join("BD", "armazem")
+
+# Campos que identificam uma ligação entre exportações diferentes (o R_ID muda a cada download)
+CAMPOS_CHAVE = ['data_hora', 'Origem', 'Numero Discado', 'tempo_total']
+
+def chave_ligacao(df):
+    """Calcula a chave de deduplicação (hash uint64) de cada ligação."""
+    campos = df[CAMPOS_CHAVE].astype({'Origem': str, 'Numero Discado': str})
+    return pd.util.hash_pandas_object(campos, index=False).to_numpy()
+
+def pasta_mes(pasta_tipo, mes):
+    """Retorna a pasta da partição mensal (formato mes=AAAA-MM)."""
+    return os.path.join(pasta_tipo, f"mes={mes}")
+
+def _caminho_manifesto(destino):
+    return os.path.join(destino, "manifesto.json")
+
+def carregar_manifesto(destino=PASTA_ARMAZEM):
+    """Carrega o registro das exportações já ingeridas (chaveado pelo SHA-256)."""
+    caminho = _caminho_manifesto(destino)
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def salvar_manifesto(manifesto, destino=PASTA_ARMAZEM):
+    """Grava o manifesto de ingestão de forma atômica."""
+    caminho = _caminho_manifesto(destino)
+    temporario = f"{caminho}.tmp"
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, caminho)
+
+def chaves_existentes(pasta_particao):
+    """Lê apenas a coluna de chaves já gravadas em uma partição mensal."""
+    if not os.path.isdir(pasta_particao):
+        return pd.Index([], dtype='uint64')
+    tabela = ds.dataset(pasta_particao, format='parquet').to_table(columns=['chave'])
+    return pd.Index(tabela.column('chave').to_numpy())
+
+def ingerir_exportacao(arquivo, destino=PASTA_ARMAZEM, manifesto=None):
+    """
+    Acrescenta ao armazém apenas as ligações da exportação que ainda não estão lá.
+    Retorna a quantidade de linhas novas gravadas.
+    """
+    manifesto = carregar_manifesto(destino) if manifesto is None else manifesto
+    sha = hash_arquivo(arquivo)
+    if sha in manifesto:
+        print(f"Já ingerido, ignorando: {arquivo}")
+        return 0
+
+    df = carregar_cdr(arquivo)
+    tipo = detectar_esquema(df.columns)
+    pasta_tipo = os.path.join(destino, tipo)
+
+    df['chave'] = chave_ligacao(df)
+    df = df.drop_duplicates('chave')
+    meses = df['data_hora'].dt.strftime('%Y-%m')
+
+    linhas_novas = 0
+    for mes, bloco in df.groupby(meses, sort=True):
+        pasta_particao = pasta_mes(pasta_tipo, mes)
+        novos = bloco[~bloco['chave'].isin(chaves_existentes(pasta_particao))]
+        if novos.empty:
+            continue
+        os.makedirs(pasta_particao, exist_ok=True)
+        novos.to_parquet(os.path.join(pasta_particao, f"parte-{sha[:12]}.parquet"), index=False)
+        linhas_novas += len(novos)
+
+    manifesto[sha] = {
+        'arquivo': os.path.abspath(arquivo),
+        'tipo': tipo,
+        'linhas_lidas': len(df),
+        'linhas_novas': linhas_novas,
+        'ingerido_em': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    print(f"{arquivo}: {linhas_novas} de {len(df)} ligações novas ({tipo})")
+    return linhas_novas
+
+def ingerir_exportacoes(arquivos, destino=PASTA_ARMAZEM):
+    """Ingere várias exportações (com períodos sobrepostos) em sequência."""
+    os.makedirs(destino, exist_ok=True)
+    manifesto = carregar_manifesto(destino)
+    total = 0
+    for arquivo in arquivos:
+        total += ingerir_exportacao(arquivo, destino, manifesto)
+        salvar_manifesto(manifesto, destino)
+    return total
+
+def consultar_periodo(tipo='recebidas', inicio=None, fim=None, colunas=None, destino=PASTA_ARMAZEM):
+    """
+    Retorna as ligações do armazém entre inicio e fim (inclusive, por data).
+    Só as partições mensais do intervalo são abertas, e só as colunas pedidas são lidas.
+    """
+    pasta_tipo = os.path.join(destino, tipo)
+    inicio = pd.Timestamp(inicio) if inicio is not None else None
+    fim = pd.Timestamp(fim) + pd.Timedelta(days=1) if fim is not None else None
+
+    particoes = []
+    for nome in sorted(os.listdir(pasta_tipo)) if os.path.isdir(pasta_tipo) else []:
+        mes = pd.Period(nome.split('=', 1)[1], freq='M')
+        if inicio is not None and mes.end_time < inicio:
+            continue
+        if fim is not None and mes.start_time >= fim:
+            continue
+        pasta_particao = os.path.join(pasta_tipo, nome)
+        particoes.extend(os.path.join(pasta_particao, f) for f in sorted(os.listdir(pasta_particao)) if f.endswith('.parquet'))
+    if not particoes:
+        raise FileNotFoundError(f"Nenhuma partição de '{tipo}' encontrada para o período em {pasta_tipo}")
+
+    dataset = ds.dataset(particoes, format='parquet')
+    filtro = None
+    if inicio is not None:
+        filtro = ds.field('data_hora') >= inicio
+    if fim is not None:
+        filtro = (ds.field('data_hora') < fim) if filtro is None else filtro & (ds.field('data_hora') < fim)
+    if colunas is not None:
+        colunas = list(dict.fromkeys(['data_hora', *colunas]))
+
+    df = dataset.to_table(columns=colunas, filter=filtro).to_pandas()
+    return df.sort_values('data_hora', ascending=False, ignore_index=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingere exportações do PABX no armazém particionado por mês.")
+    parser.add_argument('arquivos', nargs='+', help="Arquivos CSV exportados (recebidas ou feitas)")
+    parser.add_argument('--destino', default=PASTA_ARMAZEM, help="Pasta do armazém")
+    args = parser.parse_args()
+
+    total = ingerir_exportacoes(args.arquivos, args.destino)
+    print(f"\nIngestão concluída! {total} ligações novas gravadas em: {args.destino}")
+
+if __name__ == "__main__":
+    main()
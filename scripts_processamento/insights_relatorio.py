@@ -0,0 +1,204 @@
+from typing import Dict, List
+
+import pandas as pd
+
+MESES = {
+    1: 'Janeiro', 2: 'Fevereiro', 3: 'Março', 4: 'Abril', 5: 'Maio', 6: 'Junho',
+    7: 'Julho', 8: 'Agosto', 9: 'Setembro', 10: 'Outubro', 11: 'Novembro', 12: 'Dezembro'
+}
+
+# Categorias que não entram nos destaques (mesma regra da tabela do relatório)
+CATEGORIAS_IGNORADAS = {"Outros assuntos"}
+
+# Quantidade de categorias citadas nos destaques
+TOP_CATEGORIAS = 3
+
+# Horas consecutivas da janela de pico
+JANELA_PICO_HORAS = 2
+
+# Acima desta fatia, a atendente líder é tratada como concentração de atendimentos
+LIMITE_CONCENTRACAO = 40.0
+
+# Quanto o dia de pico precisa passar da média diária para ser destacado
+FATOR_DIA_PICO = 1.2
+
+RECOMENDACOES_CATEGORIA = {
+    'Ligação indevida/sem resposta': "Investigar as causas das ligações indevidas/sem resposta",
+    'Agendamento de consulta': "Avaliar a implementação de um sistema de agendamento online para reduzir o volume de ligações",
+    'Encaminhamento para WhatsApp': "Otimizar o processo de encaminhamento para WhatsApp",
+    'Dúvidas sobre cirurgia': "Publicar material de orientação sobre a cirurgia para reduzir dúvidas recorrentes",
+    'Retorno pós-operatório': "Organizar o contato ativo com pacientes no pós-operatório",
+    'Cobranças e valores': "Deixar valores e formas de pagamento mais claros nos canais de atendimento",
+    'Reclamação': "Acompanhar as reclamações e dar retorno aos pacientes",
+    'Reagendamento ou cancelamento': "Permitir reagendamento e cancelamento pelos canais digitais",
+}
+
+def rotulo_periodo(datas: pd.Series) -> str:
+    """Rótulo do período analisado ('Maio/2025' ou 'Dezembro/2024 a Maio/2025')"""
+    datas = datas.dropna()
+    if datas.empty:
+        return "período não identificado"
+    inicio, fim = datas.min(), datas.max()
+    rotulo_inicio = f"{MESES[inicio.month]}/{inicio.year}"
+    rotulo_fim = f"{MESES[fim.month]}/{fim.year}"
+    return rotulo_inicio if rotulo_inicio == rotulo_fim else f"{rotulo_inicio} a {rotulo_fim}"
+
+def calcular_indicadores(df: pd.DataFrame, df_categorias: pd.DataFrame,
+                         df_atendentes: pd.DataFrame, df_horarios: pd.DataFrame,
+                         df_dias_semana: pd.DataFrame) -> Dict:
+    """Calcula os números citados no relatório a partir dos agregados"""
+    total = len(df)
+    percentual = (lambda quantidade: quantidade / total * 100) if total else (lambda quantidade: 0.0)
+
+    lider = df_atendentes.sort_values('Quantidade', ascending=False).iloc[0]
+
+    dias = df_dias_semana.fillna({'Quantidade': 0})
+    dia_pico = dias.loc[dias['Quantidade'].idxmax()]
+
+    # Janela de horas consecutivas com mais ligações (horas sem ligação contam zero)
+    por_hora = df_horarios.set_index('Hora')['Quantidade']
+    por_hora = por_hora.reindex(range(por_hora.index.min(), por_hora.index.max() + 1), fill_value=0)
+    janelas = por_hora.rolling(JANELA_PICO_HORAS, min_periods=1).sum()
+    fim_janela = int(janelas.idxmax())
+    inicio_janela = max(fim_janela - JANELA_PICO_HORAS + 1, int(por_hora.index.min()))
+
+    categorias = df_categorias[~df_categorias['Categoria'].isin(CATEGORIAS_IGNORADAS)]
+    categorias = categorias.sort_values('Quantidade', ascending=False).head(TOP_CATEGORIAS)
+
+    return {
+        'total': total,
+        'periodo': rotulo_periodo(df['data_hora']),
+        'atendente_lider': lider['Atendente'],
+        'participacao_lider': percentual(lider['Quantidade']),
+        'concentracao': percentual(lider['Quantidade']) > LIMITE_CONCENTRACAO,
+        'dia_pico': dia_pico['Dia'],
+        'participacao_dia_pico': percentual(dia_pico['Quantidade']),
+        'dia_pico_destacado': dia_pico['Quantidade'] > FATOR_DIA_PICO * dias['Quantidade'].mean(),
+        'inicio_janela_pico': inicio_janela,
+        'fim_janela_pico': fim_janela + 1,
+        'hora_pico': int(por_hora.idxmax()),
+        'ligacoes_hora_pico': int(por_hora.max()),
+        'ligacoes_janela_pico': int(janelas.max()),
+        'top_categorias': list(zip(categorias['Categoria'], categorias['Percentual'])),
+    }
+
+def _minuscula(nome: str) -> str:
+    # Só a primeira letra, para preservar siglas e nomes próprios ('WhatsApp')
+    return nome[:1].lower() + nome[1:]
+
+def _plural_dia(dia: str) -> str:
+    # 'Segunda-feira' -> 'segundas-feiras'
+    nome, _, sufixo = dia.lower().partition('-')
+    return f"{nome}s-{sufixo}s" if sufixo else f"{nome}s"
+
+def _analise(titulo: str, paragrafo: str, itens: List[str] = ()) -> str:
+    lista = "".join(f"<li>{item}</li>" for item in itens)
+    return f"""
+    <div class="analise-critica">
+        <h3>Análise Crítica - {titulo}</h3>
+        <p>{paragrafo}</p>
+        {f'<ul>{lista}</ul>' if lista else ''}
+    </div>
+    """
+
+def gerar_narrativa(ind: Dict) -> Dict[str, str]:
+    """Monta os textos de análise do relatório com os indicadores calculados"""
+    if ind['concentracao']:
+        texto_atendentes = (
+            f"Observa-se uma concentração significativa de atendimentos ({ind['participacao_lider']:.1f}%) "
+            f"realizados pela atendente {ind['atendente_lider']}, o que pode indicar um desequilíbrio na "
+            "distribuição de chamadas. Isso pode levar a sobrecarga de trabalho e possível impacto na qualidade "
+            "do atendimento. Recomenda-se avaliar a distribuição atual das chamadas e considerar uma "
+            "redistribuição mais equilibrada entre os atendentes.")
+    else:
+        texto_atendentes = (
+            f"A atendente com mais atendimentos é {ind['atendente_lider']} ({ind['participacao_lider']:.1f}%), "
+            "sem concentração excessiva em uma única pessoa. Recomenda-se manter o acompanhamento da "
+            "distribuição das chamadas.")
+
+    if ind['dia_pico_destacado']:
+        plural = _plural_dia(ind['dia_pico'])
+        texto_dias = (
+            f"A {ind['dia_pico'].lower()} apresenta um volume significativamente maior de ligações "
+            f"({ind['participacao_dia_pico']:.1f}%), seguida por uma distribuição mais uniforme nos outros dias. "
+            f"Recomenda-se reforçar a equipe nas {plural} para melhor atender este pico de demanda.")
+    else:
+        texto_dias = (
+            f"As ligações se distribuem de forma equilibrada ao longo da semana; o dia com mais ligações é "
+            f"{ind['dia_pico'].lower()} ({ind['participacao_dia_pico']:.1f}%).")
+
+    categorias = ind['top_categorias']
+    if categorias:
+        citadas = [f"{_minuscula(nome)} ({pct:.1f}%)" for nome, pct in categorias]
+        texto_categorias = f"O principal motivo de ligação é {citadas[0]}"
+        if len(citadas) > 1:
+            texto_categorias += ", seguido por " + " e ".join(citadas[1:])
+        texto_categorias += ". Recomenda-se:"
+        recomendacoes = [RECOMENDACOES_CATEGORIA.get(nome, f"Analisar as ligações de {_minuscula(nome)}")
+                         for nome, _ in categorias]
+    else:
+        texto_categorias, recomendacoes = "Não há categorias detectadas no período.", []
+
+    janela = f"entre {ind['inicio_janela_pico']}h e {ind['fim_janela_pico']}h"
+    texto_horarios = (
+        f"O pico de ligações ocorre {janela}, com destaque para as {ind['hora_pico']}h "
+        f"({ind['ligacoes_hora_pico']} ligações). Sugere-se:")
+
+    achados = [f"{nome} ({pct:.1f}%)" for nome, pct in categorias[:1]]
+    if ind['concentracao']:
+        achados.append(f"Concentração de atendimentos em uma única atendente ({ind['participacao_lider']:.1f}%)")
+    if ind['dia_pico_destacado']:
+        achados.append(f"Pico de demanda às {_plural_dia(ind['dia_pico'])} ({ind['participacao_dia_pico']:.1f}%)")
+    achados.append(f"Horário crítico {janela}")
+
+    analise_final = f"""
+    <div class="analise-final">
+        <h2>Análise Final e Recomendações</h2>
+        <p>A análise dos dados de {ind['periodo']} revela pontos críticos que merecem atenção:</p>
+
+        <h3>Principais Achados:</h3>
+        <ul>
+            {"".join(f"<li>{achado}</li>" for achado in achados)}
+        </ul>
+
+        <h3>Recomendações Estratégicas:</h3>
+        <ol>
+            <li><strong>Otimização do Sistema de Atendimento:</strong>
+                <ul>
+                    <li>Implementar sistema de agendamento online</li>
+                    <li>Melhorar triagem inicial das chamadas</li>
+                    <li>Desenvolver FAQ no site para reduzir ligações simples</li>
+                </ul>
+            </li>
+            <li><strong>Gestão de Recursos Humanos:</strong>
+                <ul>
+                    {'<li>Redistribuir chamadas entre atendentes</li>' if ind['concentracao'] else ''}
+                    <li>Capacitar equipe para múltiplos tipos de atendimento</li>
+                    <li>Implementar escala flexível para cobrir horários de pico</li>
+                </ul>
+            </li>
+            <li><strong>Melhorias Tecnológicas:</strong>
+                <ul>
+                    <li>Avaliar sistema de callback para reduzir tempo de espera</li>
+                    <li>Implementar chatbot para dúvidas básicas</li>
+                    <li>Melhorar integração entre canais de atendimento</li>
+                </ul>
+            </li>
+        </ol>
+
+        <p>A implementação dessas recomendações pode levar a uma significativa melhoria na
+        eficiência do atendimento e satisfação dos pacientes.</p>
+    </div>
+    """
+
+    return {
+        'analise_atendentes': _analise("Distribuição por Atendente", texto_atendentes),
+        'analise_dias': _analise("Distribuição por Dia da Semana", texto_dias),
+        'analise_categorias': _analise("Distribuição de Categorias", texto_categorias, recomendacoes),
+        'analise_horarios': _analise("Distribuição por Horário", texto_horarios, [
+            "Reforçar a equipe de atendimento neste período",
+            "Considerar escala de almoço alternada para manter capacidade de atendimento",
+            "Avaliar a possibilidade de incentivos para clientes utilizarem horários alternativos",
+        ]),
+        'analise_final': analise_final,
+    }
@@ -0,0 +1,133 @@
+import pandas as pd
+
+from telefones import extrair_ramal_agente
+
+# Dimensões calculadas a partir das colunas da base (ou do cubo) quando não existem prontas
+DIMENSOES_DERIVADAS = {
+    'mes': lambda df: df['data'].dt.strftime('%Y-%m'),
+    'hora_cheia': lambda df: df['data_hora'].dt.hour,
+    'ramal': lambda df: extrair_ramal_agente(df['Agente / Atendente']),
+}
+
+def contagem(**condicao):
+    """Quantidade de ligações (que atendem à condição coluna=valor, se houver)."""
+    return {'tipo': 'contagem', 'condicao': condicao}
+
+def soma(coluna, **condicao):
+    """Soma de uma coluna numérica (ex.: tempo_total)."""
+    return {'tipo': 'soma', 'coluna': coluna, 'condicao': condicao}
+
+def media(coluna, **condicao):
+    """Média de uma coluna numérica sobre as ligações que atendem à condição."""
+    return {'tipo': 'media', 'coluna': coluna, 'condicao': condicao}
+
+def taxa(numerador, denominador):
+    """Percentual entre duas métricas já declaradas (pelo nome)."""
+    return {'tipo': 'taxa', 'numerador': numerador, 'denominador': denominador}
+
+METRICAS_LIGACOES = {
+    'total_ligacoes': contagem(),
+    'total_atendidas': contagem(status_consolidado='Atendida'),
+    'total_nao_atendidas': contagem(status_consolidado='Não Atendida'),
+    'taxa_atendimento': taxa('total_atendidas', 'total_ligacoes'),
+    'tempo_medio_conversa': media('tempo_total', status_consolidado='Atendida'),
+    'tempo_medio_espera': media('tempo_espera'),
+}
+
+def _chave_condicao(condicao):
+    return tuple(sorted(condicao.items()))
+
+def _componentes(metricas):
+    """Somas básicas (contagens e somas condicionais) de que as métricas dependem."""
+    componentes = {}
+    for metrica in metricas.values():
+        condicao = _chave_condicao(metrica.get('condicao', {}))
+        if metrica['tipo'] in ('contagem', 'media'):
+            componentes[('contagem', None, condicao)] = None
+        if metrica['tipo'] in ('soma', 'media'):
+            componentes[('soma', metrica['coluna'], condicao)] = None
+    return list(componentes)
+
+def _coluna_componente(df, componente, peso):
+    tipo, coluna, condicao = componente
+    valores = peso
+    if tipo == 'soma':
+        # No cubo a soma já vem pré-agregada em 'soma_<coluna>'
+        valores = df[f'soma_{coluna}'] if f'soma_{coluna}' in df.columns else df[coluna] * peso
+    for coluna_condicao, valor in condicao:
+        valores = valores.where(df[coluna_condicao] == valor, 0)
+    return valores.to_numpy()
+
+def avaliar_metricas(df, metricas=METRICAS_LIGACOES, dimensoes=()):
+    """
+    Avalia as métricas declaradas em uma única passada agrupada por `dimensoes`
+    (ex.: ['mes'], ['dia_semana'], ['ramal']). Aceita a base de ligações ou o
+    cubo (cubo_ligacoes.py). Retorna uma tabela longa: dimensões, metrica, valor.
+    """
+    dimensoes = list(dimensoes)
+    peso = df['quantidade'] if 'quantidade' in df.columns else pd.Series(1, index=df.index)
+    componentes = _componentes(metricas)
+
+    base = pd.DataFrame(
+        {i: _coluna_componente(df, componente, peso) for i, componente in enumerate(componentes)},
+        index=df.index,
+    )
+    for dimensao in dimensoes:
+        base[dimensao] = df[dimensao] if dimensao in df.columns else DIMENSOES_DERIVADAS[dimensao](df)
+    if dimensoes:
+        somas = base.groupby(dimensoes, observed=True, dropna=False).sum()
+    else:
+        somas = base.sum().to_frame().T
+
+    valores = {}
+    for nome, metrica in metricas.items():
+        condicao = _chave_condicao(metrica.get('condicao', {}))
+        if metrica['tipo'] == 'taxa':
+            denominador = valores[metrica['denominador']]
+            valores[nome] = (valores[metrica['numerador']] / denominador * 100).where(denominador > 0, 0)
+        elif metrica['tipo'] == 'contagem':
+            valores[nome] = somas[componentes.index(('contagem', None, condicao))]
+        elif metrica['tipo'] == 'soma':
+            valores[nome] = somas[componentes.index(('soma', metrica['coluna'], condicao))]
+        else:
+            quantidade = somas[componentes.index(('contagem', None, condicao))]
+            total = somas[componentes.index(('soma', metrica['coluna'], condicao))]
+            valores[nome] = (total / quantidade).where(quantidade > 0, 0)
+
+    tabela = pd.DataFrame(valores)
+    tabela.columns.name = 'metrica'
+    tabela = tabela.stack().rename('valor').reset_index()
+    return tabela.drop(columns=[c for c in tabela.columns if c not in [*dimensoes, 'metrica', 'valor']])
+
+def tabela_larga(tabela, dimensoes=()):
+    """Uma linha por combinação das dimensões e uma coluna por métrica (para Excel/HTML)."""
+    dimensoes = list(dimensoes)
+    if not dimensoes:
+        return tabela.set_index('metrica')['valor'].to_frame().T
+    return tabela.pivot(index=dimensoes, columns='metrica', values='valor')[tabela['metrica'].unique()]
+
+def quebras_metricas(df, quebras, metricas=METRICAS_LIGACOES):
+    """Avalia as métricas para cada quebra (nome -> dimensões) e devolve as tabelas largas."""
+    return {
+        nome: tabela_larga(avaliar_metricas(df, metricas, dimensoes), dimensoes)
+        for nome, dimensoes in quebras.items()
+    }
+
+def exportar_metricas_excel(tabelas, arquivo):
+    """Grava cada quebra das métricas em uma aba do Excel."""
+    with pd.ExcelWriter(arquivo) as writer:
+        for nome, tabela in tabelas.items():
+            tabela.to_excel(writer, sheet_name=nome[:31])
+
+def gerar_secao_metricas(tabelas):
+    """Gera a seção HTML com as tabelas de métricas por quebra."""
+    blocos = "".join(
+        f"<h3>Por {nome}</h3>{tabela.to_html(float_format='%.1f', border=0)}"
+        for nome, tabela in tabelas.items()
+    )
+    return f"""
+            <div class="visualization">
+                <h2>Métricas Detalhadas</h2>
+                {blocos}
+            </div>
+    """
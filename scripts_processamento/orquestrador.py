@@ -0,0 +1,251 @@
+import argparse
+import ast
+import glob
+import importlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from config_execucao import MES_PADRAO, pasta_audios_mes, pasta_relatorio_mes, pasta_resultados_mes, validar_mes
+from construcao_relatorio import hash_arquivo, hash_valor
+
+PASTA_SCRIPTS = os.path.dirname(os.path.abspath(__file__))
+ARQUIVO_MANIFESTO_PIPELINE = os.path.join("relatorios", "manifesto_pipeline.json")
+# O mesmo de calendario_dias_uteis.ARQUIVO_FECHAMENTOS (não importado aqui para o
+# --help não carregar o pandas)
+ARQUIVO_FECHAMENTOS = os.path.join("BD", "fechamentos_clinica.csv")
+
+CONCLUIDAS = ('executada', 'reaproveitada')
+FALHAS = ('erro', 'bloqueada')
+
+def etapa(nome, alvo, entradas, saidas, depende=(), parametros=None):
+    """
+    Declara uma etapa do pipeline: `alvo` é 'modulo:funcao' (importado só no
+    processo que roda a etapa), chamado com `parametros`. `entradas` e `saidas`
+    são arquivos, pastas ou padrões glob; `depende` lista etapas anteriores.
+    """
+    return {'nome': nome, 'alvo': alvo, 'entradas': list(entradas), 'saidas': list(saidas),
+            'depende': list(depende), 'parametros': dict(parametros or {})}
+
+def etapas_pipeline(mes=MES_PADRAO):
+    """Etapas do fluxo completo de um mês: transcrição e classificação, análise do PABX e visualizações."""
+    pasta_mes = pasta_resultados_mes(mes)
+    transcricoes = os.path.join(pasta_mes, "transcricoes_individuais")
+    classificacao = os.path.join(pasta_mes, "classificacao_*.parquet")
+    return [
+        etapa('transcrever', 'transcrever:processar_audios',
+              entradas=[pasta_audios_mes(mes)],
+              saidas=[transcricoes, os.path.join(pasta_mes, "checkpoint.csv")],
+              parametros={'mes': mes}),
+        etapa('classificar_transcricoes', 'classificar_transcricoes:classificar_transcricoes',
+              entradas=[transcricoes],
+              saidas=[classificacao],
+              depende=['transcrever'], parametros={'mes': mes}),
+        etapa('classificar_ligacoes', 'classificar_ligacoes:classificar_mes',
+              entradas=[pasta_audios_mes(mes)],
+              saidas=[os.path.join("resultados", f"classificacao_ligacoes_{mes}.xlsx")],
+              parametros={'mes': mes}),
+        # O relatório do PABX não depende das transcrições e roda em paralelo com elas
+        etapa('analisar_cdr', 'analisar_relatorio_ligacoes:main',
+              entradas=[os.path.join("BD", "LIGAÇÕES RECEBIDAS"), ARQUIVO_FECHAMENTOS],
+              saidas=[os.path.join("relatorios", "resultados_relatorio_ligacoes")]),
+        # As visualizações leem a classificação colunar gravada pela etapa anterior. O
+        # index.html da raiz lista todos os meses e não entra nas saídas do mês
+        etapa('visualizar', 'gerar_visualizacoes:main',
+              entradas=[classificacao],
+              saidas=[pasta_relatorio_mes(mes)],
+              depende=['classificar_transcricoes'], parametros={'mes': mes}),
+    ]
+
+def _expandir(caminho):
+    return sorted(glob.glob(caminho)) if glob.has_magic(caminho) else [caminho]
+
+def impressao(caminhos):
+    """
+    Impressão digital de arquivos e pastas: conteúdo dos arquivos e, nas pastas,
+    nome, tamanho e data de modificação de cada arquivo (pastas de áudio são grandes
+    demais para ler inteiras). Padrões sem nenhum arquivo contam como ausentes.
+    """
+    partes = []
+    for caminho in caminhos:
+        encontrados = [c for c in _expandir(caminho) if os.path.exists(c)]
+        if not encontrados:
+            partes.append((caminho, 'ausente'))
+        for encontrado in encontrados:
+            if os.path.isdir(encontrado):
+                listagem = []
+                for raiz, _, arquivos in os.walk(encontrado):
+                    for arquivo in arquivos:
+                        info = os.stat(os.path.join(raiz, arquivo))
+                        listagem.append((os.path.relpath(os.path.join(raiz, arquivo), encontrado), info.st_size, info.st_mtime_ns))
+                partes.append((encontrado, sorted(listagem)))
+            else:
+                partes.append((encontrado, hash_arquivo(encontrado)))
+    return hash_valor(partes)
+
+def _saidas_presentes(saidas):
+    return all(any(os.path.exists(c) for c in _expandir(saida)) for saida in saidas)
+
+def modulos_locais(modulo):
+    """
+    O módulo e todos os scripts desta pasta que ele importa, direta ou indiretamente
+    (inclusive imports dentro de funções). Bibliotecas de fora ficam de fora.
+    """
+    encontrados, fila = set(), [modulo]
+    while fila:
+        nome = fila.pop()
+        caminho = os.path.join(PASTA_SCRIPTS, f"{nome}.py")
+        if nome in encontrados or not os.path.exists(caminho):
+            continue
+        encontrados.add(nome)
+        with open(caminho, 'r', encoding='utf-8') as f:
+            arvore = ast.parse(f.read(), filename=caminho)
+        for no in ast.walk(arvore):
+            if isinstance(no, ast.Import):
+                fila.extend(alias.name.split('.')[0] for alias in no.names)
+            elif isinstance(no, ast.ImportFrom) and no.module and not no.level:
+                fila.append(no.module.split('.')[0])
+    return sorted(encontrados)
+
+def chave_etapa(e):
+    """
+    Entradas, código do módulo (e dos scripts locais que ele importa) e parâmetros:
+    a mesma chave produz as mesmas saídas.
+    """
+    modulo = e['alvo'].split(':', 1)[0]
+    codigo = [(nome, hash_arquivo(os.path.join(PASTA_SCRIPTS, f"{nome}.py"))) for nome in modulos_locais(modulo)]
+    return hash_valor([impressao(e['entradas']), codigo, json.dumps(e['parametros'], sort_keys=True)])
+
+def chave_registro(e):
+    """Registro da etapa no manifesto: por mês e etapa, para um mês não apagar o histórico de outro."""
+    mes = e['parametros'].get('mes')
+    return f"{mes}/{e['nome']}" if mes else e['nome']
+
+def _em_dia(registro, chave, saidas):
+    return (bool(registro) and registro.get('chave') == chave and _saidas_presentes(saidas)
+            and registro.get('saidas') == impressao(saidas))
+
+def _executar_etapa(alvo, parametros):
+    modulo, funcao = alvo.split(':', 1)
+    inicio = time.perf_counter()
+    getattr(importlib.import_module(modulo), funcao)(**parametros)
+    return time.perf_counter() - inicio
+
+def carregar_manifesto_pipeline(caminho=ARQUIVO_MANIFESTO_PIPELINE):
+    if not os.path.exists(caminho):
+        return {'etapas': {}}
+    with open(caminho, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def salvar_manifesto_pipeline(manifesto, caminho=ARQUIVO_MANIFESTO_PIPELINE):
+    os.makedirs(os.path.dirname(caminho) or '.', exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+def executar_pipeline(etapas, processos=None, forcar=False, caminho_manifesto=ARQUIVO_MANIFESTO_PIPELINE):
+    """
+    Executa as etapas respeitando as dependências: cada etapa começa assim que as
+    suas dependências terminam (ramos independentes rodam ao mesmo tempo) e é
+    pulada quando a chave e as saídas batem com o manifesto. Falhas bloqueiam só
+    as etapas que dependem da etapa que falhou. Retorna o status de cada etapa.
+    """
+    nomes = {e['nome'] for e in etapas}
+    for e in etapas:
+        faltando = set(e['depende']) - nomes
+        if faltando:
+            raise ValueError(f"A etapa {e['nome']} depende de etapas inexistentes: {', '.join(sorted(faltando))}")
+
+    manifesto = carregar_manifesto_pipeline(caminho_manifesto)
+    registros = manifesto['etapas']
+    pendentes = {e['nome']: e for e in etapas}
+    status, em_execucao = {}, {}
+    inicio_total = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        while pendentes or em_execucao:
+            liberou = True
+            while liberou:
+                liberou = False
+                for nome, e in list(pendentes.items()):
+                    dependencias = [status.get(d) for d in e['depende']]
+                    if any(s in FALHAS for s in dependencias):
+                        status[nome] = 'bloqueada'
+                    elif all(s in CONCLUIDAS for s in dependencias):
+                        chave = chave_etapa(e)
+                        if not forcar and _em_dia(registros.get(chave_registro(e)), chave, e['saidas']):
+                            status[nome] = 'reaproveitada'
+                        else:
+                            em_execucao[executor.submit(_executar_etapa, e['alvo'], e['parametros'])] = (e, chave)
+                            print(f"{nome}: iniciada")
+                    else:
+                        continue
+                    del pendentes[nome]
+                    liberou = True
+                    if nome in status:
+                        print(f"{nome}: {status[nome]}")
+
+            if not em_execucao:
+                if pendentes:
+                    raise ValueError(f"Dependência circular entre: {', '.join(pendentes)}")
+                break
+
+            prontas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futura in prontas:
+                e, chave = em_execucao.pop(futura)
+                try:
+                    duracao = futura.result()
+                except Exception as erro:
+                    status[e['nome']] = 'erro'
+                    print(f"{e['nome']}: erro ({type(erro).__name__}: {erro})")
+                    continue
+                status[e['nome']] = 'executada'
+                registros[chave_registro(e)] = {
+                    'chave': chave,
+                    'saidas': impressao(e['saidas']),
+                    'duracao_s': round(duracao, 2),
+                    'atualizado_em': datetime.now().isoformat(timespec='seconds'),
+                }
+                print(f"{e['nome']}: executada em {duracao:.1f}s")
+
+    manifesto['ultima_execucao'] = {
+        'status': status,
+        'duracao_total_s': round(time.perf_counter() - inicio_total, 2),
+        'em': datetime.now().isoformat(timespec='seconds'),
+    }
+    salvar_manifesto_pipeline(manifesto, caminho_manifesto)
+    return status
+
+def selecionar_etapas(etapas, nomes):
+    """As etapas pedidas e tudo de que elas dependem."""
+    por_nome = {e['nome']: e for e in etapas}
+    escolhidas, fila = set(), list(nomes)
+    while fila:
+        nome = fila.pop()
+        if nome not in escolhidas:
+            escolhidas.add(nome)
+            fila.extend(por_nome[nome]['depende'])
+    return [e for e in etapas if e['nome'] in escolhidas]
+
+def main():
+    nomes_etapas = [e['nome'] for e in etapas_pipeline()]
+    parser = argparse.ArgumentParser(description="Roda o pipeline completo de ligações, pulando etapas sem alteração.")
+    parser.add_argument('--mes', default=MES_PADRAO, help=f"Mês das gravações e transcrições (AAAA-MM, padrão {MES_PADRAO})")
+    parser.add_argument('--etapas', nargs='+', choices=nomes_etapas,
+                        help="Etapas a rodar (as dependências entram junto); padrão: todas")
+    parser.add_argument('--processos', type=int, help="Etapas rodando ao mesmo tempo (padrão: núcleos da máquina)")
+    parser.add_argument('--forcar', action='store_true', help="Roda as etapas mesmo sem alteração nas entradas")
+    args = parser.parse_args()
+
+    etapas = etapas_pipeline(validar_mes(args.mes))
+    if args.etapas:
+        etapas = selecionar_etapas(etapas, args.etapas)
+    status = executar_pipeline(etapas, processos=args.processos, forcar=args.forcar)
+
+    falhas = [nome for nome, s in status.items() if s in FALHAS]
+    if falhas:
+        print(f"Etapas com erro ou bloqueadas: {', '.join(falhas)}")
+
+if __name__ == "__main__":
+    main()
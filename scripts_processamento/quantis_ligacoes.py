@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from empacotador_relatorio import salvar_figura
+
+# Erro relativo máximo dos quantis estimados (1% do valor)
+ERRO_RELATIVO = 0.01
+GAMA = (1 + ERRO_RELATIVO) / (1 - ERRO_RELATIVO)
+
+# Balde reservado para valores zero (o log não está definido)
+BALDE_ZERO = -1
+
+NIVEIS_QUANTIS = [0.5, 0.9, 0.99]
+
+# Nível de serviço: ligações atendidas com espera de até este limite (segundos)
+LIMITE_NIVEL_SERVICO = 20
+
+def indice_balde(valores):
+    """Balde logarítmico de cada valor: valores em (GAMA^(i-1), GAMA^i] caem no balde i."""
+    valores = np.asarray(valores, dtype='float64')
+    with np.errstate(divide='ignore'):
+        indices = np.ceil(np.log(valores) / np.log(GAMA))
+    return np.where(valores > 0, indices, BALDE_ZERO).astype('int64')
+
+def valor_balde(indices):
+    """Valor representativo do balde, com erro relativo de no máximo ERRO_RELATIVO."""
+    indices = np.asarray(indices, dtype='int64')
+    return np.where(indices == BALDE_ZERO, 0.0, 2 * GAMA ** indices / (GAMA + 1))
+
+class SketchQuantis:
+    """
+    Sketch de quantis combinável (no estilo DDSketch): guarda só a contagem
+    de cada balde logarítmico, por grupo. Somar dois sketches equivale a
+    construir o sketch da união dos dados, então cada bloco ou partição é
+    resumido separadamente e os resultados são combinados depois.
+    """
+
+    def __init__(self, grupos, contagens=None):
+        self.grupos = list(grupos)
+        if contagens is None:
+            indice = pd.MultiIndex.from_arrays([[]] * (len(self.grupos) + 1), names=[*self.grupos, 'balde'])
+            contagens = pd.Series(dtype='int64', index=indice)
+        self.contagens = contagens
+
+    @classmethod
+    def de_valores(cls, df, coluna, grupos):
+        """Constrói o sketch da coluna de df, separado pelas colunas de grupos."""
+        baldes = pd.Series(indice_balde(df[coluna]), index=df.index, name='balde')
+        contagens = baldes.groupby([df[g] for g in grupos] + [baldes]).size()
+        return cls(grupos, contagens.astype('int64'))
+
+    def combinar(self, outro):
+        """Retorna um novo sketch com a soma das contagens dos dois."""
+        if self.contagens.empty or outro.contagens.empty:
+            return SketchQuantis(self.grupos, outro.contagens if self.contagens.empty else self.contagens)
+        return SketchQuantis(self.grupos, self.contagens.add(outro.contagens, fill_value=0).astype('int64'))
+
+    __add__ = combinar
+
+    def reagrupar(self, grupos):
+        """Soma os baldes sobre os grupos omitidos (ex.: de mês × hora para só hora)."""
+        grupos = list(grupos)
+        contagens = self.contagens.groupby(level=[*grupos, 'balde']).sum()
+        return SketchQuantis(grupos, contagens)
+
+    def _acumulado(self):
+        contagens = self.contagens.sort_index()
+        if not self.grupos:
+            return contagens, contagens.cumsum(), pd.Series(contagens.sum(), index=contagens.index)
+        por_grupo = contagens.groupby(level=self.grupos)
+        return contagens, por_grupo.cumsum(), por_grupo.transform('sum')
+
+    def quantis(self, niveis=NIVEIS_QUANTIS):
+        """Quantis estimados por grupo, em colunas p50, p90, p99..."""
+        contagens, acumulado, total = self._acumulado()
+        baldes = contagens.index.get_level_values('balde')
+        resultado = {}
+        for nivel in niveis:
+            # Primeiro balde cujo acumulado ultrapassa a posição do quantil
+            posicao = nivel * (total - 1)
+            alcancou = acumulado > posicao
+            estimativas = pd.Series(valor_balde(baldes), index=contagens.index)[alcancou]
+            if self.grupos:
+                estimativas = estimativas.groupby(level=self.grupos).first()
+            else:
+                estimativas = pd.Series(estimativas.iloc[:1].to_numpy())
+            resultado[f'p{nivel * 100:g}'] = estimativas
+        return pd.DataFrame(resultado)
+
+    def contar_ate(self, limite):
+        """Quantidade de valores até o limite, por grupo (exata para segundos inteiros pequenos)."""
+        baldes = self.contagens.index.get_level_values('balde')
+        ate_limite = self.contagens[baldes <= indice_balde([limite])[0]]
+        if not self.grupos:
+            return pd.Series([int(ate_limite.sum())])
+        return ate_limite.groupby(level=self.grupos).sum()
+
+    def total(self):
+        """Quantidade de valores por grupo."""
+        if not self.grupos:
+            return pd.Series([int(self.contagens.sum())])
+        return self.contagens.groupby(level=self.grupos).sum()
+
+class DistribuicoesLigacoes:
+    """
+    Sketches de espera (todas as ligações e só as atendidas) e de tempo de
+    conversa (atendidas), por mês e hora cheia. Combináveis entre blocos.
+    """
+
+    GRUPOS = ['mes', 'hora_cheia']
+
+    def __init__(self, sketches=None):
+        self.sketches = sketches or {
+            nome: SketchQuantis(self.GRUPOS) for nome in ('espera', 'espera_atendidas', 'conversa')
+        }
+
+    @classmethod
+    def de_bloco(cls, df_processado):
+        """Resume um bloco já processado por processar_dados()."""
+        df = df_processado.assign(
+            mes=df_processado['data_hora'].dt.strftime('%Y-%m'),
+            hora_cheia=df_processado['data_hora'].dt.hour,
+        )
+        atendidas = df[df['status_consolidado'] == 'Atendida']
+        return cls({
+            'espera': SketchQuantis.de_valores(df, 'tempo_espera', cls.GRUPOS),
+            'espera_atendidas': SketchQuantis.de_valores(atendidas, 'tempo_espera', cls.GRUPOS),
+            'conversa': SketchQuantis.de_valores(atendidas, 'tempo_total', cls.GRUPOS),
+        })
+
+    def combinar(self, outro):
+        return DistribuicoesLigacoes({
+            nome: self.sketches[nome] + outro.sketches[nome] for nome in self.sketches
+        })
+
+    __add__ = combinar
+
+    def resumo(self, grupos, limite=LIMITE_NIVEL_SERVICO):
+        """
+        Quantis de espera e conversa e nível de serviço (% das ligações atendidas
+        com espera de até `limite` segundos) agrupados por `grupos` (ex.: ['hora_cheia']).
+        """
+        espera = self.sketches['espera'].reagrupar(grupos)
+        espera_atendidas = self.sketches['espera_atendidas'].reagrupar(grupos)
+        conversa = self.sketches['conversa'].reagrupar(grupos)
+
+        resumo = pd.concat([
+            espera.total().rename('ligacoes'),
+            espera.quantis().add_prefix('espera_'),
+            conversa.quantis().add_prefix('conversa_'),
+        ], axis=1)
+        no_limite = espera_atendidas.contar_ate(limite).reindex(resumo.index, fill_value=0)
+        resumo['nivel_servico'] = no_limite / resumo['ligacoes'] * 100
+        return resumo
+
+def gerar_graficos_quantis(distribuicoes, pasta_saida):
+    """Gera os gráficos de percentis de espera por hora e de nível de serviço por mês."""
+    por_hora = distribuicoes.resumo(['hora_cheia']).reset_index()
+    por_hora['hora'] = por_hora['hora_cheia'].map(lambda h: f'{int(h):02d}h')
+    colunas_espera = [c for c in por_hora.columns if c.startswith('espera_p')]
+    fig = px.line(
+        por_hora.melt(id_vars='hora', value_vars=colunas_espera, var_name='percentil', value_name='segundos'),
+        x='hora',
+        y='segundos',
+        color='percentil',
+        markers=True,
+        title='Tempo de Espera (TME) por Hora - Percentis',
+        labels={'segundos': 'Espera (segundos)', 'hora': 'Hora', 'percentil': 'Percentil'}
+    )
+    fig.update_layout(height=600)
+    salvar_figura(fig, f"{pasta_saida}/espera_percentis_por_hora.html")
+
+    por_mes = distribuicoes.resumo(['mes']).reset_index()
+    fig = px.bar(
+        por_mes,
+        x='mes',
+        y='nivel_servico',
+        title=f'Nível de Serviço por Mês (atendidas em até {LIMITE_NIVEL_SERVICO}s)',
+        labels={'nivel_servico': 'Nível de Serviço (%)', 'mes': 'Mês'}
+    )
+    fig.update_layout(height=600, showlegend=False)
+    salvar_figura(fig, f"{pasta_saida}/nivel_servico_por_mes.html")
+    return por_hora, por_mes
+
+def gerar_secao_quantis(distribuicoes):
+    """Gera a seção HTML de percentis de espera/conversa e nível de serviço."""
+    geral = distribuicoes.resumo([]).iloc[0]
+    return f"""
+            <div class="visualization">
+                <h2>Tempo de Espera e Nível de Serviço</h2>
+                <div class="metricas">
+                    <div class="metrica-card">
+                        <h3>Espera (p50 / p90 / p99)</h3>
+                        <div class="metrica-valor">{geral['espera_p50']:.0f} / {geral['espera_p90']:.0f} / {geral['espera_p99']:.0f}s</div>
+                    </div>
+                    <div class="metrica-card">
+                        <h3>Conversa (p50 / p90)</h3>
+                        <div class="metrica-valor">{geral['conversa_p50']:.0f} / {geral['conversa_p90']:.0f}s</div>
+                    </div>
+                    <div class="metrica-card">
+                        <h3>Atendidas em até {LIMITE_NIVEL_SERVICO}s</h3>
+                        <div class="metrica-valor">{geral['nivel_servico']:.1f}%</div>
+                    </div>
+                </div>
+                <iframe src="espera_percentis_por_hora.html"></iframe>
+                <iframe src="nivel_servico_por_mes.html"></iframe>
+            </div>
+    """
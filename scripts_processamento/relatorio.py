@@ -1,10 +1,11 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 import re
 import os
 
+from explorador_ligacoes import exportar_explorador
+from renderizador_graficos import montar_tarefas, renderizar_lote
+
 def extrair_horario(nome_arquivo):
     """Extrai o horário do nome do arquivo."""
     padrao = r"_(\d{2})_(\d{2})_(\d{2})_"
@@ -14,19 +15,20 @@ def extrair_horario(nome_arquivo):
         return f"{hora}:{minuto}:{segundo}"
     return "00:00:00"  # Horário padrão se não encontrar
 
-def criar_grafico_pizza(dados, titulo, arquivo):
-    """Cria um gráfico de pizza com os dados fornecidos."""
-    plt.figure(figsize=(12, 8))
-    cores = sns.color_palette('husl', n_colors=len(dados))
-    patches, texts, autotexts = plt.pie(dados.values, labels=dados.index, colors=cores,
-                                      autopct='%1.1f%%', startangle=90)
-    # Melhorando a legibilidade dos rótulos
-    plt.setp(autotexts, size=8, weight="bold")
-    plt.setp(texts, size=8)
-    plt.title(titulo, pad=20, size=12, weight="bold")
-    plt.axis('equal')
-    plt.savefig(arquivo, bbox_inches='tight', dpi=300)
-    plt.close()
+# Gráficos do relatório: nome do arquivo -> (modelo, agregação, título)
+GRAFICOS = {
+    'distribuicao_horaria': ('barras_hora', lambda df: df['hora'].value_counts().sort_index(),
+                             "Distribuição de Ligações por Hora do Dia"),
+    'categorias_pizza': ('pizza', lambda df: df['categoria'].value_counts(),
+                         'Distribuição de Categorias das Ligações'),
+    'sentimentos_pizza': ('pizza', lambda df: df['sentimento'].value_counts(),
+                          'Distribuição de Sentimentos das Ligações'),
+    'periodos_pizza': ('pizza', lambda df: df['periodo'].value_counts(),
+                       'Distribuição de Ligações por Período do Dia'),
+}
+
+# Colunas pelas quais os gráficos também são gerados separadamente
+FACETAS = ['mes', 'ramal']
 
 def gerar_relatorio():
     """Gera relatório e visualizações a partir dos dados analisados."""
@@ -42,47 +44,32 @@ def gerar_relatorio():
     df['horario'] = df['arquivo'].apply(extrair_horario)
     df['hora'] = df['horario'].str[:2].astype(int)
     
-    # Data atual para os arquivos
-    data_atual = datetime.now().strftime("%Y%m%d")
-    
-    # Análise por hora do dia
-    plt.figure(figsize=(15, 6))
-    contagem_horas = df['hora'].value_counts().sort_index()
-    sns.barplot(x=contagem_horas.index, y=contagem_horas.values)
-    plt.title("Distribuição de Ligações por Hora do Dia")
-    plt.xlabel("Hora")
-    plt.ylabel("Quantidade de Ligações")
-    plt.xticks(range(24))
-    plt.tight_layout()
-    plt.savefig(os.path.join(pasta_graficos, f"distribuicao_horaria_{data_atual}.png"))
-    plt.close()
-
-    # Gráficos de pizza
-    # 1. Distribuição de Categorias
-    criar_grafico_pizza(
-        df['categoria'].value_counts(),
-        'Distribuição de Categorias das Ligações',
-        os.path.join(pasta_graficos, f"categorias_pizza_{data_atual}.png")
-    )
+    # Data/hora, mês e ramal a partir do nome do arquivo (AAAA_MM_DD_HH_MM_SS_biocRRRR_...)
+    df['data_hora'] = pd.to_datetime(df['arquivo'].str.extract(r"^(\d{4}_\d{2}_\d{2}_\d{2}_\d{2}_\d{2})", expand=False),
+                                     format="%Y_%m_%d_%H_%M_%S", errors='coerce')
+    df['mes'] = df['data_hora'].dt.strftime('%Y-%m')
+    df['ramal'] = df['arquivo'].str.extract(r"bioc(\d{4})", expand=False).fillna("sem_ramal")
     
-    # 2. Distribuição de Sentimentos
-    criar_grafico_pizza(
-        df['sentimento'].value_counts(),
-        'Distribuição de Sentimentos das Ligações',
-        os.path.join(pasta_graficos, f"sentimentos_pizza_{data_atual}.png")
-    )
-
     # Análise de categorias por período do dia
     df['periodo'] = pd.cut(df['hora'], 
                          bins=[0, 12, 18, 24],
                          labels=['Manhã (0-12h)', 'Tarde (12-18h)', 'Noite (18-24h)'])
     
-    # 3. Distribuição por Período
-    criar_grafico_pizza(
-        df['periodo'].value_counts(),
-        'Distribuição de Ligações por Período do Dia',
-        os.path.join(pasta_graficos, f"periodos_pizza_{data_atual}.png")
-    )
+    # Data atual para os arquivos
+    data_atual = datetime.now().strftime("%Y%m%d")
+    
+    # Gráficos da base inteira e repetidos por mês e por ramal, renderizados em paralelo
+    tarefas = montar_tarefas(df, GRAFICOS, pasta_graficos, sufixo=f"_{data_atual}")
+    for faceta in FACETAS:
+        tarefas += montar_tarefas(df.dropna(subset=[faceta]), GRAFICOS, os.path.join(pasta_graficos, f"por_{faceta}"),
+                                  faceta=faceta, sufixo=f"_{data_atual}")
+    resultado = renderizar_lote(tarefas, pasta_graficos)
+    print(f"{len(tarefas)} gráficos: {resultado['renderizados']} renderizados, "
+          f"{resultado['reaproveitados']} reaproveitados do cache em {resultado['duracao_s']:.1f}s")
+    
+    # Detalhes das ligações: páginas JSON comprimidas para o explorador do site
+    pasta_explorador = os.path.join(pasta_resultados, "explorador")
+    indice = exportar_explorador(df, pasta_explorador)
     
     # Criar relatório em texto
     with open(os.path.join(pasta_resultados, f"relatorio_{data_atual}.txt"), "w", encoding="utf-8") as f:
@@ -113,16 +100,11 @@ def gerar_relatorio():
             for sent, count in sentimentos_periodo.items():
                 f.write(f"  - {sent}: {count} ligações ({(count/len(df_periodo)*100):.1f}%)\n")
 
-        # Adicionar detalhes de cada ligação ordenada por horário
-        f.write("\n4. DETALHES DAS LIGAÇÕES POR HORÁRIO\n")
+        # Os detalhes de cada ligação ficam no explorador paginado do site
+        f.write("\n4. DETALHES DAS LIGAÇÕES\n")
         f.write("-" * 40 + "\n")
-        df_sorted = df.sort_values('horario')
-        for _, row in df_sorted.iterrows():
-            f.write(f"\nHorário: {row['horario']}\n")
-            f.write(f"Arquivo: {row['arquivo']}\n")
-            f.write(f"Categoria: {row['categoria']}\n")
-            f.write(f"Sentimento: {row['sentimento']}\n")
-            f.write("-" * 20 + "\n")
+        f.write(f"{indice['total']} ligações em {len(indice['paginas'])} páginas, "
+                f"disponíveis em {os.path.join(pasta_explorador, 'index.html')}\n")
 
 if __name__ == "__main__":
     gerar_relatorio() 
\ No newline at end of file
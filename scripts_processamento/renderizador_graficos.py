@@ -0,0 +1,131 @@
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import seaborn as sns
+
+from construcao_relatorio import hash_codigo, hash_valor
+
+# Cópia de cada PNG renderizado, com o nome da chave: o conteúdo de um arquivo de
+# destino pode ser sobrescrito por outros dados, o da cópia nunca muda
+PASTA_CACHE = "cache_graficos"
+
+def desenhar_barras_hora(ax, dados, titulo):
+    """Barras de ligações por hora do dia."""
+    sns.barplot(x=dados.index, y=dados.values, ax=ax)
+    ax.set_title(titulo)
+    ax.set_xlabel("Hora")
+    ax.set_ylabel("Quantidade de Ligações")
+    ax.set_xticks(range(24))
+
+def desenhar_pizza(ax, dados, titulo):
+    """Pizza com percentuais (fatias vazias ficam de fora)."""
+    dados = dados[dados > 0]
+    cores = sns.color_palette('husl', n_colors=len(dados))
+    patches, texts, autotexts = ax.pie(dados.values, labels=dados.index, colors=cores,
+                                       autopct='%1.1f%%', startangle=90)
+    # Melhorando a legibilidade dos rótulos
+    plt.setp(autotexts, size=8, weight="bold")
+    plt.setp(texts, size=8)
+    ax.set_title(titulo, pad=20, size=12, weight="bold")
+    ax.axis('equal')
+
+# Modelos de figura: função de desenho, tamanho e opções de gravação
+MODELOS = {
+    'barras_hora': {'desenhar': desenhar_barras_hora, 'figsize': (15, 6), 'dpi': 100, 'bbox_inches': None},
+    'pizza': {'desenhar': desenhar_pizza, 'figsize': (12, 8), 'dpi': 300, 'bbox_inches': 'tight'},
+}
+
+# Uma figura por modelo em cada processo, limpa e reaproveitada entre tarefas
+_figuras = {}
+
+def tarefa(modelo, dados, titulo, arquivo):
+    """Descreve um gráfico a renderizar: modelo, dados já agregados, título e arquivo PNG."""
+    return {'modelo': modelo, 'dados': dados, 'titulo': titulo, 'arquivo': arquivo}
+
+def montar_tarefas(df, graficos, pasta, faceta=None, sufixo=''):
+    """
+    Monta as tarefas dos gráficos (nome -> (modelo, agregar, título)) para a base
+    inteira ou, com `faceta`, para cada valor da coluna (um conjunto por mês, ramal...).
+    """
+    grupos = [(None, df)] if faceta is None else df.groupby(faceta, observed=True, sort=True)
+    tarefas = []
+    for valor, grupo in grupos:
+        for nome, (modelo, agregar, titulo) in graficos.items():
+            if valor is None:
+                arquivo, titulo_grafico = f"{nome}{sufixo}.png", titulo
+            else:
+                arquivo, titulo_grafico = f"{nome}_{valor}{sufixo}.png", f"{titulo} - {valor}"
+            tarefas.append(tarefa(modelo, agregar(grupo), titulo_grafico, os.path.join(pasta, arquivo)))
+    return tarefas
+
+def chave_tarefa(t):
+    """Hash dos dados, do título e do código do modelo: a mesma chave gera o mesmo PNG."""
+    return hash_valor([t['modelo'], hash_codigo(MODELOS[t['modelo']]['desenhar']), t['titulo'], t['dados']])
+
+def _renderizar(t):
+    modelo = MODELOS[t['modelo']]
+    fig = _figuras.get(t['modelo'])
+    if fig is None:
+        fig = _figuras[t['modelo']] = plt.figure(figsize=modelo['figsize'])
+    else:
+        fig.clf()
+    ax = fig.add_subplot()
+    modelo['desenhar'](ax, t['dados'], t['titulo'])
+    if modelo['bbox_inches'] is None:
+        fig.tight_layout()
+    os.makedirs(os.path.dirname(t['arquivo']) or '.', exist_ok=True)
+    fig.savefig(t['arquivo'], dpi=modelo['dpi'], bbox_inches=modelo['bbox_inches'])
+    return t['arquivo']
+
+def _caminho_cache(pasta_cache, chave):
+    return os.path.join(pasta_cache, PASTA_CACHE, f"{chave}.png")
+
+def _copiar(origem, destino):
+    os.makedirs(os.path.dirname(destino) or '.', exist_ok=True)
+    shutil.copyfile(origem, destino)
+
+def renderizar_lote(tarefas, pasta_cache, processos=None):
+    """
+    Renderiza as tarefas em paralelo com o backend Agg. Gráficos cuja chave já
+    foi renderizada são copiados do cache da pasta em vez de desenhados de novo.
+    Retorna as contagens e o tempo.
+    """
+    inicio = time.perf_counter()
+    os.makedirs(os.path.join(pasta_cache, PASTA_CACHE), exist_ok=True)
+    pendentes, chaves, reaproveitados = [], {}, 0
+
+    for t in tarefas:
+        chave = chave_tarefa(t)
+        guardado = _caminho_cache(pasta_cache, chave)
+        if os.path.exists(guardado):
+            _copiar(guardado, t['arquivo'])
+            reaproveitados += 1
+            continue
+        if chave not in chaves:
+            pendentes.append(t)
+        chaves.setdefault(chave, []).append(t['arquivo'])
+
+    if pendentes:
+        processos = processos or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            # Lotes de tarefas por processo para diluir o custo de enviar os dados
+            lote = max(1, len(pendentes) // (processos * 4))
+            list(executor.map(_renderizar, pendentes, chunksize=lote))
+
+    # Guarda cada render novo no cache; tarefas repetidas no mesmo lote recebem cópia
+    for chave, arquivos in chaves.items():
+        _copiar(arquivos[0], _caminho_cache(pasta_cache, chave))
+        for arquivo in arquivos[1:]:
+            _copiar(arquivos[0], arquivo)
+        reaproveitados += len(arquivos) - 1
+
+    return {
+        'renderizados': len(pendentes),
+        'reaproveitados': reaproveitados,
+        'duracao_s': round(time.perf_counter() - inicio, 2),
+    }
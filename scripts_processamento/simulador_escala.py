@@ -0,0 +1,264 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from analisar_relatorio_ligacoes import DIAS_SEMANA, carregar_dados, processar_dados
+from calendario_dias_uteis import mascara_dia_util
+from empacotador_relatorio import empacotar_relatorio, salvar_figura
+from filtros_cdr import FIM_EXPEDIENTE, FIM_EXPEDIENTE_SEXTA, INICIO_EXPEDIENTE
+
+ARQUIVO_RECEBIDAS = "BD/LIGAÇÕES RECEBIDAS/12.24 até 05.25.csv"
+PASTA_SAIDA = "relatorios/resultados_relatorio_ligacoes"
+
+# Meta de nível de serviço: % das ligações atendidas em até LIMITE_ESPERA segundos
+LIMITE_ESPERA = 20
+META_NIVEL_SERVICO = 80
+
+# Tempo médio (segundos) que o paciente espera antes de desligar; não há como medir
+# no CDR (ligações perdidas trazem TME fixo), por isso é um parâmetro da simulação
+PACIENCIA_MEDIA = 60
+
+SIMULACOES = 2000
+SEMENTE = 42
+
+def grade_expediente():
+    """Células (dia da semana, hora cheia) do horário comercial usado nos filtros."""
+    celulas = []
+    for dia in DIAS_SEMANA:
+        fim = FIM_EXPEDIENTE_SEXTA if dia == 4 else FIM_EXPEDIENTE
+        celulas.extend((dia, hora) for hora in range(INICIO_EXPEDIENTE // 60, fim // 60))
+    return pd.MultiIndex.from_tuples(celulas, names=['dia_semana', 'hora_cheia'])
+
+def estimar_demanda(df_processado):
+    """
+    Taxa de chegada (ligações por hora) de cada célula dia × hora, dividindo o
+    volume observado pelo número de dias úteis daquele dia da semana no período.
+    """
+    datas = pd.Series(pd.date_range(df_processado['data'].min(), df_processado['data'].max()))
+    dias_uteis = datas[mascara_dia_util(datas)]
+    dias_por_semana = dias_uteis.dt.dayofweek.value_counts()
+
+    # O filtro de expediente inclui o minuto de fechamento (ex.: 18:00); essas
+    # ligações contam na última hora de atendimento, que é a que tem escala
+    dia_semana = df_processado['dia_semana'].to_numpy()
+    ultima_hora = np.where(dia_semana == 4, FIM_EXPEDIENTE_SEXTA, FIM_EXPEDIENTE) // 60 - 1
+    hora_cheia = np.minimum(df_processado['data_hora'].dt.hour.to_numpy(), ultima_hora)
+    volume = pd.DataFrame({'dia_semana': dia_semana, 'hora_cheia': hora_cheia}).groupby(
+        ['dia_semana', 'hora_cheia']
+    ).size()
+    grade = grade_expediente()
+    volume = volume.reindex(grade, fill_value=0)
+    dias = dias_por_semana.reindex(grade.get_level_values('dia_semana')).fillna(0).to_numpy()
+    return pd.Series(np.where(dias > 0, volume.to_numpy() / np.maximum(dias, 1), 0), index=grade, name='chegadas_hora')
+
+def tempos_atendimento(df_processado):
+    """Amostra empírica do tempo de conversa (segundos) das ligações atendidas."""
+    atendidas = df_processado[df_processado['status_consolidado'] == 'Atendida']
+    return atendidas['tempo_total'].to_numpy(dtype='float64')
+
+def erlang_c(chegadas_hora, tma, agentes, limite_espera=LIMITE_ESPERA):
+    """
+    Caminho analítico (Erlang C, sem abandono), vetorizado por célula.
+    Retorna probabilidade de espera, espera média (s) e nível de serviço (%).
+    """
+    carga = np.asarray(chegadas_hora, dtype='float64') * tma / 3600
+    agentes = np.asarray(agentes, dtype='int64')
+
+    # Recursão de Erlang B até o número de agentes de cada célula
+    erlang_b = np.ones_like(carga)
+    for n in range(1, int(agentes.max(initial=0)) + 1):
+        proximo = carga * erlang_b / (n + carga * erlang_b)
+        erlang_b = np.where(n <= agentes, proximo, erlang_b)
+
+    estavel = agentes > carga
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prob_espera = agentes * erlang_b / (agentes - carga * (1 - erlang_b))
+        prob_espera = np.where(estavel, prob_espera, 1.0)
+        espera_media = np.where(estavel, prob_espera * tma / (agentes - carga), np.inf)
+        nivel_servico = np.where(
+            estavel, 1 - prob_espera * np.exp(-(agentes - carga) * limite_espera / tma), 0.0
+        )
+    return pd.DataFrame({
+        'prob_espera': prob_espera,
+        'espera_media': espera_media,
+        'nivel_servico': nivel_servico * 100,
+    })
+
+def simular_monte_carlo(chegadas_hora, agentes, tempos, simulacoes=SIMULACOES,
+                        paciencia_media=PACIENCIA_MEDIA, limite_espera=LIMITE_ESPERA, semente=SEMENTE):
+    """
+    Simula `simulacoes` horas de cada célula (fila FIFO com vários agentes e
+    abandono). Todas as células e simulações avançam juntas em arrays numpy;
+    o único laço é sobre a ordem de chegada dentro da hora.
+    Retorna taxa de atendimento, espera média e nível de serviço por célula.
+    """
+    rng = np.random.default_rng(semente)
+    chegadas_hora = np.asarray(chegadas_hora, dtype='float64')
+    agentes = np.asarray(agentes, dtype='int64')
+    celulas = len(chegadas_hora)
+
+    # Linha = (célula, simulação)
+    taxa = np.repeat(chegadas_hora, simulacoes)
+    servidores = np.repeat(agentes, simulacoes)
+    quantidade = rng.poisson(taxa)
+    maximo = int(quantidade.max(initial=0))
+    linhas = len(taxa)
+
+    existe = np.arange(maximo) < quantidade[:, None]
+    # Posições além da quantidade sorteada vão para o fim da ordenação
+    instantes = np.sort(np.where(existe, rng.uniform(0, 3600, size=(linhas, maximo)), np.inf), axis=1)
+    duracoes = rng.choice(tempos, size=(linhas, maximo))
+    paciencia = rng.exponential(paciencia_media, size=(linhas, maximo))
+
+    # Agentes inexistentes na célula ficam ocupados para sempre
+    livre_em = np.where(np.arange(max(int(agentes.max(initial=0)), 1)) < servidores[:, None], 0.0, np.inf)
+    esperas = np.full((linhas, maximo), np.nan)
+    atendida = np.zeros((linhas, maximo), dtype=bool)
+    todas = np.arange(linhas)
+    for k in range(maximo):
+        agente = livre_em.argmin(axis=1)
+        inicio = np.maximum(instantes[:, k], livre_em[todas, agente])
+        with np.errstate(invalid='ignore'):
+            # inf - inf nas posições sem chegada; descartadas pela máscara `existe`
+            espera = inicio - instantes[:, k]
+        atende = existe[:, k] & (espera <= paciencia[:, k])
+        livre_em[todas, agente] = np.where(atende, inicio + duracoes[:, k], livre_em[todas, agente])
+        esperas[:, k] = np.where(existe[:, k], np.minimum(espera, paciencia[:, k]), np.nan)
+        atendida[:, k] = atende
+
+    por_celula = np.repeat(np.arange(celulas), simulacoes)
+    total = np.bincount(por_celula, weights=existe.sum(axis=1), minlength=celulas)
+    atendidas = np.bincount(por_celula, weights=atendida.sum(axis=1), minlength=celulas)
+    no_limite = np.bincount(por_celula, weights=(atendida & (esperas <= limite_espera)).sum(axis=1), minlength=celulas)
+    soma_espera = np.bincount(por_celula, weights=np.nansum(esperas, axis=1), minlength=celulas)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'taxa_atendimento': np.where(total > 0, atendidas / total * 100, 100.0),
+            'espera_media': np.where(total > 0, soma_espera / total, 0.0),
+            'nivel_servico': np.where(total > 0, no_limite / total * 100, 100.0),
+        })
+
+def escala_uniforme(agentes):
+    """Escala com o mesmo número de agentes em todas as células do expediente."""
+    return pd.Series(agentes, index=grade_expediente(), name='agentes')
+
+def carregar_escala(arquivo):
+    """Lê uma escala em CSV com as colunas dia_semana, hora_cheia e agentes."""
+    escala = pd.read_csv(arquivo).set_index(['dia_semana', 'hora_cheia'])['agentes']
+    return escala.reindex(grade_expediente(), fill_value=0)
+
+def avaliar_escala(demanda, escala, tempos, **opcoes_simulacao):
+    """Previsão analítica (Erlang C) e simulada (Monte Carlo) de cada célula da escala."""
+    escala = escala.reindex(demanda.index, fill_value=0)
+    analitico = erlang_c(demanda, tempos.mean(), escala).add_prefix('erlang_')
+    simulado = simular_monte_carlo(demanda.to_numpy(), escala.to_numpy(), tempos, **opcoes_simulacao).add_prefix('simulado_')
+    resultado = pd.concat([analitico, simulado], axis=1)
+    resultado.index = demanda.index
+    return pd.concat([demanda, escala.rename('agentes'), resultado], axis=1)
+
+def resumir_escala(avaliacao):
+    """Indicadores da semana ponderados pelo volume de chegadas de cada célula."""
+    peso = avaliacao['chegadas_hora']
+    media = lambda coluna: float((avaliacao[coluna] * peso).sum() / peso.sum()) if peso.sum() else 0.0
+    return {
+        'horas_agente': int(avaliacao['agentes'].sum()),
+        'taxa_atendimento': media('simulado_taxa_atendimento'),
+        'espera_media': media('simulado_espera_media'),
+        'nivel_servico': media('simulado_nivel_servico'),
+    }
+
+def comparar_escalas(demanda, escalas, tempos, **opcoes_simulacao):
+    """Avalia várias escalas candidatas (nome -> Series de agentes) e resume cada uma."""
+    return pd.DataFrame({
+        nome: resumir_escala(avaliar_escala(demanda, escala, tempos, **opcoes_simulacao))
+        for nome, escala in escalas.items()
+    }).T
+
+def escala_minima(demanda, tma, meta=META_NIVEL_SERVICO, limite_espera=LIMITE_ESPERA, maximo=20):
+    """Menor número de agentes por célula que atinge a meta de nível de serviço no Erlang C."""
+    agentes = np.where(demanda.to_numpy() > 0, 1, 0)
+    for _ in range(maximo):
+        nivel = erlang_c(demanda, tma, agentes, limite_espera)['nivel_servico'].to_numpy()
+        abaixo = (demanda.to_numpy() > 0) & (nivel < meta)
+        if not abaixo.any():
+            break
+        agentes = agentes + abaixo
+    return pd.Series(agentes, index=demanda.index, name='agentes')
+
+def gerar_relatorio_escala(avaliacao, comparacao, pasta_saida):
+    """Gera o mapa de calor do nível de serviço simulado e o relatório HTML da simulação."""
+    mapa = avaliacao['simulado_nivel_servico'].unstack('hora_cheia').rename(index=DIAS_SEMANA)
+    fig = px.imshow(
+        mapa,
+        text_auto='.0f',
+        color_continuous_scale='RdYlGn',
+        zmin=0,
+        zmax=100,
+        title=f'Nível de Serviço Simulado (% atendidas em até {LIMITE_ESPERA}s)',
+        labels={'x': 'Hora', 'y': 'Dia da Semana', 'color': '%'}
+    )
+    fig.update_layout(height=600)
+    salvar_figura(fig, f"{pasta_saida}/simulacao_escala_nivel_servico.html")
+
+    detalhe = avaliacao.rename(index=DIAS_SEMANA, level='dia_semana')
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Simulação de Escala - Instituto Bhariátrica</title>
+        <meta charset="UTF-8">
+        <style>
+            body {{ font-family: Arial, sans-serif; margin: 0 auto; max-width: 1200px; padding: 20px; color: #343a40; }}
+            h1, h2 {{ color: #17a2b8; }}
+            table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
+            th, td {{ padding: 8px; text-align: left; border-bottom: 1px solid #dee2e6; }}
+            th {{ background-color: #17a2b8; color: #ffffff; }}
+            iframe {{ border: none; width: 100%; height: 600px; }}
+        </style>
+    </head>
+    <body>
+        <h1>Simulação de Escala</h1>
+        <p>Meta: {META_NIVEL_SERVICO}% das ligações atendidas em até {LIMITE_ESPERA}s.
+           Paciência média considerada: {PACIENCIA_MEDIA}s.</p>
+        <h2>Escalas Comparadas</h2>
+        {comparacao.to_html(float_format='%.1f', border=0)}
+        <iframe src="simulacao_escala_nivel_servico.html"></iframe>
+        <h2>Detalhe por Dia e Hora (escala atual)</h2>
+        {detalhe.to_html(float_format='%.2f', border=0)}
+    </body>
+    </html>
+    """
+    with open(f"{pasta_saida}/relatorio_simulacao_escala.html", "w", encoding="utf-8") as f:
+        f.write(html_content)
+    empacotar_relatorio(f"{pasta_saida}/relatorio_simulacao_escala.html")
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula o atendimento para escalas de agentes por dia e hora.")
+    parser.add_argument('--escala', help="CSV com dia_semana, hora_cheia e agentes (padrão: --agentes em todas as horas)")
+    parser.add_argument('--agentes', type=int, default=2, help="Agentes por hora na escala uniforme")
+    parser.add_argument('--simulacoes', type=int, default=SIMULACOES)
+    args = parser.parse_args()
+
+    os.makedirs(PASTA_SAIDA, exist_ok=True)
+    df_processado = processar_dados(carregar_dados(ARQUIVO_RECEBIDAS))
+    demanda = estimar_demanda(df_processado)
+    tempos = tempos_atendimento(df_processado)
+
+    atual = carregar_escala(args.escala) if args.escala else escala_uniforme(args.agentes)
+    escalas = {
+        'atual': atual,
+        f'mínima (meta {META_NIVEL_SERVICO}%)': escala_minima(demanda, tempos.mean()),
+        'atual + 1 agente': atual + 1,
+    }
+    comparacao = comparar_escalas(demanda, escalas, tempos, simulacoes=args.simulacoes)
+    avaliacao = avaliar_escala(demanda, atual, tempos, simulacoes=args.simulacoes)
+    gerar_relatorio_escala(avaliacao, comparacao, PASTA_SAIDA)
+
+    print(comparacao.round(1).to_string())
+    print("Simulação concluída! Os resultados foram salvos em:", PASTA_SAIDA)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# DDD usado quando o número chega sem código de área (8 ou 9 dígitos)
+DDD_PADRAO = 31
+
+CODIGO_PAIS = 55
+
+# Números não geográficos (0800, 0300, 0500, 0900) não têm DDD e são descartados
+PREFIXOS_SERVICO = r'0[3589]00'
+
+# Unidade da federação de cada DDD brasileiro
+DDD_UF = {
+    **{ddd: 'SP' for ddd in (11, 12, 13, 14, 15, 16, 17, 18, 19)},
+    **{ddd: 'RJ' for ddd in (21, 22, 24)},
+    **{ddd: 'ES' for ddd in (27, 28)},
+    **{ddd: 'MG' for ddd in (31, 32, 33, 34, 35, 37, 38)},
+    **{ddd: 'PR' for ddd in (41, 42, 43, 44, 45, 46)},
+    **{ddd: 'SC' for ddd in (47, 48, 49)},
+    **{ddd: 'RS' for ddd in (51, 53, 54, 55)},
+    61: 'DF',
+    **{ddd: 'GO' for ddd in (62, 64)},
+    63: 'TO',
+    **{ddd: 'MT' for ddd in (65, 66)},
+    67: 'MS',
+    68: 'AC',
+    69: 'RO',
+    **{ddd: 'BA' for ddd in (71, 73, 74, 75, 77)},
+    79: 'SE',
+    **{ddd: 'PE' for ddd in (81, 87)},
+    82: 'AL',
+    83: 'PB',
+    84: 'RN',
+    **{ddd: 'CE' for ddd in (85, 88)},
+    **{ddd: 'PI' for ddd in (86, 89)},
+    **{ddd: 'PA' for ddd in (91, 93, 94)},
+    **{ddd: 'AM' for ddd in (92, 97)},
+    95: 'RR',
+    96: 'AP',
+    **{ddd: 'MA' for ddd in (98, 99)},
+}
+
+def _potencia_10(expoentes):
+    return np.power(10, expoentes.astype('int64'), dtype='int64')
+
+def normalizar_e164(numeros, ddd_padrao=DDD_PADRAO):
+    """
+    Converte uma série de telefones em chaves E.164 int64 (ex.: 5531999998888).
+    Aceita prefixos 55 ou 0, código de operadora (0XX), espaços e números sem DDD.
+    Ramais internos, números incompletos e DDDs inexistentes viram 0.
+    """
+    if pd.api.types.is_numeric_dtype(numeros):
+        # Colunas lidas como número (float quando há vazios) perderiam dígitos no str()
+        numeros = numeros.astype('Int64')
+    brutos = numeros.astype(str).str.replace(r'\D', '', regex=True).fillna('')
+    digitos = brutos.str.lstrip('0')
+    tamanho = digitos.str.len().fillna(0).to_numpy(dtype='int64')
+    servico = brutos.str.match(PREFIXOS_SERVICO).fillna(False).to_numpy(dtype=bool)
+    curto = (tamanho > 0) & (tamanho <= 15) & ~servico
+    tamanho = np.where(curto, tamanho, 0)
+    valor = pd.to_numeric(digitos.where(curto, '0'), errors='coerce').fillna(0).to_numpy(dtype='int64')
+
+    # 12-13 dígitos: já tem o 55 ou começa com o código de operadora (descartado)
+    longo = np.isin(tamanho, [12, 13])
+    com_pais = longo & (valor // _potencia_10(np.maximum(tamanho - 2, 0)) == CODIGO_PAIS)
+    com_operadora = longo & ~com_pais
+    valor = np.where(com_operadora, valor % _potencia_10(np.maximum(tamanho - 2, 0)), valor)
+    tamanho = np.where(com_operadora, tamanho - 2, tamanho)
+
+    # 10-11 dígitos: DDD + número; 8-9 dígitos: número local sem DDD
+    nacional = np.isin(tamanho, [10, 11]) & ~com_pais
+    local = np.isin(tamanho, [8, 9])
+    e164 = np.select(
+        [com_pais, nacional, local],
+        [
+            valor,
+            CODIGO_PAIS * _potencia_10(tamanho) + valor,
+            (CODIGO_PAIS * 100 + ddd_padrao) * _potencia_10(tamanho) + valor,
+        ],
+        default=0,
+    )
+
+    ddd = ddd_de_e164(e164)
+    return np.where(np.isin(ddd, list(DDD_UF)), e164, 0)
+
+def _digitos_assinante(e164):
+    # 55 + DDD + 8 (fixo) ou 9 (celular) dígitos
+    return np.where(e164 >= 10 ** 12, 9, 8)
+
+def ddd_de_e164(e164):
+    """Extrai o DDD das chaves E.164 (0 para chaves inválidas)."""
+    e164 = np.asarray(e164, dtype='int64')
+    ddd = (e164 // _potencia_10(_digitos_assinante(e164))) % 100
+    return np.where(e164 > 0, ddd, 0)
+
+def eh_celular(e164):
+    """Indica as chaves E.164 de celulares (assinante com 9 dígitos começando em 9)."""
+    e164 = np.asarray(e164, dtype='int64')
+    assinante = e164 % 10 ** 9
+    return (e164 >= 10 ** 12) & (assinante // 10 ** 8 == 9)
+
+def descrever_telefones(numeros, ddd_padrao=DDD_PADRAO):
+    """Retorna chave E.164, DDD, UF e indicador de celular para uma série de telefones."""
+    e164 = normalizar_e164(numeros, ddd_padrao)
+    ddd = ddd_de_e164(e164)
+    return pd.DataFrame({
+        'e164': e164,
+        'ddd': ddd.astype('int16'),
+        'uf': pd.Categorical(pd.Series(ddd).map(DDD_UF).fillna('Inválido')),
+        'movel': eh_celular(e164),
+    }, index=numeros.index)
+
+def adicionar_chaves_telefone(df):
+    """Acrescenta as chaves E.164 de Origem, Numero Discado e CLID (e DDD/UF/celular da Origem)."""
+    for coluna, prefixo in [('Origem', 'origem'), ('Numero Discado', 'discado'), ('CLID', 'clid')]:
+        if coluna in df.columns:
+            df[f'{prefixo}_e164'] = normalizar_e164(df[coluna])
+    if 'origem_e164' in df.columns:
+        df['origem_ddd'] = ddd_de_e164(df['origem_e164']).astype('int16')
+        df['origem_uf'] = pd.Categorical(df['origem_ddd'].map(DDD_UF).fillna('Inválido'))
+        df['origem_movel'] = eh_celular(df['origem_e164'])
+    return df
+
+def codificar_numeros(numeros):
+    """
+    Codifica os números como inteiros consecutivos a partir da chave E.164,
+    para ordenar e agrupar sem comparar strings. Retorna (codigos, chaves_unicas).
+    """
+    return pd.factorize(normalizar_e164(numeros))
+
+def extrair_ramal_agente(agentes):
+    """Extrai o ramal (ex.: BIOC5319) da coluna 'Agente / Atendente'; ligações só na URA ficam como 'URA'."""
+    ramais = agentes.astype(str).str.extract(r'(BIOC\d{4})', flags=re.IGNORECASE, expand=False)
+    return ramais.str.upper().fillna('URA')
@@ -1,11 +1,13 @@
+import argparse
 import os
-import whisper
 import pandas as pd
 from tqdm import tqdm
 import re
 from datetime import datetime
 import csv
 
+from config_execucao import MES_PADRAO, adicionar_argumentos_periodo, meses_dos_argumentos, pasta_audios_mes, pasta_resultados_mes
+
 def extrair_ramal(nome_arquivo):
     """Extrai o ramal do nome do arquivo."""
     padrao = r"bioc(\d{4})"
@@ -49,6 +51,9 @@ def salvar_transcricao_individual(pasta_resultados_individuais, nome_arquivo, da
 
 def transcrever_audio(audio_path):
     """Transcreve um arquivo de áudio usando o Whisper com modelo small."""
+    # Importado só aqui: o whisper carrega o torch, que leva segundos para subir
+    import whisper
+    
     try:
         # Carrega o modelo small (mais rápido)
         model = whisper.load_model("small")
@@ -67,14 +72,14 @@ def transcrever_audio(audio_path):
             'duracao': 0
         }
 
-def processar_audios():
-    """Processa todos os arquivos de áudio na pasta de gravações."""
+def processar_audios(mes=MES_PADRAO):
+    """Processa todos os arquivos de áudio do mês na pasta de gravações."""
     # Obtém o diretório raiz do projeto
     diretorio_raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     
     # Configuração de pastas
-    pasta_audios = os.path.join(diretorio_raiz, "automatizacoes_de_download", "automatizacao_downloads_audios", "ligacoes_descompactadas", "2025-05")
-    pasta_resultados = os.path.join(diretorio_raiz, "scripts_processamento", "bd_transcricao", "2025-05")
+    pasta_audios = pasta_audios_mes(mes, diretorio_raiz)
+    pasta_resultados = pasta_resultados_mes(mes, diretorio_raiz)
     pasta_resultados_individuais = os.path.join(pasta_resultados, "transcricoes_individuais")
     arquivo_checkpoint = os.path.join(pasta_resultados, "checkpoint.csv")
     
@@ -89,6 +94,12 @@ def processar_audios():
     arquivos_processados = carregar_checkpoint(arquivo_checkpoint)
     print(f"Encontrados {len(arquivos_processados)} arquivos já processados")
     
+    # Sem a pasta de áudios do mês não há nada novo a transcrever: as transcrições
+    # já gravadas na partição continuam valendo para as etapas seguintes
+    if not os.path.isdir(pasta_audios):
+        print(f"Pasta de áudios {pasta_audios} não encontrada; nada novo para transcrever")
+        return
+    
     # Lista todos os arquivos MP3
     arquivos_mp3 = [f for f in os.listdir(pasta_audios) if f.endswith('.mp3')]
     
@@ -153,4 +164,8 @@ def processar_audios():
     print(f"Arquivo consolidado salvo em: {pasta_resultados}")
 
 if __name__ == "__main__":
-    processar_audios() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Transcreve os áudios das ligações de um ou mais meses.")
+    adicionar_argumentos_periodo(parser)
+    args = parser.parse_args()
+    for mes in meses_dos_argumentos(args):
+        processar_audios(mes) 
\ No newline at end of file